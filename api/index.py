@@ -0,0 +1,36 @@
+"""
+Single Vercel entry point.
+
+Every /api/* request is routed here and served by the FastAPI app in
+backend/main.py, so one warm instance handles all routes and shares the
+in-memory session store, pooled Jira clients and caches.
+"""
+import os
+import sys
+
+# Add backend directory to Python path for imports
+backend_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, backend_path)
+
+from main import app as backend_app
+
+
+class StripPrefix:
+    """ASGI wrapper that serves the backend routes under /api."""
+
+    def __init__(self, app, prefix: str):
+        self.app = app
+        self.prefix = prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            path = scope.get("path", "")
+            if path == self.prefix or path.startswith(self.prefix + "/"):
+                scope = dict(scope)
+                scope["path"] = path[len(self.prefix):] or "/"
+                scope["raw_path"] = scope["path"].encode()
+                scope["root_path"] = scope.get("root_path", "") + self.prefix
+        await self.app(scope, receive, send)
+
+
+app = StripPrefix(backend_app, "/api")
@@ -1,2 +0,0 @@
-def handler(request):
-    return "Hello from Python"
\ No newline at end of file
@@ -1,12 +0,0 @@
-def handler(request):
-    """Simple test function for Vercel"""
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type'
-        },
-        'body': '{"status": "working", "message": "Simple function format test"}'
-    }
\ No newline at end of file
@@ -1,64 +1,188 @@
+import contextvars
 import os
 import json
-import httpx
-from dotenv import load_dotenv
+import time
+from contextlib import contextmanager
+from services.http_cache import request_hash
+from services import metrics
+from services import tracing
+from services import llm_scheduler
+from services import deadline
+from services.ttl_cache import TTLCache
 
-load_dotenv()
+_env_loaded = False
 
-GEMINI_API_URL = os.getenv("GEMINI_API_URL")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# Successful completions keyed by a hash of (endpoint, API key, prompt, max_tokens), so answers
+# paid for with one user's key are never served to another. Off unless LLM_CACHE_TTL > 0:
+# completions are sampled (temperature 0.7), so caching makes "regenerate" return the same answer
+LLM_CACHE = TTLCache(ttl=float(os.getenv("LLM_CACHE_TTL", "0")), max_entries=int(os.getenv("LLM_CACHE_SIZE", "512")))
 
+# Stand-in for the Gemini API (benchmarks, load tests): fn(prompt, max_tokens) -> str
+_backend = None
+
+def set_backend(fn):
+    """Answer call_gemini with fn(prompt, max_tokens) instead of the API; None restores the API"""
+    global _backend
+    _backend = fn
+
+# Key supplied by the user for the current request (the UI's "Configure API"); wins over GEMINI_API_KEY
+API_KEY: contextvars.ContextVar = contextvars.ContextVar("okr_gemini_api_key", default=None)
+
+# Used with a user-supplied key when the deployment has no GEMINI_API_URL of its own
+DEFAULT_GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent"
+
+@contextmanager
+def api_key(key):
+    """Make Gemini calls in the block with `key`; a falsy key leaves GEMINI_API_KEY in charge"""
+    token = API_KEY.set(key or None)
+    try:
+        yield
+    finally:
+        API_KEY.reset(token)
+
+def _gemini_config():
+    """
+    Read GEMINI_API_URL / GEMINI_API_KEY, loading .env on first use rather
+    than at import time so importing an agent stays cheap.
+    """
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+    user_key = API_KEY.get()
+    if user_key:
+        return os.getenv("GEMINI_API_URL") or DEFAULT_GEMINI_URL, user_key
+    return os.getenv("GEMINI_API_URL"), os.getenv("GEMINI_API_KEY")
+
+def _extract_text(data) -> str:
+    """Pull the generated text out of a Gemini (or generic) response body"""
+    # Parse Google AI Studio response format
+    if "candidates" in data and isinstance(data["candidates"], list) and data["candidates"]:
+        candidate = data["candidates"][0]
+        if "content" in candidate and "parts" in candidate["content"]:
+            parts = candidate["content"]["parts"]
+            if parts and "text" in parts[0]:
+                return parts[0]["text"]
+    
+    # Try other common response shapes
+    if isinstance(data, dict):
+        if "output" in data and isinstance(data["output"], str):
+            return data["output"]
+        if "text" in data and isinstance(data["text"], str):
+            return data["text"]
+    
+    # fallback to raw text
+    return json.dumps(data)
+
+def build_request(url: str, api_key: str, prompt: str, max_tokens: int, temperature: float = 0.7):
+    """(payload, headers) for a completion request to url"""
+    # Google AI Studio API format
+    if "generativelanguage.googleapis.com" in url:
+        payload = {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": {
+                "maxOutputTokens": max_tokens,
+                "temperature": temperature
+            }
+        }
+        headers = {"x-goog-api-key": api_key, "Content-Type": "application/json"}
+    else:
+        # Generic endpoint format (fallback)
+        payload = {"prompt": prompt, "max_output_tokens": max_tokens}
+        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    return payload, headers
+
+@tracing.traced("llm.call_gemini")
 def call_gemini(prompt: str, max_tokens: int = 800) -> str:
     """
     Google Gemini API wrapper. Works with Google AI Studio API.
     Expects GEMINI_API_URL and GEMINI_API_KEY in .env.
     Returns raw text (string) from the LLM.
     Falls back to error response if API is unavailable.
+    Requests that reach the API (or the stub backend) first wait for a
+    slot from services.llm_scheduler, in the caller's priority class.
+    Both the wait and the HTTP timeout are cut to the request's deadline;
+    running out of it raises DeadlineExceeded, and a queued call dropped
+    for higher priority work raises LLMPreempted, rather than returning an
+    error, so agents do not substitute their fallback content.
     """
+    GEMINI_API_URL, GEMINI_API_KEY = _gemini_config()
+    span = tracing.current()
+    span.set("prompt_chars", len(prompt))
+    span.set("max_tokens", max_tokens)
+    span.set("priority", llm_scheduler.PRIORITY.get())
+    if _backend is not None:
+        return _scheduled(span, lambda: _stub(prompt, max_tokens))
     if not GEMINI_API_URL or not GEMINI_API_KEY:
+        metrics.LLM_REQUESTS.inc(outcome="unconfigured")
         return '{"error": "GEMINI_API_URL and GEMINI_API_KEY must be set in .env"}'
     
+    # Identical prompts under the same key are answered from the in-process cache when it is enabled
+    cache_key = request_hash(GEMINI_API_URL, GEMINI_API_KEY, prompt, max_tokens)
+    cached = LLM_CACHE.get(cache_key) if LLM_CACHE.ttl > 0 else None
+    if cached is not None:
+        metrics.LLM_REQUESTS.inc(outcome="cache_hit")
+        span.set("cache_hit", True)
+        return cached
+    
+    return _scheduled(span, lambda: _post(GEMINI_API_URL, GEMINI_API_KEY, prompt, max_tokens, cache_key, span))
+
+def _scheduled(span, call) -> str:
+    """
+    Run call() once the scheduler grants a slot. LLMPreempted and
+    DeadlineExceeded propagate, so no fallback content is built from them.
+    """
     try:
-        # Google AI Studio API format
-        if "generativelanguage.googleapis.com" in GEMINI_API_URL:
-            payload = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }],
-                "generationConfig": {
-                    "maxOutputTokens": max_tokens,
-                    "temperature": 0.7
-                }
-            }
-            headers = {"x-goog-api-key": GEMINI_API_KEY, "Content-Type": "application/json"}
-        else:
-            # Generic endpoint format (fallback)
-            payload = {"prompt": prompt, "max_output_tokens": max_tokens}
-            headers = {"Authorization": f"Bearer {GEMINI_API_KEY}", "Content-Type": "application/json"}
+        with llm_scheduler.SCHEDULER.slot(timeout=deadline.remaining()) as waited:
+            span.set("queue_wait_ms", round(waited * 1000, 1))
+            return call()
+    except llm_scheduler.LLMPreempted as e:
+        metrics.LLM_REQUESTS.inc(outcome="preempted")
+        span.set("error", str(e))
+        raise
+    except deadline.DeadlineExceeded as e:
+        metrics.LLM_REQUESTS.inc(outcome="deadline")
+        span.set("error", str(e))
+        raise
+
+def _stub(prompt: str, max_tokens: int) -> str:
+    metrics.LLM_REQUESTS.inc(outcome="stub")
+    return _backend(prompt, max_tokens)
+
+def _post(url: str, api_key: str, prompt: str, max_tokens: int, cache_key: str, span) -> str:
+    import httpx
+    
+    # Raises DeadlineExceeded before the call when no time is left
+    timeout = deadline.timeout(30)
+    try:
+        payload, headers = build_request(url, api_key, prompt, max_tokens)
+        started = time.perf_counter()
+        try:
+            with httpx.Client(timeout=timeout) as client:
+                r = client.post(url, json=payload, headers=headers)
+                span.set("status_code", r.status_code)
+                r.raise_for_status()
+                data = r.json()
+        finally:
+            metrics.LLM_DURATION.observe(time.perf_counter() - started)
         
-        with httpx.Client(timeout=30) as client:
-            r = client.post(GEMINI_API_URL, json=payload, headers=headers)
-            r.raise_for_status()
-            data = r.json()
-            
-            # Parse Google AI Studio response format
-            if "candidates" in data and isinstance(data["candidates"], list) and data["candidates"]:
-                candidate = data["candidates"][0]
-                if "content" in candidate and "parts" in candidate["content"]:
-                    parts = candidate["content"]["parts"]
-                    if parts and "text" in parts[0]:
-                        return parts[0]["text"]
-            
-            # Try other common response shapes
-            if isinstance(data, dict):
-                if "output" in data and isinstance(data["output"], str):
-                    return data["output"]
-                if "text" in data and isinstance(data["text"], str):
-                    return data["text"]
-            
-            # fallback to raw text
-            return json.dumps(data)
+        if isinstance(data, dict) and isinstance(data.get("usageMetadata"), dict):
+            metrics.record_llm_usage(data["usageMetadata"])
+            span.set("prompt_tokens", data["usageMetadata"].get("promptTokenCount"))
+            span.set("response_tokens", data["usageMetadata"].get("candidatesTokenCount"))
+        metrics.LLM_REQUESTS.inc(outcome="ok")
+        text = _extract_text(data)
+        LLM_CACHE.set(cache_key, text)
+        return text
             
     except Exception as e:
+        span.set("error", str(e))
+        if deadline.expired() or (isinstance(e, httpx.TimeoutException) and timeout < 30):
+            # Cut short by the request deadline, not a failure of the API (counted by _scheduled)
+            raise deadline.DeadlineExceeded("Request deadline exceeded during the Gemini call") from e
+        metrics.LLM_REQUESTS.inc(outcome="error")
         # Return error response that will trigger fallback in agents
-        return f'{{"error": "API connection failed: {str(e)}"}}'
\ No newline at end of file
+        return f'{{"error": "API connection failed: {str(e)}"}}'
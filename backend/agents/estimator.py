@@ -1,9 +1,13 @@
 import json
 from agents._llm import call_gemini
+from services import tracing
+from services.metrics import timed_agent, record_fallback
 
-def estimator(story: dict) -> str:
+@timed_agent("estimator")
+@tracing.traced("agent.estimator")
+def estimator(story: dict) -> dict:
     """
-    For a story, return JSON:
+    For a story, return the parsed LLM JSON:
     {"tasks":[{"id":"t1","title":"...","hours":4}, ...]}
     """
     prompt = f"""
@@ -29,8 +33,9 @@ No markdown formatting, just pure JSON.
         parsed = json.loads(resp)
         if "error" in parsed:
             raise Exception("LLM unavailable")
-        return json.dumps(parsed)
+        return parsed
     except Exception:
+        tracing.current().set("json_repair", True)
         # Extract JSON from markdown code blocks or plain text
         import re
         
@@ -41,7 +46,7 @@ No markdown formatting, just pure JSON.
                 json_str = json_match.group(1)
                 parsed = json.loads(json_str)
                 if "error" not in parsed:
-                    return json_str
+                    return parsed
             except:
                 pass
         
@@ -51,12 +56,14 @@ No markdown formatting, just pure JSON.
             try:
                 parsed = json.loads(m.group(1))
                 if "error" not in parsed:
-                    return m.group(1)
+                    return parsed
             except:
                 pass
+        record_fallback("estimator")
+        tracing.current().set("fallback", True)
         fallback = {"tasks":[
             {"id":"task-1","title":"Design UI","hours":4},
             {"id":"task-2","title":"Implement backend","hours":8},
             {"id":"task-3","title":"Tests & QA","hours":3}
         ]}
-        return json.dumps(fallback)
\ No newline at end of file
+        return fallback
\ No newline at end of file
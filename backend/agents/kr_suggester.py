@@ -1,9 +1,13 @@
 import json
 from agents._llm import call_gemini
+from services import tracing
+from services.metrics import timed_agent, record_fallback
 
-def kr_suggester(objective: str) -> str:
+@timed_agent("kr_suggester")
+@tracing.traced("agent.kr_suggester")
+def kr_suggester(objective: str) -> dict:
     """
-    Returns strict JSON:
+    Returns the parsed LLM JSON:
     {"krs":[{"id":"kr1","text":"...","metric":"...","baseline":"...","target":"...","rationale":"..."}]}
     """
     prompt = f"""
@@ -14,14 +18,15 @@ Task: Suggest 4-6 measurable Key Results for this objective. Return JSON in this
 Return only valid JSON, no markdown formatting.
 """
     resp = call_gemini(prompt, max_tokens=600)
-    # If model returns plain JSON, return it. Otherwise, attempt to extract JSON.
+    # If model returns plain JSON, return it parsed. Otherwise, attempt to extract JSON.
     try:
         parsed = json.loads(resp)
         # Check if it's an error response from LLM wrapper
         if "error" in parsed:
             raise Exception("LLM unavailable")
-        return json.dumps(parsed)
+        return parsed
     except Exception:
+        tracing.current().set("json_repair", True)
         # Extract JSON from markdown code blocks or plain text
         import re
         
@@ -34,13 +39,13 @@ Return only valid JSON, no markdown formatting.
                 # If it's an array, wrap it in the expected format
                 if isinstance(parsed, list):
                     wrapped = {"krs": parsed}
-                    return json.dumps(wrapped)
+                    return wrapped
                 # Handle different key names from LLM
                 elif isinstance(parsed, dict):
                     if "key_results" in parsed:
                         parsed["krs"] = parsed.pop("key_results")
                     if "krs" in parsed and "error" not in parsed:
-                        return json.dumps(parsed)
+                        return parsed
             except:
                 pass
         
@@ -50,17 +55,19 @@ Return only valid JSON, no markdown formatting.
             try:
                 parsed = json.loads(m.group(1))
                 if "error" not in parsed:
-                    return m.group(1)
+                    return parsed
             except:
                 pass
         # fallback: create objective-specific suggestions
         import hashlib
         obj_hash = hashlib.md5(objective.lower().encode()).hexdigest()[:4]
         
+        record_fallback("kr_suggester")
+        tracing.current().set("fallback", True)
         fallback = {"krs": [
             {"id":f"kr-{obj_hash}-1","text":f"Achieve measurable progress toward: {objective[:50]}...","metric":"Progress %","baseline":"0%","target":"100%","rationale":"Direct objective measurement"},
             {"id":f"kr-{obj_hash}-2","text":"Improve user engagement metrics","metric":"User satisfaction","baseline":"70%","target":"85%","rationale":"User-focused outcome"},
             {"id":f"kr-{obj_hash}-3","text":"Increase operational efficiency","metric":"Process efficiency","baseline":"Current","target":"20% improvement","rationale":"Operational excellence"},
             {"id":f"kr-{obj_hash}-4","text":"Enhance quality metrics","metric":"Quality score","baseline":"Current","target":"Improved","rationale":"Quality assurance"}
         ]}
-        return json.dumps(fallback)
\ No newline at end of file
+        return fallback
\ No newline at end of file
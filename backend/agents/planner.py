@@ -1,9 +1,13 @@
 import json
 from agents._llm import call_gemini
+from services import tracing
+from services.metrics import timed_agent, record_fallback
 
-def planner(objective: str, kr: dict) -> str:
+@timed_agent("planner")
+@tracing.traced("agent.planner")
+def planner(objective: str, kr: dict) -> dict:
     """
-    Returns JSON:
+    Returns the parsed LLM JSON:
     {"epics":[{"id":"epic1","title":"...","features":[{"id":"feat1","title":"...","description":"..."}]}]}
     """
     prompt = f"""
@@ -31,8 +35,9 @@ No markdown formatting, just pure JSON.
         parsed = json.loads(resp)
         if "error" in parsed:
             raise Exception("LLM unavailable")
-        return json.dumps(parsed)
+        return parsed
     except Exception:
+        tracing.current().set("json_repair", True)
         # Extract JSON from markdown code blocks or plain text
         import re
         
@@ -43,7 +48,7 @@ No markdown formatting, just pure JSON.
                 json_str = json_match.group(1)
                 parsed = json.loads(json_str)
                 if "error" not in parsed:
-                    return json_str
+                    return parsed
             except:
                 pass
         
@@ -53,7 +58,7 @@ No markdown formatting, just pure JSON.
             try:
                 parsed = json.loads(m.group(1))
                 if "error" not in parsed:
-                    return m.group(1)
+                    return parsed
             except:
                 pass
         # Dynamic fallback based on objective and KR
@@ -64,6 +69,8 @@ No markdown formatting, just pure JSON.
         objective_words = objective.lower().split()[:3]
         
         # Generate contextual epics based on the KR and objective
+        record_fallback("planner")
+        tracing.current().set("fallback", True)
         fallback = {"epics":[
             {
                 "id": f"epic-{kr_hash}-1",
@@ -83,4 +90,4 @@ No markdown formatting, just pure JSON.
                 ]
             }
         ]}
-        return json.dumps(fallback)
\ No newline at end of file
+        return fallback
\ No newline at end of file
@@ -1,9 +1,13 @@
 import json
 from agents._llm import call_gemini
+from services import tracing
+from services.metrics import timed_agent, record_fallback
 
-def story_generator(feature: dict) -> str:
+@timed_agent("story_generator")
+@tracing.traced("agent.story_generator")
+def story_generator(feature: dict) -> dict:
     """
-    For a feature, return JSON:
+    For a feature, return the parsed LLM JSON:
     {"stories":[{"id":"s1","title":"...","acceptance_criteria":["..."],"story_points":3}, ...]}
     """
     prompt = f"""
@@ -23,8 +27,9 @@ Return JSON only with this structure:
         parsed = json.loads(resp)
         if "error" in parsed:
             raise Exception("LLM unavailable")
-        return json.dumps(parsed)
+        return parsed
     except Exception:
+        tracing.current().set("json_repair", True)
         # Extract JSON from markdown code blocks or plain text
         import re
         
@@ -35,7 +40,7 @@ Return JSON only with this structure:
                 json_str = json_match.group(1)
                 parsed = json.loads(json_str)
                 if "error" not in parsed:
-                    return json_str
+                    return parsed
             except:
                 pass
         
@@ -45,10 +50,12 @@ Return JSON only with this structure:
             try:
                 parsed = json.loads(m.group(1))
                 if "error" not in parsed:
-                    return m.group(1)
+                    return parsed
             except:
                 pass
         # fallback:
+        record_fallback("story_generator")
+        tracing.current().set("fallback", True)
         fallback = {"stories":[
             {
                 "id":"story-1",
@@ -81,4 +88,4 @@ Return JSON only with this structure:
                 "story_points":8
             }
         ]}
-        return json.dumps(fallback)
\ No newline at end of file
+        return fallback
\ No newline at end of file
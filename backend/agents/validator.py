@@ -1,9 +1,12 @@
-import json
 from typing import Dict
+from services import tracing
+from services.metrics import timed_agent, record_error
 
-def validator(structure: Dict) -> str:
+@timed_agent("validator")
+@tracing.traced("agent.validator")
+def validator(structure: Dict) -> Dict:
     """
-    Sanity check OKR structure. Return JSON: {"warnings":[...]}
+    Sanity check OKR structure. Returns {"warnings":[...]}
     """
     warnings = []
     try:
@@ -15,6 +18,7 @@ def validator(structure: Dict) -> str:
             for feat in epic.get("features", []):
                 if not feat.get("stories"):
                     warnings.append(f"Feature {feat.get('title')} has no stories.")
-        return json.dumps({"warnings": warnings})
+        return {"warnings": warnings}
     except Exception as e:
-        return json.dumps({"warnings":[f"Validation failed: {str(e)}"]})
\ No newline at end of file
+        record_error("validator")
+        return {"warnings":[f"Validation failed: {str(e)}"]}
\ No newline at end of file
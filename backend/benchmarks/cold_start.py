@@ -0,0 +1,107 @@
+"""
+Cold-start vs warm-request latency for the single ASGI entry point.
+
+Each run starts a fresh interpreter (a cold serverless instance), imports
+api/index.py, serves a first request, then a batch of warm requests
+through the same app. Requests go through httpx's in-process ASGI
+transport, so no server or network is involved.
+
+Usage (from backend/):
+    python -m benchmarks.cold_start --runs 5 --warm 200 [--output cold_start.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BACKEND = os.path.join(ROOT, "backend")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _serve(app, warm: int) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        t0 = time.perf_counter()
+        r = await client.post("/api/session", json={"text": "Grow weekly active users"})
+        r.raise_for_status()
+        first_ms = (time.perf_counter() - t0) * 1000
+
+        warm_ms = []
+        for _ in range(warm):
+            t0 = time.perf_counter()
+            r = await client.post("/api/session", json={"text": "Grow weekly active users"})
+            r.raise_for_status()
+            warm_ms.append((time.perf_counter() - t0) * 1000)
+    return {"first_request_ms": first_ms, "warm_ms": warm_ms}
+
+
+def child(warm: int):
+    """Runs inside a fresh interpreter and prints one JSON line."""
+    t0 = time.perf_counter()
+    sys.path.insert(0, os.path.join(ROOT, "api"))
+    import index
+    import_ms = (time.perf_counter() - t0) * 1000
+    result = asyncio.run(_serve(index.app, warm))
+    result["import_ms"] = import_ms
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts")
+    parser.add_argument("--warm", type=int, default=200, help="warm requests per run")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.warm)
+        return
+
+    imports, firsts, warm = [], [], []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.cold_start", "--child", "--warm", str(args.warm)],
+            cwd=BACKEND, capture_output=True, text=True, check=True
+        )
+        process_ms = (time.perf_counter() - t0) * 1000
+        # Agents and routes may print; the report is the last line
+        run = json.loads(out.stdout.strip().splitlines()[-1])
+        imports.append(run["import_ms"])
+        firsts.append(run["first_request_ms"])
+        warm.extend(run["warm_ms"])
+        print(f"cold start: import {run['import_ms']:.1f} ms, first request {run['first_request_ms']:.1f} ms, process {process_ms:.0f} ms", file=sys.stderr)
+
+    report = {
+        "runs": args.runs,
+        "warm_requests": len(warm),
+        "cold_import_ms_p50": round(statistics.median(imports), 2),
+        "cold_first_request_ms_p50": round(statistics.median(firsts), 2),
+        "cold_total_ms_p50": round(statistics.median([i + f for i, f in zip(imports, firsts)]), 2),
+        "warm_ms_p50": round(percentile(warm, 50), 3),
+        "warm_ms_p99": round(percentile(warm, 99), 3),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
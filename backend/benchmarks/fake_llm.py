@@ -0,0 +1,61 @@
+"""
+Offline stand-in for Gemini, installed with agents._llm.set_backend.
+
+Each agent prompt is recognised by its task line and answered with valid
+JSON of a fixed shape, so the tree size of a session is set here rather
+than by what a model happens to return:
+
+    fake = FakeLLM(epics=3, features=4, stories=5, tasks=5, latency=0.2)
+    set_backend(fake)
+"""
+import json
+import threading
+import time
+
+from benchmarks.trees import CRITERIA, TASKS
+
+
+class FakeLLM:
+    def __init__(self, epics: int = 3, features: int = 3, stories: int = 5, tasks: int = 5,
+                 krs: int = 5, latency: float = 0.0):
+        self.epics = epics
+        self.features = features
+        self.stories = stories
+        self.tasks = tasks
+        self.krs = krs
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str, max_tokens: int) -> str:
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        if self.latency:
+            time.sleep(self.latency)
+        if "measurable Key Results" in prompt:
+            return json.dumps({"krs": [
+                {"id": f"kr{i}", "text": f"Raise 30-day retention for new signups ({n}.{i})", "metric": "Retention %",
+                 "baseline": "32%", "target": "45%", "rationale": "Retention is the strongest predictor of WAU growth"}
+                for i in range(self.krs)
+            ]})
+        if "Generate 2-4 Epics" in prompt:
+            return json.dumps({"epics": [
+                {"id": f"epic-{e}", "title": f"Onboarding overhaul {n}.{e}", "features": [
+                    {"id": f"feat-{f}", "title": f"Guided first-run checklist {n}.{e}.{f}",
+                     "description": "Walk new users through the three actions most correlated with week-one retention"}
+                    for f in range(self.features)
+                ]}
+                for e in range(self.epics)
+            ]})
+        if "user stories" in prompt:
+            return json.dumps({"stories": [
+                {"id": f"story-{s}", "title": f"As a new user, I want a checklist of first steps so that I know what to do next ({n}.{s})",
+                 "acceptance_criteria": list(CRITERIA), "story_points": 5}
+                for s in range(self.stories)
+            ]})
+        if "development tasks" in prompt:
+            return json.dumps({"tasks": [
+                {"id": f"task-{t}", "title": TASKS[t % len(TASKS)], "hours": 4 + t} for t in range(self.tasks)
+            ]})
+        return json.dumps({"error": "unrecognised prompt"})
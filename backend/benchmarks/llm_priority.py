@@ -0,0 +1,169 @@
+"""
+Interactive latency under bulk background load, with and without priority
+classes in the LLM scheduler (services/llm_scheduler.py).
+
+--background threads issue Gemini calls back to back (bulk generation);
+--interactive threads issue one call every --think seconds (users
+clicking). The fake LLM answers after --latency seconds. "fifo" runs
+everything in one class under the same concurrency cap, which is what a
+plain semaphore would do; "priority" marks the bulk threads background.
+
+With --asgi the same load goes through the app (httpx.ASGITransport, with
+the app's startup hooks run): bulk clients POST /generate_tasks with
+"X-Priority: background" and users POST /generate_stories, so calls queue
+inside AnyIO worker threads exactly as they do behind uvicorn. Use more
+--background clients than the thread pool has workers (40) to check that
+queued background calls cannot starve interactive requests of threads.
+
+Usage (from backend/):
+    python -m benchmarks.llm_priority [--background 16] [--interactive 4] [--seconds 10]
+        [--latency 0.2] [--cap 8] [--background-max 2] [--asgi] [--output llm_priority.json]
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, List
+
+import httpx
+
+from agents import _llm
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.pipeline import percentile
+from services import llm_scheduler
+
+PROMPT = "Break down this user story into 3-7 development tasks"
+
+
+def _scheduler(mode: str, args) -> llm_scheduler.LLMScheduler:
+    return llm_scheduler.LLMScheduler(
+        max_concurrency=args.cap,
+        quotas={llm_scheduler.BACKGROUND: args.background_max if mode == "priority" else args.cap},
+        queue_limit=args.queue_limit,
+    )
+
+
+def _row(mode: str, interactive: List[float], background: Dict, elapsed: float) -> Dict:
+    return {
+        "mode": mode,
+        "interactive_calls": len(interactive),
+        "interactive_p50_ms": round(percentile(interactive, 50) * 1000, 1),
+        "interactive_p95_ms": round(percentile(interactive, 95) * 1000, 1),
+        "interactive_p99_ms": round(percentile(interactive, 99) * 1000, 1),
+        "background_per_s": round(background["done"] / elapsed, 1),
+        "background_refused": background["preempted"],
+    }
+
+
+def run(mode: str, args) -> Dict:
+    llm_scheduler.SCHEDULER = _scheduler(mode, args)
+    deadline = time.perf_counter() + args.seconds
+    interactive: List[float] = []
+    background = {"done": 0, "preempted": 0}
+    lock = threading.Lock()
+
+    def bulk():
+        cls = llm_scheduler.BACKGROUND if mode == "priority" else llm_scheduler.INTERACTIVE
+        with llm_scheduler.priority(cls):
+            while time.perf_counter() < deadline:
+                try:
+                    _llm.call_gemini(PROMPT, 100)
+                    refused = False
+                except llm_scheduler.LLMPreempted:
+                    refused = True
+                with lock:
+                    background["preempted" if refused else "done"] += 1
+                if refused:
+                    time.sleep(args.latency)  # back off, as a job runner would
+
+    def user():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            _llm.call_gemini(PROMPT, 100)
+            with lock:
+                interactive.append(time.perf_counter() - started)
+            time.sleep(args.think)
+
+    threads = [threading.Thread(target=bulk) for _ in range(args.background)]
+    threads += [threading.Thread(target=user) for _ in range(args.interactive)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return _row(mode, interactive, background, time.perf_counter() - started)
+
+
+async def run_asgi(mode: str, args) -> Dict:
+    import main
+
+    llm_scheduler.SCHEDULER = _scheduler(mode, args)
+    transport = httpx.ASGITransport(app=main.app)
+    interactive: List[float] = []
+    background = {"done": 0, "preempted": 0}
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            sid = (await client.post("/session", json={"text": "Grow revenue"})).json()["session_id"]
+            kr = (await client.post("/suggest_krs", json={"session_id": sid})).json()["krs"][0]["id"]
+            epics = (await client.post("/generate_epics", json={"session_id": sid, "kr_id": kr})).json()["epics"]
+            # Users regenerate one feature's stories; bulk work estimates a story of another
+            feature, other = [f["id"] for f in epics[0]["features"][:2]]
+            story = (await client.post("/generate_stories", json={"session_id": sid, "feature_id": other})).json()["stories"][0]["id"]
+            bulk_headers = {"X-Priority": llm_scheduler.BACKGROUND} if mode == "priority" else {}
+            deadline = time.perf_counter() + args.seconds
+
+            async def bulk():
+                while time.perf_counter() < deadline:
+                    r = await client.post("/generate_tasks", json={"session_id": sid, "story_id": story}, headers=bulk_headers)
+                    refused = r.status_code == 503
+                    if not refused:
+                        r.raise_for_status()
+                    background["preempted" if refused else "done"] += 1
+                    if refused:
+                        await asyncio.sleep(args.latency)
+
+            async def user():
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    await client.post("/generate_stories", json={"session_id": sid, "feature_id": feature})
+                    interactive.append(time.perf_counter() - started)
+                    await asyncio.sleep(args.think)
+
+            started = time.perf_counter()
+            await asyncio.gather(*[bulk() for _ in range(args.background)], *[user() for _ in range(args.interactive)])
+            elapsed = time.perf_counter() - started
+    return _row(mode, interactive, background, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--background", type=int, default=16)
+    parser.add_argument("--interactive", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--think", type=float, default=0.5)
+    parser.add_argument("--cap", type=int, default=8)
+    parser.add_argument("--background-max", type=int, default=2)
+    parser.add_argument("--queue-limit", type=int, default=64)
+    parser.add_argument("--asgi", action="store_true", help="drive the app through ASGI instead of raw threads")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    _llm.set_backend(FakeLLM(latency=args.latency))
+    if args.asgi:
+        rows = [asyncio.run(run_asgi(mode, args)) for mode in ("fifo", "priority")]
+    else:
+        rows = [run(mode, args) for mode in ("fifo", "priority")]
+    _llm.set_backend(None)
+    for row in rows:
+        print(f"{row['mode']:<9} interactive p50 {row['interactive_p50_ms']:>7.1f} ms  p95 {row['interactive_p95_ms']:>7.1f} ms  "
+              f"p99 {row['interactive_p99_ms']:>7.1f} ms  ({row['interactive_calls']} calls)  "
+              f"background {row['background_per_s']:>6.1f}/s  refused {row['background_refused']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""
+Concurrency sweep against the FastAPI app with offline LLM and Jira stubs.
+
+Each virtual user replays what a planner does in the UI, over and over:
+create a session, suggest KRs, generate epics for the first KR, stories
+for the first --features features, tasks for the first --stories stories,
+validate, export and (unless --no-jira) upload to Jira. Gemini is answered
+by benchmarks.fake_llm after --llm-latency seconds; Jira by an
+httpx.MockTransport after --jira-latency seconds. Every user has its own
+Jira credentials, as real users do, so the per-site rate limiter is not
+the bottleneck being measured.
+
+For every concurrency level it reports requests/s, sessions/s, p50/p95/p99,
+the error rate, the busiest the threadpool got (sync routes and agents run
+there; anyio's default limit is 40) and event-loop lag. The saturation
+point is the first level whose throughput is less than 10% above the
+previous one: beyond it, added users only queue.
+
+Modes:
+    in-process (default)  the app is driven through httpx.ASGITransport
+    --spawn               starts `serve` in a subprocess, one uvicorn worker, real sockets
+    --url URL             an already running `serve`
+    serve [--port 8000]   uvicorn with the stubs installed and a /_loadtest/stats probe
+
+Usage (from backend/):
+    python -m benchmarks.loadtest [--concurrency 1 2 4 8 16 32 64 128] [--duration 10]
+        [--llm-latency 0.3] [--spawn | --url http://127.0.0.1:8000] [--output loadtest.json]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+# One access log line per request would swamp the terminal and skew the numbers
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.pipeline import commit, percentile
+
+OBJECTIVE = "Increase weekly active users of the mobile app by improving onboarding and engagement"
+
+
+def jira_stub(latency: float) -> httpx.MockTransport:
+    """Creates every issue and link it is asked for"""
+    keys = itertools.count(1)
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        if request.method == "POST" and request.url.path.endswith("/issue"):
+            return httpx.Response(201, json={"key": f"LOAD-{next(keys)}"})
+        if request.method == "POST":
+            return httpx.Response(201, json={})
+        return httpx.Response(200, json={"issues": [], "values": [], "isLast": True})
+
+    return httpx.MockTransport(handle)
+
+
+def install_stubs(llm_latency: float, jira_latency: float):
+    from agents._llm import set_backend
+    from services import jira_pool
+
+    set_backend(FakeLLM(latency=llm_latency))
+    jira_pool.POOL.transport = jira_stub(jira_latency)
+
+
+class ServerProbe:
+    """
+    Runs on the server's event loop: loop lag from a 10 ms ticker and
+    threadpool occupancy from anyio's default limiter. Started lazily on
+    first use because it must be created inside the running loop.
+    """
+
+    def __init__(self):
+        self.lags: List[float] = []
+        self.busy: List[int] = []
+        self.total = None
+        self._task = None
+
+    def ensure_started(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        import anyio.to_thread
+
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        interval = 0.01
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.lags.append(max(0.0, time.perf_counter() - started - interval))
+            self.busy.append(int(limiter.borrowed_tokens))
+            self.total = int(limiter.total_tokens)
+
+    def read(self, reset: bool = False) -> Dict:
+        stats = {
+            "loop_lag_p99_ms": round(percentile(self.lags, 99) * 1000, 2) if self.lags else None,
+            "loop_lag_max_ms": round(max(self.lags) * 1000, 2) if self.lags else None,
+            "threads_busy_max": max(self.busy) if self.busy else None,
+            "threads_busy_mean": round(sum(self.busy) / len(self.busy), 1) if self.busy else None,
+            "threads_total": self.total,
+        }
+        if reset:
+            self.lags.clear()
+            self.busy.clear()
+        return stats
+
+
+PROBE = ServerProbe()
+
+
+def add_probe_route(app):
+    @app.get("/_loadtest/stats", include_in_schema=False)
+    async def loadtest_stats(reset: bool = False):
+        PROBE.ensure_started()
+        return PROBE.read(reset)
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.sessions = 0
+
+    async def call(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs) -> Optional[Dict]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception as e:
+            self.latencies[route].append(time.perf_counter() - started)
+            self.errors[type(e).__name__] += 1
+            return None
+        self.latencies[route].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[f"HTTP {response.status_code}"] += 1
+            return None
+        return response.json()
+
+
+async def planner_flow(client: httpx.AsyncClient, rec: Recorder, user: int, args) -> bool:
+    """One planning session; False as soon as a step fails"""
+    created = await rec.call(client, "POST /session", "POST", "/session", json={"text": OBJECTIVE})
+    if not created:
+        return False
+    sid = created["session_id"]
+    krs = await rec.call(client, "POST /suggest_krs", "POST", "/suggest_krs", json={"session_id": sid})
+    if not krs or not krs["krs"]:
+        return False
+    epics = await rec.call(client, "POST /generate_epics", "POST", "/generate_epics",
+                           json={"session_id": sid, "kr_id": krs["krs"][0]["id"]})
+    if not epics:
+        return False
+    features = [f for e in epics["epics"] for f in e["features"]][:args.features]
+    stories = []
+    for feature in features:
+        result = await rec.call(client, "POST /generate_stories", "POST", "/generate_stories",
+                                json={"session_id": sid, "feature_id": feature["id"]})
+        if not result:
+            return False
+        stories.extend(result["stories"])
+    for story in stories[:args.stories]:
+        if not await rec.call(client, "POST /generate_tasks", "POST", "/generate_tasks",
+                              json={"session_id": sid, "story_id": story["id"]}):
+            return False
+    if not await rec.call(client, "POST /validate", "POST", "/validate", json={"session_id": sid}):
+        return False
+    if not await rec.call(client, "GET /export/{id}", "GET", f"/export/{sid}"):
+        return False
+    if args.jira:
+        config = {"base_url": "https://load.atlassian.net", "email": f"planner{user}@example.com",
+                  "api_token": "stub", "project_key": "LOAD"}
+        if not await rec.call(client, "POST /jira/upload", "POST", "/jira/upload",
+                              json={"session_id": sid, "jira_config": config}):
+            return False
+    rec.sessions += 1
+    return True
+
+
+async def run_level(make_client, concurrency: int, duration: float, args) -> Dict:
+    rec = Recorder()
+    async with make_client(concurrency) as client:
+        await read_probe(client, reset=True)
+        deadline = time.perf_counter() + duration
+
+        async def user(n: int):
+            while time.perf_counter() < deadline:
+                await planner_flow(client, rec, n, args)
+
+        started = time.perf_counter()
+        await asyncio.gather(*[user(n) for n in range(concurrency)])
+        elapsed = time.perf_counter() - started
+        server = await read_probe(client)
+
+    everything = [t for values in rec.latencies.values() for t in values]
+    requests = len(everything)
+    failed = sum(rec.errors.values())
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "requests": requests,
+        "sessions": rec.sessions,
+        "rps": round(requests / elapsed, 1),
+        "sessions_per_s": round(rec.sessions / elapsed, 2),
+        "p50_ms": round(percentile(everything, 50) * 1000, 1) if everything else None,
+        "p95_ms": round(percentile(everything, 95) * 1000, 1) if everything else None,
+        "p99_ms": round(percentile(everything, 99) * 1000, 1) if everything else None,
+        "error_rate": round(failed / requests, 4) if requests else 0.0,
+        "errors": dict(rec.errors),
+        "routes": {
+            route: {"count": len(values), "p50_ms": round(percentile(values, 50) * 1000, 1),
+                    "p99_ms": round(percentile(values, 99) * 1000, 1)}
+            for route, values in sorted(rec.latencies.items())
+        },
+        "server": server,
+    }
+
+
+async def read_probe(client: httpx.AsyncClient, reset: bool = False) -> Dict:
+    try:
+        response = await client.get("/_loadtest/stats", params={"reset": reset})
+        return response.json() if response.status_code == 200 else {}
+    except httpx.HTTPError:
+        return {}
+
+
+def saturation(rows: List[Dict]) -> Dict:
+    """
+    Throughput knee (first level under 10% above the previous level's rps)
+    and the first level at which every threadpool token was borrowed.
+    """
+    knee = None
+    for previous, row in zip(rows, rows[1:]):
+        if row["rps"] < previous["rps"] * 1.1:
+            knee = {"concurrency": previous["concurrency"], "rps": previous["rps"], "p99_ms": previous["p99_ms"]}
+            break
+    threadpool_full = next((row["concurrency"] for row in rows
+                            if row["server"].get("threads_total")
+                            and row["server"]["threads_busy_max"] >= row["server"]["threads_total"]), None)
+    return {"knee": knee, "threadpool_full_at": threadpool_full}
+
+
+def in_process_client(args):
+    import main
+
+    install_stubs(args.llm_latency, args.jira_latency)
+    add_probe_route(main.app)
+    transport = httpx.ASGITransport(app=main.app)
+    return lambda concurrency: httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout)
+
+
+def http_client(url: str, args):
+    def make(concurrency: int):
+        limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+        return httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits)
+    return make
+
+
+def spawn_server(args) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.loadtest", "serve", "--port", str(args.port),
+         "--llm-latency", str(args.llm_latency), "--jira-latency", str(args.jira_latency)],
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{args.port}"
+    for _ in range(100):
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError(f"server on port {args.port} did not come up")
+
+
+def serve(args):
+    import uvicorn
+    import main
+
+    install_stubs(args.llm_latency, args.jira_latency)
+    add_probe_route(main.app)
+    uvicorn.run(main.app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+
+def print_header():
+    print(f"{'users':>5} {'req/s':>8} {'sess/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} "
+          f"{'threads':>8} {'loop lag p99':>13}")
+
+
+def print_row(row: Dict):
+    server = row["server"]
+    threads = f"{server['threads_busy_max']}/{server['threads_total']}" if server.get("threads_total") else "-"
+    lag = f"{server['loop_lag_p99_ms']} ms" if server.get("loop_lag_p99_ms") is not None else "-"
+    print(f"{row['concurrency']:>5} {row['rps']:>8.1f} {row['sessions_per_s']:>7.2f} {row['p50_ms']:>8} "
+          f"{row['p95_ms']:>8} {row['p99_ms']:>8} {row['error_rate']:>7.1%} {threads:>8} {lag:>13}", flush=True)
+
+
+async def sweep(make_client, args) -> List[Dict]:
+    """All levels on one event loop: the app's pooled clients and the probe outlive a level"""
+    print_header()
+    rows = []
+    for level in args.concurrency:
+        rows.append(await run_level(make_client, level, args.duration, args))
+        print_row(rows[-1])
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", nargs="?", choices=["run", "serve"], default="run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64, 128])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--features", type=int, default=2, help="features expanded into stories per session")
+    parser.add_argument("--stories", type=int, default=3, help="stories expanded into tasks per session")
+    parser.add_argument("--no-jira", dest="jira", action="store_false")
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--jira-latency", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--url")
+    parser.add_argument("--spawn", action="store_true")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        serve(args)
+        return
+
+    server = None
+    if args.spawn:
+        server = spawn_server(args)
+        args.url = f"http://127.0.0.1:{args.port}"
+    try:
+        make_client = http_client(args.url, args) if args.url else in_process_client(args)
+        rows = asyncio.run(sweep(make_client, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    knee = saturation(rows)
+    if knee["knee"]:
+        k = knee["knee"]
+        print(f"saturates at ~{k['concurrency']} users: {k['rps']} req/s, p99 {k['p99_ms']} ms")
+    else:
+        print("throughput still rising at the highest level tested")
+    if knee["threadpool_full_at"]:
+        print(f"threadpool fully borrowed from {knee['threadpool_full_at']} users")
+    if args.output:
+        meta = {"commit": commit(), "python": platform.python_version(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "mode": "http" if args.url else "in-process", "llm_latency_s": args.llm_latency,
+                "jira_latency_s": args.jira_latency, "jira": args.jira, "duration_s": args.duration}
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": rows, "saturation": knee}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
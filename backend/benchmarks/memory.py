@@ -0,0 +1,66 @@
+"""
+Resident memory per session: pydantic OKRStructure vs the compact
+representation STORE now holds (models/compact.py).
+
+Each representation is built from freshly parsed export JSON, so strings
+are new objects exactly as they would be after LLM calls or a token
+resume, and measured with tracemalloc once intermediates are freed.
+
+Usage (from backend/):
+    python -m benchmarks.memory [--stories 45 240 1000] [--output memory.json]
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from benchmarks.trees import build_structure, stories_to_shape
+from models import compact
+from models.okr_schema import OKRStructure
+from services import fast_json
+
+
+def resident_bytes(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stories", type=int, nargs="+", default=[45, 240, 1000])
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    rows = []
+    for target in args.stories:
+        shape = stories_to_shape(target)
+        raw = build_structure(**shape).model_dump_json()
+        stories = shape["epics"] * shape["features"] * shape["stories"]
+        pydantic_bytes = resident_bytes(lambda: OKRStructure.model_validate(fast_json.loads(raw)))
+        compact_bytes = resident_bytes(lambda: compact.from_model(OKRStructure.model_validate(fast_json.loads(raw))))
+        rows.append({
+            "stories": stories,
+            "tasks_per_story": shape["tasks"],
+            "pydantic_bytes_per_story": round(pydantic_bytes / stories),
+            "compact_bytes_per_story": round(compact_bytes / stories),
+            "ratio": round(compact_bytes / pydantic_bytes, 3),
+        })
+
+    for row in rows:
+        print(f"{row['stories']:>6} stories x {row['tasks_per_story']} tasks  "
+              f"pydantic {row['pydantic_bytes_per_story']:>7} B/story  "
+              f"compact {row['compact_bytes_per_story']:>7} B/story  ({row['ratio']:.0%})")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
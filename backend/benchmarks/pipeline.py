@@ -0,0 +1,170 @@
+"""
+End-to-end orchestrator pipeline with the LLM replaced by benchmarks.fake_llm.
+
+Each run drives one session through create -> suggest_krs -> generate_epics
+-> generate_stories (every feature) -> generate_tasks (every story) ->
+validate -> export, exactly as the UI does, and times every orchestrator
+call. Tree size scales with --stories; --latency adds a fixed sleep per LLM
+call (0 measures only our own overhead).
+
+Reports throughput (stories and orchestrator calls per second), p50/p99
+per step and the tracemalloc peak of a separate run (tracing allocations
+slows the timed runs, so they are kept apart). --output writes JSON with
+the commit it was measured on; --compare prints the change against such a
+file from an earlier commit.
+
+Usage (from backend/):
+    python -m benchmarks.pipeline [--stories 10 100 1000 10000] [--repeat 3]
+        [--latency 0] [--output pipeline.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List
+
+from agents._llm import set_backend
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.trees import stories_to_shape
+from services import orchestrator
+
+STEPS = ("create_session", "suggest_krs", "generate_epics", "generate_stories",
+         "generate_tasks", "validate_structure", "export_json")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered) + 0.5) - 1))]
+
+
+def run_session(timings: Dict[str, List[float]]) -> Dict:
+    """One full planning session; appends per-call seconds to timings[step]"""
+    def timed(step, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        timings[step].append(time.perf_counter() - started)
+        return result
+
+    sid = timed("create_session", orchestrator.create_session,
+                "Increase weekly active users of the mobile app by improving onboarding and engagement")
+    krs = timed("suggest_krs", orchestrator.suggest_krs, sid)["krs"]
+    epics = timed("generate_epics", orchestrator.generate_epics, sid, krs[0]["id"])["epics"]
+    stories = []
+    for epic in epics:
+        for feature in epic["features"]:
+            stories.extend(timed("generate_stories", orchestrator.generate_stories, sid, feature["id"])["stories"])
+    for story in stories:
+        timed("generate_tasks", orchestrator.generate_tasks, sid, story["id"])
+    timed("validate_structure", orchestrator.validate_structure, sid)
+    body = timed("export_json", orchestrator.export_json, sid)
+    orchestrator.STORE.pop(sid, None)
+    return {"stories": len(stories), "export_bytes": len(body)}
+
+
+def measure(target: int, repeat: int, latency: float, memory: bool) -> Dict:
+    shape = stories_to_shape(target)
+    fake = FakeLLM(latency=latency, **shape)
+    set_backend(fake)
+    try:
+        timings: Dict[str, List[float]] = defaultdict(list)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            session = run_session(timings)
+        elapsed = time.perf_counter() - started
+
+        peak = None
+        if memory:
+            tracemalloc.start()
+            run_session(defaultdict(list))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        set_backend(None)
+
+    calls = sum(len(v) for v in timings.values())
+    return {
+        "stories": session["stories"],
+        "tasks": session["stories"] * shape["tasks"],
+        "shape": shape,
+        "repeat": repeat,
+        "llm_latency_s": latency,
+        "llm_calls_per_session": fake.calls // (repeat + memory),
+        "export_bytes": session["export_bytes"],
+        "session_s": round(elapsed / repeat, 4),
+        "stories_per_s": round(session["stories"] * repeat / elapsed, 1),
+        "calls_per_s": round(calls / elapsed, 1),
+        "steps": {
+            step: {
+                "count": len(timings[step]) // repeat,
+                "p50_ms": round(percentile(timings[step], 50) * 1000, 3),
+                "p99_ms": round(percentile(timings[step], 99) * 1000, 3),
+                "total_ms": round(sum(timings[step]) / repeat * 1000, 1),
+            }
+            for step in STEPS
+        },
+        "peak_bytes": peak,
+    }
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def print_rows(rows: List[Dict]):
+    for row in rows:
+        peak = f"  peak {row['peak_bytes'] / 2**20:7.1f} MiB" if row["peak_bytes"] is not None else ""
+        print(f"{row['stories']:>6} stories  {row['session_s']:>8.3f} s/session  "
+              f"{row['stories_per_s']:>9.1f} stories/s  {row['calls_per_s']:>9.1f} calls/s{peak}")
+        for step, s in row["steps"].items():
+            print(f"    {step:<20}{s['count']:>6}x  p50 {s['p50_ms']:>9.3f} ms  p99 {s['p99_ms']:>9.3f} ms  "
+                  f"total {s['total_ms']:>9.1f} ms")
+
+
+def print_comparison(rows: List[Dict], baseline: Dict):
+    before = {r["stories"]: r for r in baseline["results"]}
+    print(f"\nvs {baseline['meta'].get('commit') or 'baseline'}:")
+    for row in rows:
+        old = before.get(row["stories"])
+        if old is None:
+            continue
+        changes = [f"stories/s {row['stories_per_s'] / old['stories_per_s'] - 1:+.1%}"]
+        for step in ("generate_tasks", "export_json"):
+            changes.append(f"{step} p99 {row['steps'][step]['p99_ms'] / max(old['steps'][step]['p99_ms'], 1e-9) - 1:+.1%}")
+        if row["peak_bytes"] and old.get("peak_bytes"):
+            changes.append(f"peak {row['peak_bytes'] / old['peak_bytes'] - 1:+.1%}")
+        print(f"{row['stories']:>6} stories  " + "  ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stories", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds slept per fake LLM call")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the tracemalloc run")
+    parser.add_argument("--output")
+    parser.add_argument("--compare", help="JSON written by an earlier --output")
+    args = parser.parse_args()
+
+    measure(10, 1, 0.0, False)  # warm-up: lazy agent imports, pydantic schema caches
+    rows = [measure(target, args.repeat, args.latency, args.memory) for target in args.stories]
+    print_rows(rows)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(rows, json.load(f))
+    if args.output:
+        meta = {"commit": commit(), "python": platform.python_version(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "latency_s": args.latency}
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Build and dump throughput of the OKR models on a ~10k-node tree.
+
+Build paths: keyword construction from a dict (the old `Model(**data)`
+style), model_validate, model_construct node by node, and
+session_token.unpack (positional arrays -> dicts -> one model_validate).
+Dump paths: the deprecated .dict(), model_dump, model_dump with the
+validator's include set, and model_dump_json.
+
+Usage (from backend/):
+    python -m benchmarks.pydantic_paths [--repeat 5] [--output pydantic_paths.json]
+"""
+import argparse
+import json
+import time
+import warnings
+
+from benchmarks.trees import build_structure
+from models.okr_schema import OKRStructure, Objective, KeyResult, Epic, Feature, Story, Task, VALIDATOR_FIELDS
+from services import session_token
+
+# 10 epics x 10 features x 10 stories x 9 tasks = 10,110 nodes
+SHAPE = dict(epics=10, features=10, stories=10, tasks=9)
+
+
+def count_nodes(struct: OKRStructure) -> int:
+    nodes = 1 + len(struct.krs)
+    for epic in struct.epics:
+        nodes += 1
+        for feature in epic.features:
+            nodes += 1
+            for story in feature.stories:
+                nodes += 1 + len(story.tasks)
+    return nodes
+
+
+def construct_tree(data: dict) -> OKRStructure:
+    """Skip validation entirely: model_construct at every level"""
+    return OKRStructure.model_construct(
+        objective=Objective.model_construct(**data["objective"]),
+        krs=[KeyResult.model_construct(**k) for k in data["krs"]],
+        epics=[
+            Epic.model_construct(id=e["id"], title=e["title"], features=[
+                Feature.model_construct(id=f["id"], title=f["title"], description=f["description"], stories=[
+                    Story.model_construct(id=s["id"], title=s["title"], acceptance_criteria=s["acceptance_criteria"],
+                                          story_points=s["story_points"],
+                                          tasks=[Task.model_construct(**t) for t in s["tasks"]])
+                    for s in f["stories"]
+                ])
+                for f in e["features"]
+            ])
+            for e in data["epics"]
+        ],
+        warnings=data["warnings"],
+    )
+
+
+def best_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    struct = build_structure(**SHAPE)
+    nodes = count_nodes(struct)
+    data = struct.model_dump()
+    packed = session_token.pack("bench", struct)
+
+    paths = {
+        "build: OKRStructure(**data)": lambda: OKRStructure(**data),
+        "build: model_validate": lambda: OKRStructure.model_validate(data),
+        "build: model_construct": lambda: construct_tree(data),
+        "build: session_token.unpack": lambda: session_token.unpack(packed),
+        "dump: .dict()": lambda: struct.dict(),
+        "dump: model_dump": lambda: struct.model_dump(),
+        "dump: model_dump(include=VALIDATOR_FIELDS)": lambda: struct.model_dump(include=VALIDATOR_FIELDS),
+        "dump: model_dump_json": lambda: struct.model_dump_json(),
+    }
+    rows = []
+    for name, fn in paths.items():
+        ms = best_ms(fn, args.repeat)
+        rows.append({"path": name, "ms": round(ms, 2), "nodes_per_s": round(nodes / ms * 1000)})
+
+    print(f"{nodes} nodes")
+    for row in rows:
+        print(f"{row['path']:<46} {row['ms']:>9.2f} ms  {row['nodes_per_s']:>12,} nodes/s")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"nodes": nodes, "results": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+CPU cost of serializing API responses, before and after the orjson path.
+
+For each tree size compares what GET /export used to do (struct.dict(),
+FastAPI's jsonable_encoder walk, stdlib JSONResponse) with the current path
+(the compact session dataclasses dumped by orjson), plus model_dump_json
+and the dict -> FastJSONResponse (orjson) path used by routes that return plain dicts. Also measures the agent round trip
+that was removed (agents re-dumping parsed JSON that the orchestrator then
+parsed again).
+
+Usage (from backend/):
+    python -m benchmarks.serialization [--repeat 20] [--output serialization.json]
+"""
+import argparse
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks.trees import build_structure
+from models import compact
+from services import fast_json
+
+SHAPES = {
+    "typical (3 epics, 45 stories)": dict(epics=3, features=3, stories=5, tasks=5),
+    "large (6 epics, 240 stories)": dict(epics=6, features=5, stories=8, tasks=6),
+    "huge (10 epics, 1000 stories)": dict(epics=10, features=10, stories=10, tasks=6),
+}
+
+
+def cpu_us(fn, repeat: int) -> float:
+    t0 = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - t0) / repeat * 1e6
+
+
+def agent_round_trip(payload: dict):
+    """What every agent call used to cost on top of parsing the LLM text once"""
+    return json.loads(json.dumps(payload))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    if fast_json.orjson is None:
+        print("orjson is not installed; skipping the orjson dict column")
+
+    rows = []
+    for name, shape in SHAPES.items():
+        struct = build_structure(**shape)
+        exported = struct.dict()
+        session = compact.from_model(struct)
+        stories = {"stories": [s for e in exported["epics"] for f in e["features"] for s in f["stories"]][:6]}
+        row = {
+            "tree": name,
+            "bytes": len(struct.model_dump_json()),
+            "before_us": cpu_us(lambda: JSONResponse(jsonable_encoder(struct.dict())).body, args.repeat),
+            "compact_us": cpu_us(lambda: fast_json.dumps(session), args.repeat),
+            "model_dump_json_us": cpu_us(lambda: struct.model_dump_json().encode(), args.repeat),
+            "orjson_dict_us": cpu_us(lambda: fast_json.FastJSONResponse(struct.dict()).body, args.repeat)
+            if fast_json.orjson is not None else None,
+            "agent_round_trip_us": cpu_us(lambda: agent_round_trip(stories), args.repeat * 10),
+        }
+        row["saved_us"] = row["before_us"] - row["compact_us"]
+        row["speedup"] = round(row["before_us"] / row["compact_us"], 1)
+        rows.append({k: round(v, 1) if isinstance(v, float) else v for k, v in row.items()})
+
+    for row in rows:
+        orjson_col = f"{row['orjson_dict_us']:>10.1f}" if row["orjson_dict_us"] is not None else f"{'-':>10}"
+        print(f"{row['tree']:<32} {row['bytes']:>9} B  before {row['before_us']:>10.1f} us  "
+              f"compact {row['compact_us']:>9.1f} us ({row['speedup']}x)  "
+              f"model_dump_json {row['model_dump_json_us']:>9.1f} us  "
+              f"orjson dict {orjson_col} us  agent round trip {row['agent_round_trip_us']:>6.1f} us")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
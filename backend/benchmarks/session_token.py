@@ -0,0 +1,61 @@
+"""
+Size and latency of stateless session tokens for realistic trees.
+
+Compares the token with the plain JSON export of the same structure and
+times encode (what every mutating request pays) and decode (what a cold
+worker pays to resume a session).
+
+Usage (from backend/):
+    python -m benchmarks.session_token [--repeat 50] [--output session_token.json]
+"""
+import argparse
+import json
+import time
+
+from benchmarks.trees import build_structure
+from services import session_token
+
+SHAPES = {
+    "small (1 epic, 3 stories)": dict(epics=1, features=1, stories=3, tasks=3),
+    "typical (3 epics, 45 stories)": dict(epics=3, features=3, stories=5, tasks=5),
+    "large (6 epics, 240 stories)": dict(epics=6, features=5, stories=8, tasks=6),
+}
+
+
+def time_us(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    rows = []
+    for name, shape in SHAPES.items():
+        struct = build_structure(**shape)
+        export_bytes = len(json.dumps(struct.model_dump(), separators=(",", ":")).encode())
+        token = session_token.encode("bench", struct)
+        rows.append({
+            "tree": name,
+            "export_json_bytes": export_bytes,
+            "token_bytes": len(token),
+            "ratio": round(len(token) / export_bytes, 3),
+            "encode_us": round(time_us(lambda: session_token.encode("bench", struct), args.repeat), 1),
+            "decode_us": round(time_us(lambda: session_token.decode(token), args.repeat), 1),
+        })
+
+    for row in rows:
+        print(f"{row['tree']:<32} json {row['export_json_bytes']:>8} B  token {row['token_bytes']:>7} B "
+              f"({row['ratio']:.0%})  encode {row['encode_us']:>9.1f} us  decode {row['decode_us']:>9.1f} us")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Startup regression check based on `python -X importtime`.
+
+Imports backend/main.py in fresh interpreters and fails (exit code 1) if
+  * the median cumulative import time of `main` exceeds the budget, or
+  * a module that must stay lazy (agents, Jira client, httpx, uvicorn)
+    is imported at startup.
+
+Usage (from backend/):
+    python -m benchmarks.startup_budget [--budget-ms 1500] [--runs 5] [--top 15] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that are only needed once a route actually uses them
+LAZY_MODULES = (
+    "agents.kr_suggester",
+    "agents.planner",
+    "agents.story_generator",
+    "agents.estimator",
+    "agents.validator",
+    "services.jira_integration",
+    "services.jira_client",
+    "httpx",
+    "uvicorn",
+)
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Map module name -> (self_us, cumulative_us) from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_part, cumulative_part, name = line.split(":", 1)[1].split("|")
+            self_us, cumulative_us, name = int(self_part), int(cumulative_part), name.strip()
+        except ValueError:
+            continue
+        modules[name] = (self_us, cumulative_us)
+    return modules
+
+
+def measure_once(module: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(out.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "1500")))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    runs = [measure_once(args.module) for _ in range(args.runs)]
+    totals_ms = [run[args.module][1] / 1000 for run in runs if args.module in run]
+    total_ms = statistics.median(totals_ms)
+    eager = sorted({m for run in runs for m in run if m in LAZY_MODULES})
+    slowest = sorted(runs[-1].items(), key=lambda kv: kv[1][1], reverse=True)[:args.top]
+
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "import_ms_p50": round(total_ms, 1),
+        "budget_ms": args.budget_ms,
+        "within_budget": total_ms <= args.budget_ms,
+        "eager_lazy_modules": eager,
+        "top_cumulative_ms": [{"module": name, "ms": round(cum / 1000, 1)} for name, (_, cum) in slowest],
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms, median of {args.runs})")
+        for item in report["top_cumulative_ms"]:
+            print(f"  {item['ms']:>8.1f} ms  {item['module']}")
+        if eager:
+            print(f"modules that should be lazy but were imported: {', '.join(eager)}")
+
+    if not report["within_budget"] or eager:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Realistic OKR trees for benchmarks."""
+from models.okr_schema import OKRStructure, Objective, KeyResult, Epic, Feature, Story, Task
+
+CRITERIA = [
+    "GIVEN I am on the dashboard, WHEN I open the weekly report, THEN I should see engagement broken down by cohort",
+    "GIVEN I have no data for the selected period, WHEN the report loads, THEN I should see an empty-state explanation",
+    "GIVEN I change the date range, WHEN I apply the filter, THEN all charts should refresh within two seconds",
+]
+TASKS = ["Design UI components", "Implement backend API endpoint", "Write integration tests",
+         "Update documentation", "Wire analytics events"]
+
+
+def build_structure(epics: int = 3, features: int = 3, stories: int = 5, tasks: int = 5) -> OKRStructure:
+    """Objective with 5 KRs and epics x features x stories x tasks below it."""
+    return OKRStructure(
+        objective=Objective(text="Increase weekly active users of the mobile app by improving onboarding and engagement"),
+        krs=[
+            KeyResult(text=f"Raise 30-day retention for new signups (KR {i + 1})", metric="Retention %",
+                      baseline="32%", target="45%", rationale="Retention is the strongest predictor of WAU growth")
+            for i in range(5)
+        ],
+        epics=[
+            Epic(title=f"Onboarding overhaul {e + 1}", features=[
+                Feature(title=f"Guided first-run checklist {e + 1}.{f + 1}",
+                        description="Walk new users through the three actions most correlated with week-one retention",
+                        stories=[
+                            Story(title=f"As a new user, I want a checklist of first steps so that I know what to do next ({s + 1})",
+                                  acceptance_criteria=list(CRITERIA), story_points=5,
+                                  tasks=[Task(title=TASKS[t % len(TASKS)], hours=4 + t) for t in range(tasks)])
+                            for s in range(stories)
+                        ])
+                for f in range(features)
+            ])
+            for e in range(epics)
+        ],
+        warnings=[],
+    )
+
+
+def stories_to_shape(stories: int, tasks: int = 5) -> dict:
+    """Pick epics/features/stories-per-feature so the tree has about `stories` stories."""
+    epics = max(1, min(10, stories // 50 or 1))
+    features = max(1, min(10, stories // (epics * 5) or 1))
+    per_feature = max(1, stories // (epics * features))
+    return {"epics": epics, "features": features, "stories": per_feature, "tasks": tasks}
@@ -1,54 +1,160 @@
-from fastapi import FastAPI, HTTPException, Request
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, ValidationError
+from typing import List, Optional
+from fastapi.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 from services import orchestrator
-from services.jira_integration import JiraIntegration
-import uvicorn
+from services.http_cache import HTTPCacheMiddleware, CachePolicy, PUBLIC, PRIVATE_REVALIDATE, NO_STORE
+from services import http_cache
+from services import fast_json
+from services import metrics
+from services.session_events import HUB
+from services.compression import CompressionMiddleware
+from services.tracing import TracingMiddleware
+from services.log import get_logger, RequestIdMiddleware, STATS as log_stats
+from services.profiling import ProfilingMiddleware, PROFILES
+from services.llm_scheduler import PriorityMiddleware, LLMPreempted
+from services import llm_scheduler
+from services.deadline import DeadlineMiddleware
+from services import deadline
+from services import memory
+from agents import _llm
+import asyncio
+import hmac
 import os
+import sys
 
 load_dotenv()
 
-app = FastAPI(title="OKR Agentic App")
+# Rendered by fast_json: orjson (several times faster than the stdlib encoder) when installed
+DefaultResponse = fast_json.FastJSONResponse
+
+app = FastAPI(title="OKR Agentic App", default_response_class=DefaultResponse)
+
+log = get_logger("api")
 
 # Add custom validation error handler
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    print(f"❌ Validation Error on {request.method} {request.url}")
-    print(f"   Errors: {exc.errors()}")
+    log.warning("http.validation_error", method=request.method, path=request.url.path, errors=str(exc.errors())[:500])
     return JSONResponse(
         status_code=422,
         content={"detail": f"Validation failed: {exc.errors()}"}
     )
 
+# A Gemini call cut off by the request deadline; nothing was stored for the step
+@app.exception_handler(deadline.DeadlineExceeded)
+async def deadline_exception_handler(request: Request, exc: deadline.DeadlineExceeded):
+    log.warning("http.deadline_exceeded", method=request.method, path=request.url.path)
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+# A queued background Gemini call dropped for interactive work; nothing was stored for the step
+@app.exception_handler(LLMPreempted)
+async def preempted_exception_handler(request: Request, exc: LLMPreempted):
+    log.warning("http.llm_preempted", method=request.method, path=request.url.path)
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+
+# Startup-time budget reported by /health (cold start = module import + startup hooks)
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+STARTUP = {"import_ms": None, "ready_ms": None}
+
+@app.on_event("startup")
+async def fit_threadpool():
+    # Queued Gemini calls block worker threads; keep some free for interactive requests
+    llm_scheduler.fit_threadpool()
+
+@app.on_event("startup")
+async def record_startup_time():
+    STARTUP["ready_ms"] = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)
+
+@app.on_event("shutdown")
+async def close_jira_clients():
+    # Only close the pool if a Jira route ever loaded it
+    jira_pool = sys.modules.get("services.jira_pool")
+    if jira_pool is not None:
+        await jira_pool.POOL.aclose()
+
+def _jira(config: "JiraConfig"):
+    """Build a JiraIntegration, importing the Jira client (and httpx) on first use"""
+    from services.jira_integration import JiraIntegration
+    return JiraIntegration(config.base_url, config.email, config.api_token)
+
 # Add CORS middleware
+# React dev server by default; deployments add their frontend origin(s) via CORS_ORIGINS
+CORS_ORIGINS = ["http://localhost:3000", "http://localhost:3001"] + [
+    o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:3001"],  # Allows requests from React dev server
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Cache-Control per GET route; ETag-enabled routes answer If-None-Match with 304
+app.add_middleware(
+    HTTPCacheMiddleware,
+    policies=[
+        (r"/export/[^/]+", CachePolicy(PRIVATE_REVALIDATE, etag=True)),
+        (r"/export/[^/]+/epics", CachePolicy(PRIVATE_REVALIDATE, etag=True)),
+        (r"/openapi\.json", CachePolicy(PUBLIC, etag=True)),
+        (r"/jira/config", CachePolicy(NO_STORE)),
+        (r"/health|/cache/stats|/metrics", CachePolicy(NO_STORE)),
+        (r"/admin/.*", CachePolicy(NO_STORE)),
+    ],
+)
+
+# "X-Priority: background" requests queue behind interactive ones for Gemini slots
+app.add_middleware(PriorityMiddleware)
+
+# X-Request-Deadline-Ms / REQUEST_DEADLINE_MS caps every Gemini and Jira call made for the request
+app.add_middleware(DeadlineMiddleware)
+
+# Root span per request (active when TRACE_FILE or OTEL_EXPORTER_OTLP_ENDPOINT is set)
+app.add_middleware(TracingMiddleware)
+
+# Sampled or X-Profile requests (PROFILING / PROFILE_SAMPLE_RATE); see services/profiling.py
+app.add_middleware(ProfilingMiddleware)
+
+# X-Request-ID on every response and log line, plus one access log entry per request
+app.add_middleware(RequestIdMiddleware)
+
+# Outermost, so ETags above are computed on the uncompressed body
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("COMPRESSION_MIN_BYTES", "1024")))
+
 class ObjectiveIn(BaseModel):
     text: str
 
 class SessionId(BaseModel):
     session_id: str
+    session_token: Optional[str] = None
+    gemini_api_key: Optional[str] = None
 
 class SelectKR(BaseModel):
     session_id: str
     kr_id: str
+    session_token: Optional[str] = None
+    gemini_api_key: Optional[str] = None
 
 class SelectFeature(BaseModel):
     session_id: str
     feature_id: str
+    session_token: Optional[str] = None
+    gemini_api_key: Optional[str] = None
 
 class SelectStory(BaseModel):
     session_id: str
     story_id: str
+    session_token: Optional[str] = None
+    gemini_api_key: Optional[str] = None
 
 class JiraConfig(BaseModel):
     base_url: str
@@ -59,54 +165,340 @@ class JiraConfig(BaseModel):
 class JiraUpload(BaseModel):
     session_id: str
     jira_config: JiraConfig
+    session_token: Optional[str] = None
+
+class BatchOperation(BaseModel):
+    op: str
+    args: dict = {}
+    id: Optional[str] = None
+
+class BatchRequest(BaseModel):
+    session_id: str
+    operations: List[BatchOperation]
+    session_token: Optional[str] = None
+    gemini_api_key: Optional[str] = None
+
+def _run_step(session_id: str, session_token: Optional[str], step, *args, gemini_api_key: Optional[str] = None) -> dict:
+    """
+    Resume the session from its token when given (stateless workers), run one
+    orchestrator step and return its result with a fresh session_token.
+    A gemini_api_key from the client is used for this step's LLM calls.
+    """
+    if session_token:
+        orchestrator.resume_session(session_token, session_id)
+    with _llm.api_key(gemini_api_key):
+        result = step(session_id, *args)
+    result["session_token"] = orchestrator.issue_token(session_id)
+    return result
+
+def _export(session_id: str, session_token: Optional[str] = None) -> dict:
+    if session_token:
+        orchestrator.resume_session(session_token, session_id)
+    return orchestrator.export_structure(session_id)
+
+@app.get("/health", tags=["health"])
+def health():
+    startup_ms = STARTUP["ready_ms"] if STARTUP["ready_ms"] is not None else STARTUP["import_ms"]
+    return {
+        "status": "healthy",
+        "service": "OKR Agentic Planning API",
+        "version": "1.0.0",
+        "startup": {
+            **STARTUP,
+            "budget_ms": STARTUP_BUDGET_MS,
+            "within_budget": startup_ms is not None and startup_ms <= STARTUP_BUDGET_MS,
+            "lazy_modules_loaded": sorted(
+                m for m in ("agents.kr_suggester", "agents.planner", "agents.story_generator",
+                            "agents.estimator", "agents.validator", "services.jira_integration", "httpx")
+                if m in sys.modules
+            )
+        },
+        # Log records dropped on a full queue or skipped by LOG_SUCCESS_SAMPLE_RATE
+        "logging": dict(log_stats),
+        # False: SESSION_SECRET unset, tokens only verify on this instance until it restarts
+        "session_secret_configured": orchestrator.tokens.SECRET_CONFIGURED,
+    }
+
+@app.get("/metrics", tags=["health"])
+def prometheus_metrics():
+    """Agent, Gemini and Jira metrics in the Prometheus text exposition format"""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin routes answer 404 unless ADMIN_TOKEN is set, and then need it in X-Admin-Token"""
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+@app.get("/cache/stats", tags=["admin"], dependencies=[Depends(require_admin)])
+def cache_stats():
+    """Hit rates of the in-process caches and conditional-GET counters"""
+    stats = {"llm": _llm.LLM_CACHE.stats(), "http": dict(http_cache.STATS)}
+    jira = sys.modules.get("services.jira_integration")
+    if jira is not None:
+        stats["jira_projects"] = jira.PROJECT_CACHE.stats()
+    return stats
+
+@app.get("/admin/profiles", tags=["admin"], dependencies=[Depends(require_admin)])
+def list_profiles():
+    """Recent request profiles, newest first"""
+    return {"profiles": PROFILES.summaries()}
+
+@app.get("/admin/profiles/{profile_id}", tags=["admin"], dependencies=[Depends(require_admin)])
+def get_profile(profile_id: str, format: str = "json"):
+    """One profile; format=folded returns stacks for flamegraph.pl or speedscope"""
+    profile = PROFILES.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "folded":
+        return PlainTextResponse("\n".join(profile["folded"]) + "\n")
+    return profile
+
+@app.get("/admin/memory", tags=["admin"], dependencies=[Depends(require_admin)])
+def memory_report(largest: int = 5, limit: int = 10):
+    """Process RSS, deep size of sessions and caches, and top tracemalloc sites when tracing"""
+    return memory.report(largest, limit)
+
+@app.post("/admin/memory/snapshots", tags=["admin"], dependencies=[Depends(require_admin)])
+def take_memory_snapshot():
+    """Take a tracemalloc snapshot (switching tracemalloc on if needed) to diff against later"""
+    return memory.SNAPSHOTS.take()
+
+@app.get("/admin/memory/snapshots", tags=["admin"], dependencies=[Depends(require_admin)])
+def list_memory_snapshots():
+    return {"snapshots": memory.SNAPSHOTS.list()}
+
+@app.get("/admin/memory/snapshots/{snapshot_id}/diff", tags=["admin"], dependencies=[Depends(require_admin)])
+def diff_memory_snapshots(snapshot_id: str, to: Optional[str] = None, limit: int = 20):
+    """Growth since snapshot_id, up to snapshot `to` or, by default, now (compared live, not stored)"""
+    diff = memory.SNAPSHOTS.diff(snapshot_id, to, limit)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return diff
+
+@app.delete("/admin/memory/snapshots", tags=["admin"], dependencies=[Depends(require_admin)])
+def clear_memory_snapshots():
+    """Drop snapshots and switch tracemalloc off"""
+    memory.SNAPSHOTS.clear()
+    return {"tracing": False}
 
 @app.post("/session", tags=["session"])
 def create_session(obj: ObjectiveIn):
     sid = orchestrator.create_session(obj.text)
-    return {"session_id": sid}
+    return {"session_id": sid, "session_token": orchestrator.issue_token(sid)}
 
 @app.post("/suggest_krs", tags=["krs"])
 def suggest_krs(s: SessionId):
     try:
-        return orchestrator.suggest_krs(s.session_id)
+        return _run_step(s.session_id, s.session_token, orchestrator.suggest_krs,
+                         gemini_api_key=s.gemini_api_key)
+    except (deadline.DeadlineExceeded, LLMPreempted):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/generate_epics", tags=["planner"])
 def generate_epics(sel: SelectKR):
     try:
-        return orchestrator.generate_epics(sel.session_id, sel.kr_id)
+        return _run_step(sel.session_id, sel.session_token, orchestrator.generate_epics, sel.kr_id,
+                         gemini_api_key=sel.gemini_api_key)
+    except (deadline.DeadlineExceeded, LLMPreempted):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/generate_stories", tags=["planner"])
 def generate_stories(sel: SelectFeature):
     try:
-        return orchestrator.generate_stories(sel.session_id, sel.feature_id)
+        return _run_step(sel.session_id, sel.session_token, orchestrator.generate_stories, sel.feature_id,
+                         gemini_api_key=sel.gemini_api_key)
+    except (deadline.DeadlineExceeded, LLMPreempted):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/generate_tasks", tags=["planner"])
 def generate_tasks(sel: SelectStory):
     try:
-        return orchestrator.generate_tasks(sel.session_id, sel.story_id)
+        return _run_step(sel.session_id, sel.session_token, orchestrator.generate_tasks, sel.story_id,
+                         gemini_api_key=sel.gemini_api_key)
+    except (deadline.DeadlineExceeded, LLMPreempted):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/validate", tags=["validator"])
 def validate(s: SessionId):
     try:
-        return orchestrator.validate_structure(s.session_id)
+        return _run_step(s.session_id, s.session_token, orchestrator.validate_structure)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/export/{session_id}", tags=["export"])
-def export(session_id: str):
+def export(session_id: str, x_session_token: Optional[str] = Header(None)):
+    try:
+        if x_session_token:
+            orchestrator.resume_session(x_session_token, session_id)
+        # Serialized by pydantic in one pass; no dict copy, no jsonable_encoder walk
+        return Response(orchestrator.export_json(session_id), media_type="application/json")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/export", tags=["export"])
+def export_with_token(s: SessionId):
+    """Same as GET /export/{session_id}, with the session_token in the body; large plans outgrow header limits"""
+    try:
+        if s.session_token:
+            orchestrator.resume_session(s.session_token, s.session_id)
+        return Response(orchestrator.export_json(s.session_id), media_type="application/json")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/batch", tags=["batch"])
+async def batch(req: BatchRequest):
+    """
+    Run an ordered list of orchestrator operations in one round trip.
+    
+    Consecutive generate_stories / generate_tasks operations touch disjoint
+    nodes and run concurrently; any other operation (suggest_krs,
+    generate_epics, validate, export) acts as a barrier and sees the results
+    of everything before it. A failing operation is reported in its own
+    result and does not abort the batch. Operations not started by the
+    request deadline, or whose Gemini call it cut off, are returned as
+    skipped (leaving the session as it was), with "partial": true.
+    Background operations dropped from a full Gemini queue for interactive
+    work are likewise returned as preempted, without touching the session.
+    """
+    try:
+        if req.session_token:
+            orchestrator.resume_session(req.session_token, req.session_id)
+        if req.session_id not in orchestrator.STORE:
+            raise ValueError("Session not found")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def run(index: int, operation: BatchOperation) -> dict:
+        entry = {"index": index, "id": operation.id, "op": operation.op}
+        if deadline.expired():
+            return {**entry, "ok": False, "skipped": True, "error": "Request deadline exceeded"}
+        try:
+            result = await run_in_threadpool(orchestrator.run_operation, req.session_id, operation.op, operation.args)
+            return {**entry, "ok": True, "result": result}
+        except deadline.DeadlineExceeded as e:
+            return {**entry, "ok": False, "skipped": True, "error": str(e)}
+        except LLMPreempted as e:
+            return {**entry, "ok": False, "preempted": True, "error": str(e)}
+        except Exception as e:
+            return {**entry, "ok": False, "error": str(e)}
+    
+    # Split into stages: runs of the same parallel op, or a single barrier op
+    stages = []
+    for index, operation in enumerate(req.operations):
+        if (stages and operation.op in orchestrator.PARALLEL_OPERATIONS
+                and stages[-1][0][1].op == operation.op):
+            stages[-1].append((index, operation))
+        else:
+            stages.append([(index, operation)])
+    
+    results = []
+    with _llm.api_key(req.gemini_api_key):
+        for stage in stages:
+            results.extend(await asyncio.gather(*[run(i, op) for i, op in stage]))
+    
+    skipped = sum(1 for r in results if r.get("skipped"))
+    preempted = sum(1 for r in results if r.get("preempted"))
+    
+    # Results are plain dicts already; render them directly rather than via jsonable_encoder
+    return DefaultResponse({
+        "session_id": req.session_id,
+        "results": results,
+        "succeeded": sum(1 for r in results if r["ok"]),
+        "failed": sum(1 for r in results if not r["ok"]),
+        "skipped": skipped,
+        "preempted": preempted,
+        "partial": skipped + preempted > 0,
+        "session_token": orchestrator.issue_token(req.session_id)
+    })
+
+@app.websocket("/ws/{session_id}")
+async def session_channel(ws: WebSocket, session_id: str):
+    """
+    Live updates for one session. Sends a snapshot first, then compact patch
+    events ({"op": "added"|"removed"|"updated"|"resync", "seq": n, ...}) as
+    orchestrator steps mutate the tree. Any number of viewers may connect.
+    """
+    if session_id not in orchestrator.STORE:
+        await ws.close(code=4404)
+        return
+    await ws.accept()
+    sub = HUB.subscribe(session_id)
+    
+    async def drain_client():
+        # We only push; reading lets us notice disconnects promptly
+        while True:
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+    
+    receiver = asyncio.create_task(drain_client())
     try:
-        return orchestrator.export_structure(session_id)
+        await ws.send_text(fast_json.dumps({"op": "snapshot", "structure": orchestrator.export_structure(session_id)}).decode())
+        while True:
+            getter = asyncio.ensure_future(sub.queue.get())
+            done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver in done:
+                getter.cancel()
+                break
+            event = getter.result()
+            if event["op"] == "resync" and session_id in orchestrator.STORE:
+                event = {**event, "structure": orchestrator.export_structure(session_id)}
+            await ws.send_text(fast_json.dumps(event).decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        HUB.unsubscribe(session_id, sub)
+
+@app.get("/export/{session_id}/epics", tags=["export"])
+def export_epics_page(session_id: str, offset: int = 0, limit: int = 10, x_session_token: Optional[str] = Header(None)):
+    """One page of epics; use /export/{session_id}/ndjson to stream the whole plan"""
+    try:
+        if x_session_token:
+            orchestrator.resume_session(x_session_token, session_id)
+        offset, limit = max(0, offset), max(1, min(limit, 100))
+        total = len(orchestrator.STORE[session_id].epics)
+        return DefaultResponse({
+            "epics": list(orchestrator.iter_epics(session_id, offset, limit)),
+            "offset": offset,
+            "limit": limit,
+            "total": total,
+            "next_offset": offset + limit if offset + limit < total else None
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/export/{session_id}/ndjson", tags=["export"])
+def export_ndjson(session_id: str, x_session_token: Optional[str] = Header(None)):
+    """
+    Stream the plan as newline-delimited JSON: a header record (objective,
+    KRs, warnings, epic_count) followed by one record per epic.
+    """
+    try:
+        if x_session_token:
+            orchestrator.resume_session(x_session_token, session_id)
+        header = orchestrator.export_header(session_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    def lines():
+        yield fast_json.dumps({"type": "header", **header}) + b"\n"
+        for epic in orchestrator.iter_epics(session_id):
+            yield fast_json.dumps({"type": "epic", "epic": epic}) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @app.get("/jira/config", tags=["jira"])
 def get_jira_config():
     """Get default Jira configuration from environment variables"""
@@ -122,7 +514,7 @@ def get_jira_config():
 async def test_jira_connection(config: JiraConfig):
     """Test Jira connection with provided credentials"""
     try:
-        jira = JiraIntegration(config.base_url, config.email, config.api_token)
+        jira = _jira(config)
         result = await jira.test_connection()
         return result
     except Exception as e:
@@ -132,12 +524,10 @@ async def test_jira_connection(config: JiraConfig):
 async def upload_to_jira(upload_data: JiraUpload):
     """Upload OKR structure directly to Jira project"""
     try:
-        print(f"🚀 Starting Jira upload for session: {upload_data.session_id}")
-        print(f"📋 Request data: session_id={upload_data.session_id}, project_key={upload_data.jira_config.project_key}")
+        log.info("jira.upload_started", session_id=upload_data.session_id, project_key=upload_data.jira_config.project_key)
         
         # Get the structure
-        structure = orchestrator.export_structure(upload_data.session_id)
-        print(f"📊 Structure retrieved: {len(structure.get('epics', []))} epics found")
+        structure = _export(upload_data.session_id, upload_data.session_token)
         
         if not structure:
             raise HTTPException(status_code=400, detail="No session data found. Please complete the workflow first.")
@@ -149,41 +539,95 @@ async def upload_to_jira(upload_data: JiraUpload):
         total_stories = sum(len(epic.get('features', [])) for epic in structure.get('epics', []))
         if total_stories == 0:
             raise HTTPException(status_code=400, detail="No features selected. Please select features in step 3.")
-            
-        print(f"📈 Structure validation passed: {len(structure.get('epics', []))} epics, {total_stories} features")
         
         # Initialize Jira integration
-        jira = JiraIntegration(
-            upload_data.jira_config.base_url,
-            upload_data.jira_config.email,
-            upload_data.jira_config.api_token
-        )
-        
-        print(f"🔗 Uploading to Jira project: {upload_data.jira_config.project_key}")
+        jira = _jira(upload_data.jira_config)
         
         # Upload to Jira
-        result = await jira.create_project_structure(upload_data.jira_config.project_key, structure)
+        result = await jira.create_project_structure(upload_data.jira_config.project_key, structure, upload_data.session_id)
         
-        print(f"✅ Upload completed: {result.get('summary', {})}")
+        log.info("jira.upload_completed", session_id=upload_data.session_id, features=total_stories,
+                 summary=result.get('summary', {}), partial=result.get('partial', False))
         return result
         
     except HTTPException:
         raise
     except ValidationError as e:
-        print(f"❌ Validation error: {str(e)}")
+        log.warning("jira.upload_invalid", session_id=upload_data.session_id, error=str(e)[:500])
         raise HTTPException(status_code=422, detail=f"Validation error: {str(e)}")
     except Exception as e:
-        print(f"❌ Upload error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.error("jira.upload_failed", session_id=upload_data.session_id, error=str(e), exc_info=True)
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+@app.post("/jira/upload/stream", tags=["jira"])
+async def upload_to_jira_stream(upload_data: JiraUpload):
+    """
+    Upload OKR structure to Jira, streaming progress as Server-Sent Events.
+    Emits a `created`, `failed` or `skipped` event per issue (with running counts); `skipped` carries a
+    "reason": "deadline" (also listed under "skipped" in the summary) or "parent failed"
+    and a final `summary` event carrying the same result as /jira/upload.
+    """
+    try:
+        structure = _export(upload_data.session_id, upload_data.session_token)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not structure.get('epics'):
+        raise HTTPException(status_code=400, detail="No epics found. Please complete steps 1-4 of the workflow.")
+    
+    jira = _jira(upload_data.jira_config)
+    
+    async def events():
+        queue = asyncio.Queue()
+        upload = asyncio.create_task(jira.create_project_structure(
+            upload_data.jira_config.project_key, structure, upload_data.session_id, on_event=queue.put
+        ))
+        try:
+            while not (upload.done() and queue.empty()):
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter, upload}, return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    getter.cancel()
+                    continue
+                event = getter.result()
+                yield f"event: {event.pop('event')}\ndata: {fast_json.dumps(event).decode()}\n\n"
+            yield f"event: summary\ndata: {fast_json.dumps(upload.result()).decode()}\n\n"
+        finally:
+            # Client went away mid-stream: stop creating issues
+            if not upload.done():
+                upload.cancel()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/jira/sync", tags=["jira"])
+async def sync_to_jira(upload_data: JiraUpload):
+    """Sync OKR structure to Jira, creating or updating only what changed since the last upload"""
+    try:
+        structure = _export(upload_data.session_id, upload_data.session_token)
+        if not structure.get('epics'):
+            raise HTTPException(status_code=400, detail="No epics found. Please complete steps 1-4 of the workflow.")
+        
+        jira = _jira(upload_data.jira_config)
+        result = await jira.sync_project_structure(upload_data.jira_config.project_key, structure, upload_data.session_id)
+        log.info("jira.sync_completed", session_id=upload_data.session_id, summary=result.get('summary', {}),
+                 partial=result.get('partial', False))
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error("jira.sync_failed", session_id=upload_data.session_id, error=str(e), exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
+
 @app.post("/jira/projects", tags=["jira"])
-async def list_jira_projects(config: JiraConfig):
-    """List all available Jira projects for the user"""
+async def list_jira_projects(config: JiraConfig, query: str = "", start_at: int = 0, max_results: int = 50):
+    """List Jira projects for the user, one page at a time, optionally filtered by key/name"""
     try:
-        jira = JiraIntegration(config.base_url, config.email, config.api_token)
-        result = await jira.list_projects()
+        jira = _jira(config)
+        result = await jira.list_projects(query=query, start_at=start_at, max_results=max_results)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -192,12 +636,15 @@ async def list_jira_projects(config: JiraConfig):
 async def validate_jira_project(project_key: str, config: JiraConfig):
     """Validate if a Jira project exists and user has access"""
     try:
-        jira = JiraIntegration(config.base_url, config.email, config.api_token)
+        jira = _jira(config)
         result = await jira.validate_project(project_key)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+STARTUP["import_ms"] = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)
+
 # for local dev
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Compact resident representation of a session.
+
+STORE keeps every session in memory. A pydantic model per node carries a
+per-instance __dict__ plus pydantic bookkeeping (fields-set, extras, private
+attrs), which dominates the footprint of large plans. These slotted
+dataclasses hold the same fields and nothing else: acceptance criteria are
+tuples, and strings that commonly repeat across nodes (task titles,
+criteria, KR metric/baseline/target) are interned so each distinct value is
+stored once.
+
+The okr_schema models stay the validation and API types; convert with
+from_model() after validating and to_dict() when a plain dict is needed.
+Attribute names match the pydantic models, so code that only reads the tree
+(session tokens, lookups by id) works on either.
+"""
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from models import okr_schema as schema
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# Slots are declared by hand (no field defaults) so this also runs on 3.9
+@dataclass
+class Objective:
+    __slots__ = ("id", "text")
+    id: str
+    text: str
+
+
+@dataclass
+class KeyResult:
+    __slots__ = ("id", "text", "metric", "baseline", "target", "rationale")
+    id: str
+    text: str
+    metric: Optional[str]
+    baseline: Optional[str]
+    target: Optional[str]
+    rationale: Optional[str]
+
+
+@dataclass
+class Task:
+    __slots__ = ("id", "title", "hours")
+    id: str
+    title: str
+    hours: float
+
+
+@dataclass
+class Story:
+    __slots__ = ("id", "title", "acceptance_criteria", "story_points", "tasks")
+    id: str
+    title: str
+    acceptance_criteria: Tuple[str, ...]
+    story_points: int
+    tasks: List[Task]
+
+
+@dataclass
+class Feature:
+    __slots__ = ("id", "title", "description", "stories")
+    id: str
+    title: str
+    description: Optional[str]
+    stories: List[Story]
+
+
+@dataclass
+class Epic:
+    __slots__ = ("id", "title", "features")
+    id: str
+    title: str
+    features: List[Feature]
+
+
+@dataclass
+class Session:
+    __slots__ = ("objective", "krs", "epics", "warnings")
+    objective: Objective
+    krs: List[KeyResult]
+    epics: List[Epic]
+    warnings: List[str]
+
+
+NODE_TYPES = (Objective, KeyResult, Task, Story, Feature, Epic, Session)
+
+
+def new_session(objective_text: str) -> Session:
+    return Session(Objective(schema.genid("obj"), objective_text), [], [], [])
+
+
+def _task(t: schema.Task) -> Task:
+    return Task(t.id, _intern(t.title), t.hours)
+
+
+def _story(s: schema.Story) -> Story:
+    return Story(s.id, s.title, tuple(_intern(c) for c in s.acceptance_criteria), s.story_points,
+                 [_task(t) for t in s.tasks])
+
+
+def _feature(f: schema.Feature) -> Feature:
+    return Feature(f.id, f.title, f.description, [_story(s) for s in f.stories])
+
+
+def _epic(e: schema.Epic) -> Epic:
+    return Epic(e.id, e.title, [_feature(f) for f in e.features])
+
+
+def _key_result(k: schema.KeyResult) -> KeyResult:
+    return KeyResult(k.id, k.text, _intern(k.metric), _intern(k.baseline), _intern(k.target), k.rationale)
+
+
+def _session(s: schema.OKRStructure) -> Session:
+    return Session(Objective(s.objective.id, s.objective.text), [_key_result(k) for k in s.krs],
+                   [_epic(e) for e in s.epics], list(s.warnings))
+
+
+_CONVERTERS = {
+    schema.Task: _task,
+    schema.Story: _story,
+    schema.Feature: _feature,
+    schema.Epic: _epic,
+    schema.KeyResult: _key_result,
+    schema.OKRStructure: _session,
+}
+
+
+def from_model(model):
+    """Validated pydantic node (any level) -> compact node."""
+    return _CONVERTERS[type(model)](model)
+
+
+def to_dict(node, include=None):
+    """
+    Compact node -> plain dict/list, shaped like the pydantic model_dump().
+
+    `include` follows pydantic's syntax (a set of field names, or a dict of
+    field -> nested include, with "__all__" for list items), so the include
+    sets in okr_schema apply unchanged.
+    """
+    if isinstance(node, NODE_TYPES):
+        names = node.__slots__ if include is None else [n for n in node.__slots__ if n in include]
+        return {n: to_dict(getattr(node, n), _nested(include, n)) for n in names}
+    if isinstance(node, (list, tuple)):
+        item_include = _nested(include, "__all__")
+        return [to_dict(item, item_include) for item in node]
+    return node
+
+
+def _nested(include, name):
+    if isinstance(include, dict):
+        sub = include.get(name)
+        return None if sub is True else sub
+    return None
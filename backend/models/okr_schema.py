@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from uuid import uuid4
 
 def genid(prefix: str):
@@ -44,4 +44,19 @@ class OKRStructure(BaseModel):
     objective: Objective
     krs: List[KeyResult] = []
     epics: List[Epic] = []
-    warnings: List[str] = []
\ No newline at end of file
+    warnings: List[str] = []
+
+# List validators, built once: constructing a TypeAdapter compiles a schema
+KEY_RESULTS = TypeAdapter(List[KeyResult])
+EPICS = TypeAdapter(List[Epic])
+STORIES = TypeAdapter(List[Story])
+TASKS = TypeAdapter(List[Task])
+
+# Fields each agent actually reads, so model_dump(include=...) skips the rest of the subtree
+KR_PROMPT_FIELDS = {"text", "metric", "baseline", "target"}
+FEATURE_PROMPT_FIELDS = {"title", "description"}
+STORY_PROMPT_FIELDS = {"title", "acceptance_criteria"}
+VALIDATOR_FIELDS = {
+    "krs": {"__all__": {"id"}},
+    "epics": {"__all__": {"features": {"__all__": {"title": True, "stories": {"__all__": {"id"}}}}}},
+}
@@ -0,0 +1,145 @@
+"""
+Negotiated response compression (brotli when available, else gzip).
+
+Whole responses below `minimum_size` are sent as-is. Streaming responses
+(e.g. the NDJSON export) are compressed chunk by chunk with a flush after
+each chunk, so clients still receive each record as soon as it is produced.
+"""
+import gzip
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = (b"application/json", b"application/x-ndjson", b"text/")
+# Server-Sent Events must reach the client unbuffered
+SKIP_TYPES = (b"text/event-stream",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q=0."""
+    offered = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            offered[token] = q
+    wildcard = offered.get("*", 0.0)
+    if brotli is not None and offered.get("br", wildcard) > 0:
+        return "br"
+    if offered.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._c = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.flush()
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._c.finish()
+        return self._c.flush(zlib.Z_FINISH)
+
+
+def compress(data: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = dict(scope.get("headers", []))
+        encoding = choose_encoding(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"start": None, "compressor": None, "passthrough": False}
+
+        def _headers(start, compressed_length: Optional[int]):
+            headers = [(k, v) for k, v in start.get("headers", [])
+                       if k.lower() not in (b"content-length", b"etag")]
+            for k, v in start.get("headers", []):
+                # The body bytes differ per encoding, so a strong ETag becomes weak
+                if k.lower() == b"etag":
+                    headers.append((k, v if v.startswith(b"W/") else b"W/" + v))
+            headers += [(b"content-encoding", encoding.encode()), (b"vary", b"Accept-Encoding")]
+            if compressed_length is not None:
+                headers.append((b"content-length", str(compressed_length).encode()))
+            return headers
+
+        def _compressible(start) -> bool:
+            headers = {k.lower(): v for k, v in start.get("headers", [])}
+            content_type = headers.get(b"content-type", b"")
+            return (
+                b"content-encoding" not in headers
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+                and not content_type.startswith(SKIP_TYPES)
+            )
+
+        async def send_compressed(message):
+            if message["type"] == "http.response.start":
+                state["start"] = message
+                state["passthrough"] = not _compressible(message)
+                if state["passthrough"]:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            start = state["start"]
+
+            if state["compressor"] is None and not more:
+                # Whole response in one message
+                if len(body) < self.minimum_size:
+                    await send(start)
+                    await send(message)
+                    return
+                data = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                await send({**start, "headers": _headers(start, len(data))})
+                await send({"type": "http.response.body", "body": data})
+                return
+
+            if state["compressor"] is None:
+                # Streaming response: compress incrementally
+                state["compressor"] = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                await send({**start, "headers": _headers(start, None)})
+            data = state["compressor"].chunk(body) if body else b""
+            if not more:
+                data += state["compressor"].finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,116 @@
+"""
+Per-request deadlines.
+
+A client states how long it is willing to wait with an
+"X-Request-Deadline-Ms" header (milliseconds from arrival); without one,
+REQUEST_DEADLINE_MS applies (0, the default, means no deadline). The
+absolute deadline travels in a contextvar, so it follows the request into
+threadpool workers and asyncio tasks, and every Gemini and Jira call
+shrinks its timeout to what is left:
+
+    httpx.Client(timeout=deadline.timeout(30))
+
+Once the budget is spent, timeout() raises DeadlineExceeded instead of
+starting work whose answer nobody will read. Fan-out endpoints (/batch,
+the Jira uploads) stop starting new work at that point and return what
+has completed with "partial": true.
+"""
+import asyncio
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+DEFAULT_MS = float(os.getenv("REQUEST_DEADLINE_MS", "0"))
+
+# time.monotonic() by which the current request must be answered
+DEADLINE: contextvars.ContextVar = contextvars.ContextVar("okr_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed before this piece of work could start"""
+
+
+@contextmanager
+def within(seconds: float):
+    """Run the block under a deadline `seconds` from now; an earlier outer deadline still wins"""
+    current = DEADLINE.get()
+    until = time.monotonic() + seconds
+    token = DEADLINE.set(until if current is None else min(current, until))
+    try:
+        yield
+    finally:
+        DEADLINE.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left, or None when there is no deadline"""
+    until = DEADLINE.get()
+    return None if until is None else until - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def allows(seconds: float) -> bool:
+    """Whether waiting `seconds` still leaves time before the deadline"""
+    left = remaining()
+    return left is None or left > seconds
+
+
+def timeout(default: float) -> float:
+    """`default`, shrunk to the time left; raises DeadlineExceeded when none is"""
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return min(default, left)
+
+
+async def bounded(awaitable):
+    """Await `awaitable`, giving up with DeadlineExceeded when the deadline passes first"""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Request deadline exceeded")
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("Request deadline exceeded") from None
+
+
+def _budget_ms(headers) -> Optional[float]:
+    raw = dict(headers).get(b"x-request-deadline-ms")
+    if raw is not None:
+        try:
+            value = float(raw)
+            if value > 0:
+                return value
+        except ValueError:
+            pass
+    return DEFAULT_MS or None
+
+
+class DeadlineMiddleware:
+    """Starts the request's deadline from X-Request-Deadline-Ms or REQUEST_DEADLINE_MS."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        budget = _budget_ms(scope.get("headers", []))
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+        with within(budget / 1000):
+            await self.app(scope, receive, send)
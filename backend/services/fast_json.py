@@ -0,0 +1,43 @@
+"""
+JSON encoding through orjson when it is installed, the stdlib otherwise.
+
+Both paths produce compact UTF-8 bytes, so callers never need to care which
+one is active. Dataclasses (the compact session nodes) are encoded as
+objects by both.
+"""
+import dataclasses
+import json
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(obj):
+    if dataclasses.is_dataclass(obj):
+        # Shallow on purpose; json recurses into the values itself
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default).encode()
+
+
+def loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by dumps(); stands in for FastAPI's deprecated ORJSONResponse"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,118 @@
+"""
+HTTP caching helpers: deterministic request hashing, ETags and per-route
+Cache-Control policies.
+"""
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+def request_hash(*parts) -> str:
+    """
+    Stable hash of a request. JSON-able parts are canonicalised (sorted keys,
+    no whitespace) so logically identical requests hash the same.
+    """
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # W/ prefixes are compared weakly, which is all GET revalidation needs
+    return any(c == etag or c == "W/" + etag for c in candidates)
+
+
+class CachePolicy:
+    def __init__(self, cache_control: str, etag: bool = False):
+        self.cache_control = cache_control
+        self.etag = etag
+
+
+# Shared, deterministic responses: edge caches may serve them and refresh in the background
+PUBLIC = "public, max-age=60, s-maxage=300, stale-while-revalidate=600"
+# Per-session data: only the browser may keep it, and must revalidate (ETag -> 304)
+PRIVATE_REVALIDATE = "private, no-cache"
+NO_STORE = "no-store"
+
+# Conditional-GET counters across all middleware instances
+STATS = {"etag_responses": 0, "not_modified": 0}
+
+
+class HTTPCacheMiddleware:
+    """
+    ASGI middleware applying Cache-Control policies to GET/HEAD routes.
+
+    For policies with etag=True the response body is hashed into an ETag and
+    a matching If-None-Match is answered with 304 Not Modified (no body).
+    Routes without a policy pass through untouched.
+    """
+
+    def __init__(self, app, policies: List[Tuple[str, CachePolicy]]):
+        self.app = app
+        self.policies = [(re.compile(pattern), policy) for pattern, policy in policies]
+
+    def _policy(self, path: str) -> Optional[CachePolicy]:
+        for pattern, policy in self.policies:
+            if pattern.fullmatch(path):
+                return policy
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        policy = self._policy(scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not policy.etag:
+            async def send_with_policy(message):
+                if message["type"] == "http.response.start" and message["status"] == 200:
+                    message = dict(message)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"cache-control", policy.cache_control.encode())
+                    ]
+                await send(message)
+            await self.app(scope, receive, send_with_policy)
+            return
+
+        # Buffer the response so it can be hashed
+        start: Dict = {}
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        body = b"".join(chunks)
+        headers = [(k, v) for k, v in start.get("headers", []) if k.lower() != b"content-length"]
+        status = start.get("status", 200)
+
+        if status == 200:
+            etag = etag_for(body)
+            STATS["etag_responses"] += 1
+            headers += [(b"etag", etag.encode()), (b"cache-control", policy.cache_control.encode())]
+            request_headers = dict(scope.get("headers", []))
+            if etag_matches(request_headers.get(b"if-none-match", b"").decode(), etag):
+                STATS["not_modified"] += 1
+                headers = [(k, v) for k, v in headers if k.lower() != b"content-type"]
+                await send({"type": "http.response.start", "status": 304, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
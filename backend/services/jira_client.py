@@ -0,0 +1,300 @@
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import httpx
+
+from services import deadline
+from services import metrics
+from services import tracing
+
+# Status codes Atlassian Cloud uses to signal "slow down"
+THROTTLE_STATUSES = (429, 503)
+
+# Safe to abandon mid-flight: a timed-out attempt changes nothing, or repeating it does no harm
+RETRY_SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header into a delay in seconds.
+    Accepts both delta-seconds ("30") and HTTP-date forms.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+def parse_rate_limit_reset(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse X-RateLimit-Reset into a delay in seconds.
+    Jira sends an ISO 8601 timestamp; epoch seconds are accepted as well.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    now = time.time() if now is None else now
+    try:
+        return max(0.0, float(value) - now)
+    except ValueError:
+        pass
+    try:
+        when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, when.timestamp() - now)
+
+
+class TokenBucket:
+    """
+    Async token bucket. `rate` tokens are added per second up to `capacity`.
+    The bucket can be paused (e.g. on Retry-After) so that every waiter
+    holds off until the server says it is safe to continue.
+    """
+
+    def __init__(self, rate: float = 10.0, capacity: float = 10.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds` and drain the bucket."""
+        now = time.monotonic()
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = max(self.updated, self.paused_until)
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping as needed. Returns the time spent waiting."""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+class AIMDLimiter:
+    """
+    Concurrency limiter with additive increase / multiplicative decrease.
+    The limit grows by one after `limit` consecutive successes and is halved
+    whenever the server throttles us.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self._successes = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            while self.in_flight >= self.limit:
+                await self._cond.wait()
+            self.in_flight += 1
+
+    async def release(self):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self._successes = 0
+
+    def on_throttle(self):
+        self.limit = max(self.minimum, self.limit // 2)
+        self._successes = 0
+
+
+class JiraClient:
+    """
+    Shared HTTP client for Jira Cloud.
+
+    Every request goes through a token bucket and an AIMD concurrency gate.
+    429/503 responses are retried after the delay given by Retry-After or
+    X-RateLimit-Reset, so bursty uploads slow down instead of dropping issues.
+    Under a request deadline (services.deadline) no attempt starts once the
+    deadline has passed, and a throttled request is not retried when the
+    wait would outlast it. Retry-safe requests also get their timeout cut to
+    the time left. POSTs keep their full timeout: an abandoned POST /issue
+    may still create the issue, and it would be reported as failed and
+    duplicated by the next upload.
+    """
+
+    def __init__(self, headers: Dict[str, str], timeout: float = 30,
+                 rate: float = 10.0, burst: float = 10.0,
+                 initial_concurrency: int = 4, max_concurrency: int = 16,
+                 max_retries: int = 5, backoff: float = 1.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.client = httpx.AsyncClient(headers=headers, timeout=timeout, transport=transport)
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate=rate, capacity=burst)
+        self.limiter = AIMDLimiter(initial=initial_concurrency, maximum=max_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.started = time.monotonic()
+        self.stats = {
+            "requests": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "throttled": 0,
+            "retries": 0,
+            "throttle_wait_seconds": 0.0,
+            "bucket_wait_seconds": 0.0,
+            "rate_limit_remaining": None,
+        }
+
+    def _throttle_delay(self, response: httpx.Response, attempt: int) -> float:
+        delay = parse_retry_after(response.headers.get("Retry-After"))
+        if delay is None:
+            delay = parse_rate_limit_reset(response.headers.get("X-RateLimit-Reset"))
+        if delay is None:
+            delay = self.backoff * (2 ** attempt)
+        return delay
+
+    def _observe_headers(self, response: httpx.Response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            self.stats["rate_limit_remaining"] = int(remaining)
+        except ValueError:
+            return
+        # Jira tells us we are about to run dry: back off before the 429
+        if self.stats["rate_limit_remaining"] <= 0:
+            delay = parse_rate_limit_reset(response.headers.get("X-RateLimit-Reset"))
+            if delay:
+                self.bucket.pause(delay)
+
+    @staticmethod
+    def _timeout(method: str, timeout: float) -> float:
+        """Timeout for an attempt starting now; raises DeadlineExceeded once the deadline has passed"""
+        shrunk = deadline.timeout(timeout)
+        return shrunk if method.upper() in RETRY_SAFE_METHODS else timeout
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, waiting for a token and retrying throttled responses."""
+        attempt = 0
+        endpoint = metrics.endpoint_label(url)
+        request_timeout = kwargs.pop("timeout", self.timeout)
+        while True:
+            self.stats["bucket_wait_seconds"] += await deadline.bounded(self.bucket.acquire())
+            attempt_timeout = self._timeout(method, request_timeout)
+            # Not bounded: a slot granted as the wait times out would leak; holders finish within their timeouts
+            await self.limiter.acquire()
+            started = time.perf_counter()
+            status = "error"
+            try:
+                self.stats["requests"] += 1
+                with tracing.span("jira.request", method=method, endpoint=endpoint, attempt=attempt) as span:
+                    response = await self.client.request(method, url, timeout=attempt_timeout, **kwargs)
+                    status = str(response.status_code)
+                    span.set("status_code", response.status_code)
+            finally:
+                await self.limiter.release()
+                metrics.JIRA_DURATION.observe(time.perf_counter() - started, method=method, endpoint=endpoint)
+                metrics.JIRA_REQUESTS.inc(method=method, endpoint=endpoint, status=status)
+
+            self._observe_headers(response)
+            if response.status_code not in THROTTLE_STATUSES:
+                self.limiter.on_success()
+                if response.is_success:
+                    self.stats["succeeded"] += 1
+                else:
+                    self.stats["failed"] += 1
+                return response
+
+            self.stats["throttled"] += 1
+            self.limiter.on_throttle()
+            delay = self._throttle_delay(response, attempt)
+            if attempt >= self.max_retries or not deadline.allows(delay):
+                self.stats["failed"] += 1
+                return response
+            self.bucket.pause(delay)
+            self.stats["throttle_wait_seconds"] += delay
+            self.stats["retries"] += 1
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    def metrics(self) -> Dict:
+        """Throughput and throttle metrics for this client since it was created."""
+        return self.metrics_since({"at": self.started})
+
+    def snapshot(self) -> Dict:
+        """Counter values now, to pass to metrics_since() later"""
+        return {**self.stats, "at": time.monotonic()}
+
+    def metrics_since(self, snapshot: Dict) -> Dict:
+        """
+        Metrics for the window since `snapshot`. Pooled clients outlive a
+        single upload, so per-upload figures are differences; requests from
+        other uploads sharing the client in that window are included.
+        """
+        elapsed = max(time.monotonic() - snapshot["at"], 1e-9)
+        counters = {
+            key: value - snapshot.get(key, 0) if key != "rate_limit_remaining" else value
+            for key, value in self.stats.items()
+        }
+        return {
+            **counters,
+            "throttle_wait_seconds": round(counters["throttle_wait_seconds"], 3),
+            "bucket_wait_seconds": round(counters["bucket_wait_seconds"], 3),
+            "throughput_rps": round(counters["succeeded"] / elapsed, 3),
+            "concurrency_limit": self.limiter.limit,
+            "in_flight": self.limiter.in_flight,
+        }
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
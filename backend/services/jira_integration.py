@@ -1,7 +1,22 @@
-import httpx
-import json
+import asyncio
+import os
 import base64
-from typing import Dict, List
+from typing import Dict, List, Tuple
+from services.jira_client import JiraClient
+from services import deadline, jira_pool, jira_sync, tracing
+from services.ttl_cache import TTLCache
+from services.log import get_logger
+
+log = get_logger("jira")
+
+
+def _excerpt(response, limit: int = 300) -> str:
+    """Leading slice of an error body; Jira error pages can be large"""
+    return response.text[:limit]
+
+
+# Project picker pages, keyed by site, credentials hash, query and page
+PROJECT_CACHE = TTLCache(ttl=float(os.getenv("JIRA_PROJECT_CACHE_TTL", "120")), max_entries=512)
 
 class JiraIntegration:
     def __init__(self, base_url: str, email: str, api_token: str):
@@ -21,85 +36,520 @@ class JiraIntegration:
             "Content-Type": "application/json"
         }
     
-    async def create_project_structure(self, project_key: str, structure: Dict) -> Dict:
+    @tracing.traced("jira.create_project_structure")
+    async def create_project_structure(self, project_key: str, structure: Dict, session_id: str = None, on_event=None) -> Dict:
         """
         Create complete project structure in Jira from OKR breakdown.
         
         Args:
             project_key: Jira project key (e.g., 'PROJ')
             structure: OKR structure from orchestrator
+            session_id: When given, issues are labelled with the session and
+                their local ids so sync_project_structure can find them later
+            on_event: Optional async callback receiving a progress event
+                (created/failed/skipped with running counts) as each issue is handled
             
         Returns:
-            Dictionary with creation results and issue IDs
+            Dictionary with creation results and issue IDs. Issues not
+            attempted before the request deadline are listed under
+            "skipped", and "partial" is true when there are any
         """
         results = {
             "success": True,
             "created_issues": [],
             "errors": [],
-            "summary": {}
+            "skipped": [],
+            "summary": {},
+            "partial": False
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                # Create Epics first
-                for epic in structure.get("epics", []):
-                    epic_key = await self._create_epic(client, project_key, epic, structure.get("objective", {}))
-                    if epic_key:
-                        results["created_issues"].append({"type": "Epic", "key": epic_key, "title": epic["title"]})
-                        
-                        # Create Stories for each Feature in the Epic
-                        for feature in epic.get("features", []):
-                            for story in feature.get("stories", []):
-                                story_key = await self._create_story(client, project_key, story, epic_key, feature)
-                                if story_key:
-                                    results["created_issues"].append({"type": "Story", "key": story_key, "title": story["title"]})
-                                    
-                                    # Create Sub-tasks for each Task in the Story
-                                    for task in story.get("tasks", []):
-                                        task_key = await self._create_subtask(client, project_key, task, story_key)
-                                        if task_key:
-                                            results["created_issues"].append({"type": "Sub-task", "key": task_key, "title": task["title"]})
+            async with jira_pool.POOL.client(self.base_url, self.auth, self.headers) as client:
+                before = client.snapshot()
+                objective = structure.get("objective", {})
+                notify = self._progress_notifier(on_event, self._count_issues(structure))
+                # Epics, stories and sub-tasks are fanned out concurrently;
+                # the client's AIMD limiter decides how many are in flight.
+                epic_results = await asyncio.gather(*[
+                    self._upload_epic(client, project_key, epic, objective, session_id, notify)
+                    for epic in structure.get("epics", [])
+                ])
+                for created, errors, skipped in epic_results:
+                    results["created_issues"].extend(created)
+                    results["errors"].extend(errors)
+                    results["skipped"].extend(skipped)
                 
                 results["summary"] = {
                     "epics": len([i for i in results["created_issues"] if i["type"] == "Epic"]),
                     "stories": len([i for i in results["created_issues"] if i["type"] == "Story"]),
-                    "subtasks": len([i for i in results["created_issues"] if i["type"] == "Sub-task"])
+                    "subtasks": len([i for i in results["created_issues"] if i["type"] == "Sub-task"]),
+                    "failed": len(results["errors"]),
+                    "skipped": len(results["skipped"])
                 }
+                results["rate_limit"] = client.metrics_since(before)
                 
         except Exception as e:
             results["success"] = False
             results["errors"].append(f"Integration error: {str(e)}")
         
+        results["partial"] = bool(results["skipped"])
         return results
     
-    async def _create_epic(self, client: httpx.AsyncClient, project_key: str, epic: Dict, objective: Dict) -> str:
-        """Create Epic in Jira"""
+    async def _upload_epic(self, client: JiraClient, project_key: str, epic: Dict, objective: Dict, session_id: str = None, notify=None) -> Tuple[List[Dict], List[str], List[Dict]]:
+        """Create an Epic and everything below it. Returns (created issues, errors, skipped issues)."""
+        labels = None
+        if session_id:
+            labels = self._sync_labels(session_id, epic, epic["title"], self._epic_description(epic, objective))
+        try:
+            epic_key = await self._create_epic(client, project_key, epic, objective, labels)
+        except deadline.DeadlineExceeded:
+            return [], [], await self._skip(notify, self._unattempted_epic(epic))
+        if not epic_key:
+            error = f"Failed to create Epic '{epic['title']}' and its stories"
+            await self._notify(notify, "failed", {"type": "Epic", "title": epic["title"], "error": error})
+            await self._skip(notify, self._unattempted_epic(epic)[1:], "parent failed")
+            return [], [error], []
+        
+        created = [{"type": "Epic", "key": epic_key, "title": epic["title"]}]
+        await self._notify(notify, "created", created[0])
+        errors, skipped = [], []
+        story_results = await asyncio.gather(*[
+            self._upload_story(client, project_key, story, epic_key, feature, session_id, notify)
+            for feature in epic.get("features", [])
+            for story in feature.get("stories", [])
+        ])
+        for story_created, story_errors, story_skipped in story_results:
+            created.extend(story_created)
+            errors.extend(story_errors)
+            skipped.extend(story_skipped)
+        return created, errors, skipped
+    
+    async def _upload_story(self, client: JiraClient, project_key: str, story: Dict, epic_key: str, feature: Dict, session_id: str = None, notify=None) -> Tuple[List[Dict], List[str], List[Dict]]:
+        """Create a Story and its Sub-tasks. Returns (created issues, errors, skipped issues)."""
+        labels = None
+        if session_id:
+            labels = self._sync_labels(session_id, story, story["title"], self._story_description(story, feature))
+        try:
+            story_key = await self._create_story(client, project_key, story, epic_key, feature, labels)
+        except deadline.DeadlineExceeded:
+            return [], [], await self._skip(notify, self._unattempted_story(story))
+        if not story_key:
+            error = f"Failed to create Story '{story['title']}' and its sub-tasks"
+            await self._notify(notify, "failed", {"type": "Story", "title": story["title"], "error": error})
+            await self._skip(notify, self._unattempted_story(story)[1:], "parent failed")
+            return [], [error], []
+        
+        created = [{"type": "Story", "key": story_key, "title": story["title"]}]
+        await self._notify(notify, "created", created[0])
+        errors, skipped = [], []
+        task_results = await asyncio.gather(*[
+            self._upload_subtask(client, project_key, task, story_key, session_id, notify)
+            for task in story.get("tasks", [])
+        ])
+        for task_created, task_errors, task_skipped in task_results:
+            created.extend(task_created)
+            errors.extend(task_errors)
+            skipped.extend(task_skipped)
+        return created, errors, skipped
+    
+    async def _upload_subtask(self, client: JiraClient, project_key: str, task: Dict, story_key: str, session_id: str = None, notify=None) -> Tuple[List[Dict], List[str], List[Dict]]:
+        """Create a Sub-task and report progress. Returns (created issues, errors, skipped issues)."""
+        labels = None
+        if session_id:
+            labels = self._sync_labels(session_id, task, task["title"], self._subtask_description(task))
+        try:
+            task_key = await self._create_subtask(client, project_key, task, story_key, labels)
+        except deadline.DeadlineExceeded:
+            return [], [], await self._skip(notify, [self._unattempted("Sub-task", task)])
+        if task_key:
+            created = {"type": "Sub-task", "key": task_key, "title": task["title"]}
+            await self._notify(notify, "created", created)
+            return [created], [], []
+        error = f"Failed to create Sub-task '{task['title']}'"
+        await self._notify(notify, "failed", {"type": "Sub-task", "title": task["title"], "error": error})
+        return [], [error], []
+    
+    @staticmethod
+    def _unattempted(issue_type: str, node: Dict) -> Dict:
+        return {"type": issue_type, "title": node["title"], "local_id": node.get("id") or node["title"]}
+    
+    @classmethod
+    def _unattempted_story(cls, story: Dict) -> List[Dict]:
+        """A Story and its Sub-tasks, as listed under "skipped" when the deadline cuts them off"""
+        return [cls._unattempted("Story", story)] + [cls._unattempted("Sub-task", task) for task in story.get("tasks", [])]
+    
+    @classmethod
+    def _unattempted_epic(cls, epic: Dict) -> List[Dict]:
+        issues = [cls._unattempted("Epic", epic)]
+        for feature in epic.get("features", []):
+            for story in feature.get("stories", []):
+                issues.extend(cls._unattempted_story(story))
+        return issues
+    
+    @classmethod
+    async def _skip(cls, notify, issues: List[Dict], reason: str = "deadline") -> List[Dict]:
+        """
+        Report issues left unattempted, because the request deadline passed
+        or their parent failed, so progress counts still reach the total
+        """
+        for issue in issues:
+            await cls._notify(notify, "skipped", {**issue, "reason": reason})
+        return issues
+    
+    @staticmethod
+    def _count_issues(structure: Dict) -> int:
+        """Number of issues an upload of this structure will attempt"""
+        total = 0
+        for epic in structure.get("epics", []):
+            total += 1
+            for feature in epic.get("features", []):
+                for story in feature.get("stories", []):
+                    total += 1 + len(story.get("tasks", []))
+        return total
+    
+    @staticmethod
+    def _progress_notifier(on_event, total: int):
+        """Wrap an on_event callback so each event carries running counts"""
+        if on_event is None:
+            return None
+        counts = {"created": 0, "failed": 0, "skipped": 0, "total": total}
+        
+        async def notify(event: str, data: Dict):
+            counts[event] += 1
+            await on_event({"event": event, **data, "counts": dict(counts)})
+        return notify
+    
+    @staticmethod
+    async def _notify(notify, event: str, data: Dict):
+        if notify is not None:
+            await notify(event, data)
+    
+    @tracing.traced("jira.sync_project_structure")
+    async def sync_project_structure(self, project_key: str, structure: Dict, session_id: str) -> Dict:
+        """
+        Incrementally sync an OKR structure to Jira.
+        
+        Issues previously created for this session are found with a single
+        JQL search on the session label. Only nodes that are new or whose
+        summary/description changed are sent to Jira, so a re-sync costs
+        roughly one request per changed node.
+        
+        Args:
+            project_key: Jira project key (e.g., 'PROJ')
+            structure: OKR structure from orchestrator
+            session_id: Session whose issues should be matched
+            
+        Returns:
+            Dictionary with created/updated issues, unchanged count and
+            issues that no longer exist in the plan; "skipped" and
+            "partial" as for create_project_structure
+        """
+        results = {
+            "success": True,
+            "created_issues": [],
+            "updated_issues": [],
+            "orphaned_issues": [],
+            "errors": [],
+            "skipped": [],
+            "summary": {},
+            "partial": False
+        }
+        
+        try:
+            async with jira_pool.POOL.client(self.base_url, self.auth, self.headers) as client:
+                before = client.snapshot()
+                existing = await self._search_session_issues(client, project_key, session_id)
+                objective = structure.get("objective", {})
+                epic_results = await asyncio.gather(*[
+                    self._sync_epic(client, project_key, epic, objective, session_id, existing)
+                    for epic in structure.get("epics", [])
+                ])
+                
+                unchanged = 0
+                local_ids = []
+                for entries, errors, skipped in epic_results:
+                    results["errors"].extend(errors)
+                    results["skipped"].extend(skipped)
+                    # Not attempted is not deleted: keep their Jira issues out of the orphans
+                    local_ids.extend(issue["local_id"] for issue in skipped)
+                    for entry in entries:
+                        local_ids.append(entry.pop("local_id"))
+                        action = entry.pop("action")
+                        if action == "create":
+                            results["created_issues"].append(entry)
+                        elif action == "update":
+                            results["updated_issues"].append(entry)
+                        else:
+                            unchanged += 1
+                results["orphaned_issues"] = jira_sync.orphaned_keys(existing, local_ids)
+                
+                results["summary"] = {
+                    "existing": len(existing),
+                    "created": len(results["created_issues"]),
+                    "updated": len(results["updated_issues"]),
+                    "unchanged": unchanged,
+                    "orphaned": len(results["orphaned_issues"]),
+                    "failed": len(results["errors"]),
+                    "skipped": len(results["skipped"])
+                }
+                results["rate_limit"] = client.metrics_since(before)
+                
+        except deadline.DeadlineExceeded:
+            # Ran out before the existing issues were even found
+            results["skipped"] = [issue for epic in structure.get("epics", []) for issue in self._unattempted_epic(epic)]
+        except Exception as e:
+            results["success"] = False
+            results["errors"].append(f"Sync error: {str(e)}")
+        
+        results["partial"] = bool(results["skipped"])
+        return results
+    
+    async def _sync_epic(self, client: JiraClient, project_key: str, epic: Dict, objective: Dict, session_id: str, existing: Dict) -> Tuple[List[Dict], List[str], List[Dict]]:
+        """Sync an Epic and everything below it. Returns (entries, errors, skipped issues)."""
+        try:
+            entry = await self._sync_issue(
+                client, session_id, existing, "Epic", epic, self._epic_description(epic, objective),
+                lambda labels: self._create_epic(client, project_key, epic, objective, labels)
+            )
+        except deadline.DeadlineExceeded:
+            return [], [], self._unattempted_epic(epic)
+        if not entry:
+            return [], [f"Failed to sync Epic '{epic['title']}' and its stories"], []
+        
+        entries = [entry]
+        errors, skipped = [], []
+        story_results = await asyncio.gather(*[
+            self._sync_story(client, project_key, story, entry["key"], feature, session_id, existing)
+            for feature in epic.get("features", [])
+            for story in feature.get("stories", [])
+        ])
+        for story_entries, story_errors, story_skipped in story_results:
+            entries.extend(story_entries)
+            errors.extend(story_errors)
+            skipped.extend(story_skipped)
+        return entries, errors, skipped
+    
+    async def _sync_story(self, client: JiraClient, project_key: str, story: Dict, epic_key: str, feature: Dict, session_id: str, existing: Dict) -> Tuple[List[Dict], List[str], List[Dict]]:
+        """Sync a Story and its Sub-tasks. Returns (entries, errors, skipped issues)."""
+        try:
+            entry = await self._sync_issue(
+                client, session_id, existing, "Story", story, self._story_description(story, feature),
+                lambda labels: self._create_story(client, project_key, story, epic_key, feature, labels)
+            )
+        except deadline.DeadlineExceeded:
+            return [], [], self._unattempted_story(story)
+        if not entry:
+            return [], [f"Failed to sync Story '{story['title']}' and its sub-tasks"], []
+        
+        entries = [entry]
+        errors, skipped = [], []
+        task_results = await asyncio.gather(*[
+            self._sync_subtask(client, project_key, task, entry["key"], session_id, existing)
+            for task in story.get("tasks", [])
+        ])
+        for task_entries, task_errors, task_skipped in task_results:
+            entries.extend(task_entries)
+            errors.extend(task_errors)
+            skipped.extend(task_skipped)
+        return entries, errors, skipped
+    
+    async def _sync_subtask(self, client: JiraClient, project_key: str, task: Dict, story_key: str, session_id: str, existing: Dict) -> Tuple[List[Dict], List[str], List[Dict]]:
+        """Sync one Sub-task. Returns (entries, errors, skipped issues)."""
+        try:
+            entry = await self._sync_issue(
+                client, session_id, existing, "Sub-task", task, self._subtask_description(task),
+                lambda labels: self._create_subtask(client, project_key, task, story_key, labels),
+                fields=self._estimate_fields(task)
+            )
+        except deadline.DeadlineExceeded:
+            return [], [], [self._unattempted("Sub-task", task)]
+        if not entry:
+            return [], [f"Failed to sync Sub-task '{task['title']}'"], []
+        return [entry], [], []
+    
+    async def _sync_issue(self, client: JiraClient, session_id: str, existing: Dict, issue_type: str, node: Dict, description: Dict, create, fields: Dict = None) -> Dict:
+        """
+        Create, update or skip one issue depending on the diff against Jira.
+        `fields` are written on update alongside summary, description and labels.
+        Returns the sync entry, or None if Jira rejected the change.
+        """
+        local_id = node.get("id") or node["title"]
+        fp = jira_sync.fingerprint(node["title"], description)
+        labels = jira_sync.node_labels(session_id, local_id, fp)
+        action, key = jira_sync.diff_node(local_id, fp, existing)
+        
+        if action == "create":
+            key = await create(labels)
+        elif action == "update":
+            if not await self._update_issue(client, key, node["title"], description, labels, fields):
+                key = None
+        if not key:
+            return None
+        return {"type": issue_type, "key": key, "title": node["title"], "action": action, "local_id": local_id}
+    
+    async def _search_session_issues(self, client: JiraClient, project_key: str, session_id: str) -> Dict:
+        """Find every issue created for this session with one paginated JQL search."""
+        issues = []
+        body = {
+            "jql": jira_sync.session_jql(project_key, session_id),
+            "fields": ["labels"],
+            "maxResults": 100
+        }
+        while True:
+            response = await client.post(
+                f"{self.base_url}/rest/api/3/search/jql",
+                headers=self.headers,
+                json=body
+            )
+            if response.status_code != 200:
+                raise Exception(f"Issue search failed ({response.status_code}): {response.text}")
+            data = response.json()
+            issues.extend(data.get("issues", []))
+            token = data.get("nextPageToken")
+            if not token or data.get("isLast", True):
+                break
+            body["nextPageToken"] = token
+        return jira_sync.index_issues(issues)
+    
+    async def _update_issue(self, client: JiraClient, issue_key: str, summary: str, description: Dict, labels: List[str], fields: Dict = None) -> bool:
+        """Update summary, description, sync labels and any extra fields of an existing issue"""
         try:
-            # Format description in Atlassian Document Format
-            description_adf = {
-                "type": "doc",
-                "version": 1,
+            response = await client.put(
+                f"{self.base_url}/rest/api/3/issue/{issue_key}",
+                headers=self.headers,
+                json={"fields": {"summary": summary, "description": description, "labels": labels, **(fields or {})}}
+            )
+            if response.status_code == 204:
+                log.success("jira.issue_updated", key=issue_key)
+                return True
+            log.warning("jira.update_failed", key=issue_key, status=response.status_code, body=_excerpt(response))
+            return False
+        except deadline.DeadlineExceeded:
+            raise
+        except Exception as e:
+            log.error("jira.update_error", key=issue_key, error=str(e), exc_info=True)
+            return False
+    
+    @staticmethod
+    def _estimate_fields(task: Dict) -> Dict:
+        """Time tracking fields for a task's hour estimate"""
+        if task.get("hours"):
+            return {"timetracking": {"originalEstimate": f"{task['hours']}h"}}
+        return {}
+    
+    @staticmethod
+    def _sync_labels(session_id: str, node: Dict, summary: str, description: Dict) -> List[str]:
+        """Labels that let sync_project_structure match this issue later"""
+        fp = jira_sync.fingerprint(summary, description)
+        return jira_sync.node_labels(session_id, node.get("id") or summary, fp)
+    
+    @staticmethod
+    def _epic_description(epic: Dict, objective: Dict) -> Dict:
+        """Epic description in Atlassian Document Format"""
+        return {
+            "type": "doc",
+            "version": 1,
+            "content": [
+                {
+                    "type": "paragraph",
+                    "content": [
+                        {"type": "text", "text": f"Epic: {epic['title']}"}
+                    ]
+                },
+                {
+                    "type": "paragraph",
+                    "content": [
+                        {"type": "text", "text": f"Objective: {objective.get('text', 'N/A')}"}
+                    ]
+                },
+                {
+                    "type": "paragraph",
+                    "content": [
+                        {"type": "text", "text": f"Features: {len(epic.get('features', []))}"}
+                    ]
+                }
+            ]
+        }
+    
+    @staticmethod
+    def _story_description(story: Dict, feature: Dict) -> Dict:
+        """Story description in Atlassian Document Format"""
+        description_content = [
+            {
+                "type": "paragraph",
                 "content": [
-                    {
-                        "type": "paragraph",
-                        "content": [
-                            {"type": "text", "text": f"Epic: {epic['title']}"}
-                        ]
-                    },
-                    {
-                        "type": "paragraph",
-                        "content": [
-                            {"type": "text", "text": f"Objective: {objective.get('text', 'N/A')}"}
-                        ]
-                    },
-                    {
-                        "type": "paragraph",
-                        "content": [
-                            {"type": "text", "text": f"Features: {len(epic.get('features', []))}"}
-                        ]
-                    }
+                    {"type": "text", "text": f"Feature: {feature.get('title', 'N/A')}"}
+                ]
+            },
+            {
+                "type": "paragraph",
+                "content": [
+                    {"type": "text", "text": story['title']}
                 ]
             }
+        ]
+        
+        # Add acceptance criteria
+        if story.get("acceptance_criteria"):
+            description_content.append({
+                "type": "paragraph",
+                "content": [
+                    {"type": "text", "text": "Acceptance Criteria:", "marks": [{"type": "strong"}]}
+                ]
+            })
+            for criteria in story.get("acceptance_criteria", []):
+                description_content.append({
+                    "type": "bulletList",
+                    "content": [{
+                        "type": "listItem",
+                        "content": [{
+                            "type": "paragraph",
+                            "content": [{"type": "text", "text": criteria}]
+                        }]
+                    }]
+                })
+        
+        # Add story points if available
+        if story.get("story_points"):
+            description_content.append({
+                "type": "paragraph",
+                "content": [
+                    {"type": "text", "text": f"Story Points: {story['story_points']}", "marks": [{"type": "strong"}]}
+                ]
+            })
+        
+        return {
+            "type": "doc",
+            "version": 1,
+            "content": description_content
+        }
+    
+    @staticmethod
+    def _subtask_description(task: Dict) -> Dict:
+        """Sub-task description in Atlassian Document Format"""
+        return {
+            "type": "doc",
+            "version": 1,
+            "content": [
+                {
+                    "type": "paragraph",
+                    "content": [
+                        {"type": "text", "text": f"Development task: {task['title']}"}
+                    ]
+                },
+                {
+                    "type": "paragraph",
+                    "content": [
+                        {"type": "text", "text": f"Estimated effort: {task.get('hours', 0)} hours"}
+                    ]
+                }
+            ]
+        }
+    
+    async def _create_epic(self, client: JiraClient, project_key: str, epic: Dict, objective: Dict, labels: List[str] = None) -> str:
+        """Create Epic in Jira"""
+        try:
+            description_adf = self._epic_description(epic, objective)
             
             payload = {
                 "fields": {
@@ -109,6 +559,8 @@ class JiraIntegration:
                     "issuetype": {"name": "Epic"}
                 }
             }
+            if labels:
+                payload["fields"]["labels"] = labels
             
             response = await client.post(
                 f"{self.base_url}/rest/api/3/issue",
@@ -118,69 +570,22 @@ class JiraIntegration:
             
             if response.status_code == 201:
                 epic_key = response.json()["key"]
-                print(f"✅ Created Epic: {epic_key} - {epic['title']}")
+                log.success("jira.issue_created", key=epic_key, issue_type="Epic")
                 return epic_key
             else:
-                print(f"❌ Epic creation failed ({response.status_code}): {response.text}")
+                log.warning("jira.create_failed", issue_type="Epic", status=response.status_code, body=_excerpt(response))
                 return None
                 
+        except deadline.DeadlineExceeded:
+            raise
         except Exception as e:
-            print(f"Error creating epic: {e}")
+            log.error("jira.create_error", issue_type="Epic", error=str(e), exc_info=True)
             return None
     
-    async def _create_story(self, client: httpx.AsyncClient, project_key: str, story: Dict, epic_key: str, feature: Dict) -> str:
+    async def _create_story(self, client: JiraClient, project_key: str, story: Dict, epic_key: str, feature: Dict, labels: List[str] = None) -> str:
         """Create Story in Jira linked to Epic"""
         try:
-            # Format description in Atlassian Document Format
-            description_content = [
-                {
-                    "type": "paragraph",
-                    "content": [
-                        {"type": "text", "text": f"Feature: {feature.get('title', 'N/A')}"}
-                    ]
-                },
-                {
-                    "type": "paragraph",
-                    "content": [
-                        {"type": "text", "text": story['title']}
-                    ]
-                }
-            ]
-            
-            # Add acceptance criteria
-            if story.get("acceptance_criteria"):
-                description_content.append({
-                    "type": "paragraph",
-                    "content": [
-                        {"type": "text", "text": "Acceptance Criteria:", "marks": [{"type": "strong"}]}
-                    ]
-                })
-                for criteria in story.get("acceptance_criteria", []):
-                    description_content.append({
-                        "type": "bulletList",
-                        "content": [{
-                            "type": "listItem",
-                            "content": [{
-                                "type": "paragraph",
-                                "content": [{"type": "text", "text": criteria}]
-                            }]
-                        }]
-                    })
-            
-            # Add story points if available
-            if story.get("story_points"):
-                description_content.append({
-                    "type": "paragraph",
-                    "content": [
-                        {"type": "text", "text": f"Story Points: {story['story_points']}", "marks": [{"type": "strong"}]}
-                    ]
-                })
-            
-            description_adf = {
-                "type": "doc",
-                "version": 1,
-                "content": description_content
-            }
+            description_adf = self._story_description(story, feature)
             
             payload = {
                 "fields": {
@@ -190,6 +595,8 @@ class JiraIntegration:
                     "issuetype": {"name": "Story"}
                 }
             }
+            if labels:
+                payload["fields"]["labels"] = labels
             
             response = await client.post(
                 f"{self.base_url}/rest/api/3/issue",
@@ -199,40 +606,24 @@ class JiraIntegration:
             
             if response.status_code == 201:
                 story_key = response.json()["key"]
-                print(f"✅ Created Story: {story_key} - {story['title']}")
+                log.success("jira.issue_created", key=story_key, issue_type="Story")
                 # Try to create issue link between story and epic
                 await self._create_epic_link(client, story_key, epic_key)
                 return story_key
             else:
-                print(f"❌ Story creation failed ({response.status_code}): {response.text}")
+                log.warning("jira.create_failed", issue_type="Story", status=response.status_code, body=_excerpt(response))
                 return None
                 
+        except deadline.DeadlineExceeded:
+            raise
         except Exception as e:
-            print(f"Error creating story: {e}")
+            log.error("jira.create_error", issue_type="Story", error=str(e), exc_info=True)
             return None
     
-    async def _create_subtask(self, client: httpx.AsyncClient, project_key: str, task: Dict, parent_key: str) -> str:
+    async def _create_subtask(self, client: JiraClient, project_key: str, task: Dict, parent_key: str, labels: List[str] = None) -> str:
         """Create Sub-task in Jira linked to Story"""
         try:
-            # Format description in Atlassian Document Format
-            description_adf = {
-                "type": "doc",
-                "version": 1,
-                "content": [
-                    {
-                        "type": "paragraph",
-                        "content": [
-                            {"type": "text", "text": f"Development task: {task['title']}"}
-                        ]
-                    },
-                    {
-                        "type": "paragraph",
-                        "content": [
-                            {"type": "text", "text": f"Estimated effort: {task.get('hours', 0)} hours"}
-                        ]
-                    }
-                ]
-            }
+            description_adf = self._subtask_description(task)
             
             # Try different common sub-task issue type names
             subtask_types = ["Sub-task", "Subtask", "Task", "Development", "Technical Task"]
@@ -248,11 +639,11 @@ class JiraIntegration:
                     }
                 }
             
+                if labels:
+                    payload["fields"]["labels"] = labels
+            
                 # Add time estimate if available
-                if task.get("hours"):
-                    payload["fields"]["timetracking"] = {
-                        "originalEstimate": f"{task['hours']}h"
-                    }
+                payload["fields"].update(self._estimate_fields(task))
                 
                 response = await client.post(
                     f"{self.base_url}/rest/api/3/issue",
@@ -262,15 +653,15 @@ class JiraIntegration:
                 
                 if response.status_code == 201:
                     task_key = response.json()["key"]
-                    print(f"✅ Created Sub-task: {task_key} - {task['title']} (type: {issue_type})")
+                    log.success("jira.issue_created", key=task_key, issue_type=issue_type)
                     return task_key
                 elif "valid issue type" not in response.text.lower():
                     # If it's not an issue type error, stop trying other types
-                    print(f"❌ Sub-task creation failed ({response.status_code}): {response.text}")
+                    log.warning("jira.create_failed", issue_type=issue_type, status=response.status_code, body=_excerpt(response))
                     return None
             
             # If all issue types failed, create as a regular Task instead
-            print(f"⚠️  All sub-task types failed, creating as regular Task instead")
+            log.warning("jira.subtask_fallback", parent=parent_key)
             payload["fields"]["issuetype"] = {"name": "Task"}
             payload["fields"].pop("parent", None)  # Remove parent field for regular tasks
             
@@ -282,17 +673,19 @@ class JiraIntegration:
             
             if response.status_code == 201:
                 task_key = response.json()["key"]
-                print(f"✅ Created Task (fallback): {task_key} - {task['title']}")
+                log.success("jira.issue_created", key=task_key, issue_type="Task", fallback=True)
                 return task_key
             else:
-                print(f"❌ Task creation failed ({response.status_code}): {response.text}")
+                log.warning("jira.create_failed", issue_type="Task", status=response.status_code, body=_excerpt(response))
                 return None
                 
+        except deadline.DeadlineExceeded:
+            raise
         except Exception as e:
-            print(f"Error creating sub-task: {e}")
+            log.error("jira.create_error", issue_type="Sub-task", error=str(e), exc_info=True)
             return None
     
-    async def _create_epic_link(self, client: httpx.AsyncClient, story_key: str, epic_key: str) -> bool:
+    async def _create_epic_link(self, client: JiraClient, story_key: str, epic_key: str) -> bool:
         """Create link between story and epic using issue links"""
         try:
             # Try different common link types
@@ -318,26 +711,29 @@ class JiraIntegration:
                 )
                 
                 if response.status_code == 201:
-                    print(f"✅ Linked story {story_key} to epic {epic_key} using '{link_type}'")
+                    log.success("jira.epic_linked", story=story_key, epic=epic_key, link_type=link_type)
                     return True
                 elif "system link type" not in response.text.lower():
                     # If it's not a system link type error, stop trying
                     break
             
-            print(f"⚠️  Epic link failed (non-critical) - will add to description instead")
+            log.info("jira.epic_link_skipped", story=story_key, epic=epic_key)
             return False
                 
+        except deadline.DeadlineExceeded:
+            return False
         except Exception as e:
-            print(f"⚠️  Epic link error (non-critical): {e}")
+            log.warning("jira.epic_link_error", story=story_key, epic=epic_key, error=str(e))
             return False
     
     async def test_connection(self) -> Dict:
         """Test Jira connection and get project info"""
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
+            async with jira_pool.POOL.client(self.base_url, self.auth, self.headers) as client:
                 response = await client.get(
                     f"{self.base_url}/rest/api/3/myself",
-                    headers=self.headers
+                    headers=self.headers,
+                    timeout=10
                 )
                 
                 if response.status_code == 200:
@@ -359,29 +755,59 @@ class JiraIntegration:
                 "error": f"Connection failed: {str(e)}"
             }
     
-    async def list_projects(self) -> Dict:
-        """List all available projects the user has access to"""
+    async def list_projects(self, query: str = "", start_at: int = 0, max_results: int = 50) -> Dict:
+        """
+        List one page of projects the user has access to.
+        
+        Uses the paginated /project/search endpoint with server-side
+        filtering, and caches each page per site and credentials for
+        JIRA_PROJECT_CACHE_TTL seconds so repeated picker lookups are cheap.
+        
+        Args:
+            query: Case-insensitive filter on project key and name
+            start_at: Index of the first project to return
+            max_results: Page size (Jira caps this at 100)
+        """
+        max_results = max(1, min(int(max_results), 100))
+        start_at = max(0, int(start_at))
+        query = (query or "").strip()
+        cache_key = (*jira_pool.JiraClientPool.key(self.base_url, self.auth), query.lower(), start_at, max_results)
+        cached = PROJECT_CACHE.get(cache_key)
+        if cached is not None:
+            return {**cached, "cached": True}
+        
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
+            async with jira_pool.POOL.client(self.base_url, self.auth, self.headers) as client:
+                params = {"startAt": start_at, "maxResults": max_results, "orderBy": "key"}
+                if query:
+                    params["query"] = query
                 response = await client.get(
-                    f"{self.base_url}/rest/api/3/project",
-                    headers=self.headers
+                    f"{self.base_url}/rest/api/3/project/search",
+                    headers=self.headers,
+                    params=params,
+                    timeout=10
                 )
                 
                 if response.status_code == 200:
-                    projects = response.json()
+                    page = response.json()
                     project_list = [
                         {
                             "key": project.get("key"),
                             "name": project.get("name"),
                             "id": project.get("id")
                         }
-                        for project in projects
+                        for project in page.get("values", [])
                     ]
-                    return {
+                    result = {
                         "success": True,
-                        "projects": project_list
+                        "projects": project_list,
+                        "total": page.get("total", len(project_list)),
+                        "start_at": page.get("startAt", start_at),
+                        "max_results": page.get("maxResults", max_results),
+                        "is_last": page.get("isLast", True)
                     }
+                    PROJECT_CACHE.set(cache_key, result)
+                    return {**result, "cached": False}
                 else:
                     return {
                         "success": False,
@@ -396,10 +822,11 @@ class JiraIntegration:
     async def validate_project(self, project_key: str) -> Dict:
         """Validate if a project key exists and user has access"""
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
+            async with jira_pool.POOL.client(self.base_url, self.auth, self.headers) as client:
                 response = await client.get(
                     f"{self.base_url}/rest/api/3/project/{project_key}",
-                    headers=self.headers
+                    headers=self.headers,
+                    timeout=10
                 )
                 
                 if response.status_code == 200:
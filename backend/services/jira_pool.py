@@ -0,0 +1,106 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from services.jira_client import JiraClient
+
+
+class _PooledClient:
+    def __init__(self, client: JiraClient):
+        self.client = client
+        self.users = 0
+        self.last_used = time.monotonic()
+        self.evicted = False
+
+
+class JiraClientPool:
+    """
+    Bounded registry of warm JiraClients keyed by (base_url, auth hash).
+
+    Back-to-back calls for the same site and credentials reuse one
+    connection pool (and one rate limiter) instead of paying DNS, TCP and
+    TLS setup each time. Least recently used clients are evicted when the
+    pool is full, and clients idle for longer than `idle_ttl` are closed.
+    A client that is still in use is only closed once its last user is done.
+    """
+
+    def __init__(self, max_clients: int = 32, idle_ttl: float = 300.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.max_clients = max_clients
+        self.idle_ttl = idle_ttl
+        self.transport = transport
+        self._clients: "OrderedDict[Tuple[str, str], _PooledClient]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    @staticmethod
+    def key(base_url: str, auth: str) -> Tuple[str, str]:
+        """Registry key. Credentials are hashed so raw tokens are never kept as keys."""
+        return base_url.rstrip('/').lower(), hashlib.sha256(auth.encode()).hexdigest()
+
+    def _close(self, entry: _PooledClient):
+        entry.evicted = True
+        if entry.users == 0:
+            asyncio.ensure_future(entry.client.aclose())
+
+    def _sweep(self, now: float):
+        for key, entry in list(self._clients.items()):
+            if entry.users == 0 and now - entry.last_used > self.idle_ttl:
+                del self._clients[key]
+                self.stats["expired"] += 1
+                self._close(entry)
+        while len(self._clients) > self.max_clients:
+            _, entry = self._clients.popitem(last=False)
+            self.stats["evictions"] += 1
+            self._close(entry)
+
+    def _checkout(self, base_url: str, auth: str, headers: Dict[str, str]) -> _PooledClient:
+        now = time.monotonic()
+        key = self.key(base_url, auth)
+        entry = self._clients.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            entry = _PooledClient(JiraClient(headers, timeout=30, transport=self.transport))
+            self._clients[key] = entry
+        else:
+            self.stats["hits"] += 1
+            self._clients.move_to_end(key)
+        entry.users += 1
+        entry.last_used = now
+        self._sweep(now)
+        return entry
+
+    @asynccontextmanager
+    async def client(self, base_url: str, auth: str, headers: Dict[str, str]):
+        """Borrow the pooled client for this site and credentials."""
+        entry = self._checkout(base_url, auth, headers)
+        try:
+            yield entry.client
+        finally:
+            entry.users -= 1
+            entry.last_used = time.monotonic()
+            if entry.evicted and entry.users == 0:
+                await entry.client.aclose()
+
+    def metrics(self) -> Dict:
+        return {**self.stats, "clients": len(self._clients), "max_clients": self.max_clients}
+
+    async def aclose(self):
+        """Close every pooled client (application shutdown)."""
+        entries = list(self._clients.values())
+        self._clients.clear()
+        for entry in entries:
+            entry.evicted = True
+            await entry.client.aclose()
+
+
+# process-wide pool shared by every JiraIntegration
+POOL = JiraClientPool(
+    max_clients=int(os.getenv("JIRA_POOL_MAX_CLIENTS", "32")),
+    idle_ttl=float(os.getenv("JIRA_POOL_IDLE_TTL", "300"))
+)
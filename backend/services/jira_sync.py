@@ -0,0 +1,77 @@
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Labels carry our local ids so a later sync can find issues it created.
+# Jira labels may not contain spaces, so everything is slug-safe.
+SESSION_LABEL_PREFIX = "okr-session-"
+ID_LABEL_PREFIX = "okr-id-"
+HASH_LABEL_PREFIX = "okr-hash-"
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]", "_", str(value))
+
+
+def session_label(session_id: str) -> str:
+    return f"{SESSION_LABEL_PREFIX}{_slug(session_id)}"
+
+
+def fingerprint(summary: str, description: Dict) -> str:
+    """Short stable hash of the fields we write, used to detect edits."""
+    raw = json.dumps([summary, description], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def node_labels(session_id: str, local_id: str, fp: str) -> List[str]:
+    return [session_label(session_id), f"{ID_LABEL_PREFIX}{_slug(local_id)}", f"{HASH_LABEL_PREFIX}{fp}"]
+
+
+def parse_labels(labels: List[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Return (local_id, fingerprint) recovered from an issue's labels."""
+    local_id = fp = None
+    for label in labels or []:
+        if label.startswith(ID_LABEL_PREFIX):
+            local_id = label[len(ID_LABEL_PREFIX):]
+        elif label.startswith(HASH_LABEL_PREFIX):
+            fp = label[len(HASH_LABEL_PREFIX):]
+    return local_id, fp
+
+
+def session_jql(project_key: str, session_id: str) -> str:
+    return f'project = "{project_key}" AND labels = "{session_label(session_id)}"'
+
+
+def index_issues(issues: List[Dict]) -> Dict[str, Dict]:
+    """
+    Map local id -> {"key", "fingerprint"} from Jira search results.
+    Issues without our id label are ignored.
+    """
+    existing = {}
+    for issue in issues:
+        local_id, fp = parse_labels(issue.get("fields", {}).get("labels", []))
+        if local_id:
+            existing[local_id] = {"key": issue.get("key"), "fingerprint": fp}
+    return existing
+
+
+def diff_node(local_id: str, fp: str, existing: Dict[str, Dict]) -> Tuple[str, Optional[str]]:
+    """
+    Decide what to do with one node.
+
+    Returns:
+        ("create", None), ("update", issue_key) or ("unchanged", issue_key)
+    """
+    found = existing.get(_slug(local_id))
+    if not found:
+        return "create", None
+    if found.get("fingerprint") == fp:
+        return "unchanged", found["key"]
+    return "update", found["key"]
+
+
+def orphaned_keys(existing: Dict[str, Dict], local_ids: List[str]) -> List[str]:
+    """Issue keys that carry our labels but no longer exist in the plan."""
+    wanted = {_slug(i) for i in local_ids}
+    return sorted(v["key"] for k, v in existing.items() if k not in wanted)
@@ -0,0 +1,205 @@
+"""
+Admission control for Gemini calls: a global concurrency cap shared by two
+priority classes, so bulk work cannot starve what a user is waiting on.
+
+    interactive   a planner clicking through the UI (the default)
+    background    prefetch, bulk generation, regeneration jobs
+
+The class travels in a contextvar, so it follows a request into threadpool
+workers and asyncio tasks:
+
+    with llm_scheduler.priority("background"):
+        orchestrator.generate_tasks(...)
+
+or per request with an "X-Priority: background" header (PriorityMiddleware).
+
+When a slot frees up, the oldest interactive waiter goes first; background
+calls are admitted only while fewer than their quota hold slots. When the
+queue is full, an arriving interactive call preempts the newest queued
+background call (which fails with LLMPreempted), and an arriving
+background call is refused outright. Calls already running are never
+interrupted. A caller with a request deadline (services.deadline) stops
+waiting when it passes.
+
+    LLM_MAX_CONCURRENCY (8)   slots across both classes
+    LLM_BACKGROUND_MAX (2)    slots background calls may hold at once
+    LLM_QUEUE_LIMIT (64)      waiting calls before preemption starts
+    LLM_THREAD_HEADROOM (16)  worker threads kept free beyond those two
+
+Admission blocks the calling thread, and sync routes run in AnyIO's worker
+pool (40 threads by default). If queued calls could take every worker,
+interactive requests would wait FIFO for a thread before ever reaching the
+scheduler, so fit_threadpool() (called at app startup) grows the pool to
+hold every running and queued call with headroom to spare.
+"""
+import contextvars
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from services import metrics
+from services.deadline import DeadlineExceeded
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITIES = (INTERACTIVE, BACKGROUND)  # highest first
+
+PRIORITY: contextvars.ContextVar = contextvars.ContextVar("okr_llm_priority", default=INTERACTIVE)
+
+
+class LLMPreempted(RuntimeError):
+    """A queued call was dropped (or refused) to make room for higher priority work"""
+
+
+@contextmanager
+def priority(name: str):
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority {name!r}, expected one of {PRIORITIES}")
+    token = PRIORITY.set(name)
+    try:
+        yield
+    finally:
+        PRIORITY.reset(token)
+
+
+class _Ticket:
+    __slots__ = ("priority", "seq", "granted", "preempted")
+
+    def __init__(self, priority: str, seq: int):
+        self.priority = priority
+        self.seq = seq
+        self.granted = False
+        self.preempted = False
+
+
+class LLMScheduler:
+    def __init__(self, max_concurrency: int = 8, quotas: Optional[Dict[str, int]] = None, queue_limit: int = 64):
+        self.max_concurrency = max_concurrency
+        self.quotas = {p: max_concurrency for p in PRIORITIES}
+        self.quotas.update(quotas or {})
+        self.queue_limit = queue_limit
+        self._cond = threading.Condition()
+        self._running = {p: 0 for p in PRIORITIES}
+        self._queue: List[_Ticket] = []
+        self._seq = itertools.count()
+
+    def _publish(self):
+        for p in PRIORITIES:
+            metrics.LLM_QUEUE_DEPTH.set(sum(1 for t in self._queue if t.priority == p), priority=p)
+            metrics.LLM_IN_FLIGHT.set(self._running[p], priority=p)
+
+    def _dispatch(self):
+        """Grant free slots to waiters, highest class first, oldest first within a class"""
+        for ticket in sorted(self._queue, key=lambda t: (PRIORITIES.index(t.priority), t.seq)):
+            if sum(self._running.values()) >= self.max_concurrency:
+                break
+            if self._running[ticket.priority] < self.quotas[ticket.priority]:
+                ticket.granted = True
+                self._running[ticket.priority] += 1
+                self._queue.remove(ticket)
+
+    def _make_room(self, ticket: _Ticket):
+        if len(self._queue) < self.queue_limit:
+            return
+        lower = [t for t in self._queue if PRIORITIES.index(t.priority) > PRIORITIES.index(ticket.priority)]
+        if not lower:
+            if ticket.priority != PRIORITIES[0]:
+                metrics.LLM_PREEMPTED.inc(priority=ticket.priority)
+                raise LLMPreempted(f"LLM queue full ({len(self._queue)} waiting)")
+            return  # interactive work waits rather than being shed
+        victim = max(lower, key=lambda t: (PRIORITIES.index(t.priority), t.seq))
+        victim.preempted = True
+        self._queue.remove(victim)
+        metrics.LLM_PREEMPTED.inc(priority=victim.priority)
+
+    @contextmanager
+    def slot(self, priority: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Hold one slot for the duration of the block; yields the seconds spent
+        queued. Gives up with DeadlineExceeded after `timeout` seconds queued.
+        """
+        ticket = _Ticket(priority or PRIORITY.get(), next(self._seq))
+        started = time.perf_counter()
+        if timeout is not None and timeout <= 0:
+            raise DeadlineExceeded("Request deadline exceeded before an LLM slot was free")
+        with self._cond:
+            self._make_room(ticket)
+            self._queue.append(ticket)
+            self._dispatch()
+            self._cond.notify_all()
+            while not (ticket.granted or ticket.preempted):
+                self._publish()
+                left = None if timeout is None else timeout - (time.perf_counter() - started)
+                if left is not None and left <= 0:
+                    self._queue.remove(ticket)
+                    break
+                self._cond.wait(left)
+            self._publish()
+        waited = time.perf_counter() - started
+        metrics.LLM_QUEUE_WAIT.observe(waited, priority=ticket.priority)
+        if ticket.preempted:
+            raise LLMPreempted("Queued LLM call preempted by higher priority work")
+        if not ticket.granted:
+            raise DeadlineExceeded("Request deadline exceeded before an LLM slot was free")
+        try:
+            yield waited
+        finally:
+            with self._cond:
+                self._running[ticket.priority] -= 1
+                self._dispatch()
+                self._publish()
+                self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "quotas": dict(self.quotas),
+                "queue_limit": self.queue_limit,
+                "running": dict(self._running),
+                "queued": {p: sum(1 for t in self._queue if t.priority == p) for p in PRIORITIES},
+            }
+
+
+THREAD_HEADROOM = int(os.getenv("LLM_THREAD_HEADROOM", "16"))
+
+
+def fit_threadpool(headroom: Optional[int] = None) -> int:
+    """
+    Grow the default AnyIO thread limiter so running and queued Gemini calls
+    cannot exhaust it. Must run inside the event loop; returns the pool size.
+    """
+    from anyio import to_thread
+    limiter = to_thread.current_default_thread_limiter()
+    needed = SCHEDULER.max_concurrency + SCHEDULER.queue_limit + (THREAD_HEADROOM if headroom is None else headroom)
+    if limiter.total_tokens < needed:
+        limiter.total_tokens = needed
+    return limiter.total_tokens
+
+
+SCHEDULER = LLMScheduler(
+    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+    quotas={BACKGROUND: int(os.getenv("LLM_BACKGROUND_MAX", "2"))},
+    queue_limit=int(os.getenv("LLM_QUEUE_LIMIT", "64")),
+)
+
+
+class PriorityMiddleware:
+    """Runs a request as background work when it carries "X-Priority: background"."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = dict(scope.get("headers", [])).get(b"x-priority", b"").decode("latin-1").lower()
+        if requested not in PRIORITIES:
+            await self.app(scope, receive, send)
+            return
+        with priority(requested):
+            await self.app(scope, receive, send)
@@ -0,0 +1,179 @@
+"""
+Structured, non-blocking logging.
+
+Records are formatted as JSON lines in the calling thread (so the request
+id, trace id and exception text are captured where they happen) and
+written to stdout by a QueueListener thread, so the event loop never waits
+on terminal or pipe I/O. When the queue is full, records are dropped and
+counted rather than blocking.
+
+    log = get_logger("jira")
+    log.info("jira.issue_created", key="OKR-12", issue_type="Epic")
+    log.success("jira.issue_created", ...)   # INFO, kept at LOG_SUCCESS_SAMPLE_RATE
+    log.error("jira.upload_failed", error=str(e), exc_info=True)
+
+Environment: LOG_LEVEL (INFO), LOG_SUCCESS_SAMPLE_RATE (1.0), LOG_QUEUE_SIZE (10000).
+"""
+import atexit
+import contextvars
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+
+from services import fast_json
+
+REQUEST_ID: contextvars.ContextVar = contextvars.ContextVar("okr_request_id", default=None)
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+SUCCESS_SAMPLE_RATE = float(os.getenv("LOG_SUCCESS_SAMPLE_RATE", "1.0"))
+QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+STATS = {"dropped": 0, "sampled_out": 0}
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            entry["trace_id"] = trace_id
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return fast_json.dumps(entry).decode()
+
+
+class _ContextFilter(logging.Filter):
+    """Runs in the emitting thread: stamps correlation ids and samples success events."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "success", False) and SUCCESS_SAMPLE_RATE < 1.0:
+            if random.random() >= SUCCESS_SAMPLE_RATE:
+                STATS["sampled_out"] += 1
+                return False
+        record.request_id = REQUEST_ID.get()
+        tracing = sys.modules.get("services.tracing")
+        if tracing is not None:
+            record.trace_id = tracing.current().trace_id
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Format here, then ship only the finished line across the queue
+        line = self.format(record)
+        return logging.makeLogRecord({"msg": line, "levelno": record.levelno, "levelname": record.levelname})
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            STATS["dropped"] += 1
+
+
+class StructuredLogger:
+    """Thin wrapper turning keyword arguments into JSON fields."""
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    def _log(self, level: int, event: str, exc_info=None, success: bool = False, **fields):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, event, exc_info=exc_info, extra={"fields": fields, "success": success})
+
+    def debug(self, event: str, **fields):
+        self._log(logging.DEBUG, event, **fields)
+
+    def info(self, event: str, **fields):
+        self._log(logging.INFO, event, **fields)
+
+    def success(self, event: str, **fields):
+        """Routine success event; subject to LOG_SUCCESS_SAMPLE_RATE"""
+        self._log(logging.INFO, event, success=True, **fields)
+
+    def warning(self, event: str, **fields):
+        self._log(logging.WARNING, event, **fields)
+
+    def error(self, event: str, exc_info=None, **fields):
+        self._log(logging.ERROR, event, exc_info=exc_info, **fields)
+
+
+_listener = None
+
+
+def configure(stream=None):
+    """Install the queue handler on the "okr" logger (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+    log_queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+    handler = _QueueHandler(log_queue)
+    handler.setFormatter(JSONFormatter())
+    handler.addFilter(_ContextFilter())
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(logging.Formatter("%(message)s"))
+    _listener = logging.handlers.QueueListener(log_queue, output)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger("okr")
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(handler)
+    root.propagate = False
+
+
+def get_logger(name: str) -> StructuredLogger:
+    configure()
+    return StructuredLogger(logging.getLogger(f"okr.{name}"))
+
+
+class RequestIdMiddleware:
+    """Per-request correlation id: taken from X-Request-ID or generated, and echoed back."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers", []))
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")[:128] or uuid.uuid4().hex
+        token = REQUEST_ID.set(request_id)
+        started = time.perf_counter()
+        status = {"code": None}
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            fields = dict(method=scope.get("method", "WS"), path=scope["path"], status=status["code"],
+                          duration_ms=round((time.perf_counter() - started) * 1000, 1))
+            if status["code"] is not None and status["code"] >= 500:
+                _access.warning("http.request", **fields)
+            else:
+                _access.success("http.request", **fields)
+            REQUEST_ID.reset(token)
+
+
+_access = get_logger("http")
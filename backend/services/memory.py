@@ -0,0 +1,225 @@
+"""
+Resident memory by subsystem, for the /admin/memory endpoints.
+
+Sizes are deep sizes: sys.getsizeof summed over everything reachable
+through containers and through instances of this app's own classes
+(sessions, caches, subscribers). Foreign objects such as event loops,
+locks and clients are counted shallowly and never walked, so each figure
+covers the data a subsystem holds rather than the machinery around it.
+Inside one figure a shared object counts once; interned strings shared by
+two sessions count in both per-session figures.
+
+tracemalloc is off by default (it slows allocation). Taking a snapshot
+switches it on; allocations from before that are not attributed. Two
+snapshots, or a snapshot and now, can be diffed to find what grew in
+between, both per subsystem and per allocation site.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+OWN_PACKAGES = ("services.", "models.", "agents.")
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "1"))
+MAX_SNAPSHOTS = int(os.getenv("MEMORY_SNAPSHOTS", "4"))
+
+_CONTAINERS = (list, tuple, set, frozenset)
+
+
+def _walks_into(obj) -> bool:
+    return type(obj).__module__.startswith(OWN_PACKAGES)
+
+
+def deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    """Bytes reachable from obj, each object counted once per `seen` set"""
+    seen = set() if seen is None else seen
+    total = 0
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        try:
+            if isinstance(item, dict):
+                for key, value in list(item.items()):
+                    pending.append(key)
+                    pending.append(value)
+            elif isinstance(item, _CONTAINERS) or type(item).__name__ == "deque":
+                pending.extend(list(item))
+            elif _walks_into(item):
+                if hasattr(item, "__dict__"):
+                    pending.append(item.__dict__)
+                for cls in type(item).__mro__:
+                    for slot in getattr(cls, "__slots__", ()):
+                        if hasattr(item, slot):
+                            pending.append(getattr(item, slot))
+        except RuntimeError:
+            # Mutated by a worker mid-walk; the figure is an estimate anyway
+            continue
+    return total
+
+
+def process_memory() -> Dict:
+    stats = {}
+    try:
+        with open("/proc/self/statm") as f:
+            stats["rss_bytes"] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # KiB on Linux, bytes on macOS
+        stats["max_rss_bytes"] = max_rss if sys.platform == "darwin" else max_rss * 1024
+    except ImportError:
+        pass
+    return stats
+
+
+def _session_counts(session) -> Dict:
+    stories = [s for e in session.epics for f in e.features for s in f.stories]
+    return {"epics": len(session.epics), "stories": len(stories), "tasks": sum(len(s.tasks) for s in stories)}
+
+
+def sessions_report(largest: int = 5) -> Dict:
+    from services.orchestrator import STORE
+
+    sessions = list(STORE.items())
+    sizes = sorted(((deep_sizeof(session), sid, session) for sid, session in sessions),
+                   key=lambda row: row[0], reverse=True)
+    shared: set = set()
+    return {
+        "count": len(sessions),
+        "bytes": sum(deep_sizeof(session, shared) for _, session in sessions),
+        "largest": [{"session_id": sid, "bytes": size, **_session_counts(session)}
+                    for size, sid, session in sizes[:largest]],
+    }
+
+
+def _cache_report(cache) -> Dict:
+    return {"entries": len(cache), "bytes": deep_sizeof(cache)}
+
+
+def subsystems(largest: int = 5) -> Dict:
+    from agents._llm import LLM_CACHE
+    from services.session_events import HUB
+
+    report = {
+        "sessions": sessions_report(largest),
+        "llm_cache": _cache_report(LLM_CACHE),
+        "session_events": {"sessions": len(HUB._subscribers), "bytes": deep_sizeof(HUB)},
+    }
+    # Only once something has used Jira; importing it here would defeat the lazy import
+    jira = sys.modules.get("services.jira_integration")
+    if jira is not None:
+        report["jira_project_cache"] = _cache_report(jira.PROJECT_CACHE)
+    return report
+
+
+def _flat(report: Dict) -> Dict[str, int]:
+    return {name: section["bytes"] for name, section in report.items()}
+
+
+def tracemalloc_report(limit: int = 10) -> Dict:
+    if not tracemalloc.is_tracing():
+        return {"tracing": False}
+    current, peak = tracemalloc.get_traced_memory()
+    stats = _filtered(tracemalloc.take_snapshot()).statistics("lineno")[:limit]
+    return {
+        "tracing": True,
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "top": [{"location": str(s.traceback[0]), "bytes": s.size, "count": s.count} for s in stats],
+    }
+
+
+def _filtered(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+    return snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ])
+
+
+def report(largest: int = 5, limit: int = 10) -> Dict:
+    return {"process": process_memory(), "subsystems": subsystems(largest), "tracemalloc": tracemalloc_report(limit)}
+
+
+class SnapshotStore:
+    """The last `max_entries` tracemalloc snapshots, each with its subsystem sizes"""
+
+    def __init__(self, max_entries: int = MAX_SNAPSHOTS):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _capture(entry_id: str) -> Dict:
+        return {
+            "id": entry_id,
+            "taken": round(time.time(), 3),
+            "traced_bytes": tracemalloc.get_traced_memory()[0],
+            "subsystems": _flat(subsystems()),
+            "snapshot": _filtered(tracemalloc.take_snapshot()),
+        }
+
+    def take(self) -> Dict:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        entry = self._capture(uuid.uuid4().hex[:12])
+        with self._lock:
+            self._data[entry["id"]] = entry
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return self.describe(entry)
+
+    @staticmethod
+    def describe(entry: Dict) -> Dict:
+        return {k: v for k, v in entry.items() if k != "snapshot"}
+
+    def get(self, snapshot_id: str) -> Optional[Dict]:
+        return self._data.get(snapshot_id)
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            return [self.describe(e) for e in self._data.values()]
+
+    def clear(self):
+        """Drop every snapshot and switch tracemalloc off again"""
+        with self._lock:
+            self._data.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def diff(self, old_id: str, new_id: Optional[str] = None, limit: int = 20) -> Optional[Dict]:
+        """
+        Growth from snapshot old_id to new_id, or to the present. The present
+        is captured for this diff only: it is not stored, and tracemalloc is
+        never switched on here.
+        """
+        old = self.get(old_id)
+        if old is None or not tracemalloc.is_tracing():
+            return None
+        new = self.get(new_id) if new_id else self._capture("now")
+        if new is None:
+            return None
+        stats = new["snapshot"].compare_to(old["snapshot"], "lineno")
+        return {
+            "from": self.describe(old),
+            "to": self.describe(new),
+            "seconds": round(new["taken"] - old["taken"], 1),
+            "traced_bytes_diff": new["traced_bytes"] - old["traced_bytes"],
+            "subsystems_diff": {name: new["subsystems"].get(name, 0) - old["subsystems"].get(name, 0)
+                                for name in new["subsystems"].keys() | old["subsystems"].keys()},
+            "top": [{"location": str(s.traceback[0]), "bytes_diff": s.size_diff, "count_diff": s.count_diff,
+                     "bytes": s.size} for s in stats[:limit]],
+        }
+
+
+SNAPSHOTS = SnapshotStore()
@@ -0,0 +1,265 @@
+"""
+In-process metrics exposed at /metrics in the Prometheus text format.
+
+A deliberately small subset of the Prometheus client: labelled counters and
+histograms, thread-safe (agents run in threadpool workers) and rendered on
+scrape. Per-process, like every other cache and store in this service.
+"""
+import re
+import threading
+import time
+from functools import wraps
+from typing import Dict, List, Sequence, Tuple
+from urllib.parse import urlsplit
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> [per-bucket counts, sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._series.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = 'le="' + _format_value(float(bound)) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+AGENT_DURATION = REGISTRY.histogram("okr_agent_duration_seconds", "Agent call latency", ["agent"])
+AGENT_ERRORS = REGISTRY.counter("okr_agent_errors_total", "Agent calls that raised", ["agent"])
+AGENT_FALLBACKS = REGISTRY.counter("okr_agent_fallbacks_total", "Agent calls answered with canned fallback output", ["agent"])
+
+LLM_DURATION = REGISTRY.histogram("okr_llm_request_duration_seconds", "Gemini HTTP round trip latency")
+LLM_REQUESTS = REGISTRY.counter("okr_llm_requests_total", "Gemini calls by outcome (ok, error, cache_hit, unconfigured, stub, preempted, deadline)", ["outcome"])
+LLM_PROMPT_TOKENS = REGISTRY.histogram("okr_llm_prompt_tokens", "Prompt tokens per Gemini call (usageMetadata)", buckets=TOKEN_BUCKETS)
+LLM_RESPONSE_TOKENS = REGISTRY.histogram("okr_llm_response_tokens", "Candidate tokens per Gemini call (usageMetadata)", buckets=TOKEN_BUCKETS)
+LLM_TOKENS = REGISTRY.counter("okr_llm_tokens_total", "Gemini tokens consumed", ["kind"])
+LLM_QUEUE_DEPTH = REGISTRY.gauge("okr_llm_queue_depth", "Gemini calls waiting for a scheduler slot", ["priority"])
+LLM_IN_FLIGHT = REGISTRY.gauge("okr_llm_in_flight", "Gemini calls holding a scheduler slot", ["priority"])
+LLM_QUEUE_WAIT = REGISTRY.histogram("okr_llm_queue_wait_seconds", "Time spent waiting for a scheduler slot", ["priority"])
+LLM_PREEMPTED = REGISTRY.counter("okr_llm_preempted_total", "Queued Gemini calls dropped to make room for higher priority work", ["priority"])
+
+JIRA_REQUESTS = REGISTRY.counter("okr_jira_requests_total", "Jira HTTP requests (every attempt, including retries)", ["method", "endpoint", "status"])
+JIRA_DURATION = REGISTRY.histogram("okr_jira_request_duration_seconds", "Jira HTTP request latency", ["method", "endpoint"])
+
+
+def timed_agent(name: str):
+    """Decorator recording latency and errors of an agent function"""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                AGENT_ERRORS.inc(agent=name)
+                raise
+            finally:
+                AGENT_DURATION.observe(time.perf_counter() - started, agent=name)
+        return wrapper
+    return decorate
+
+
+def record_fallback(agent: str):
+    AGENT_FALLBACKS.inc(agent=agent)
+
+
+def record_error(agent: str):
+    """For agents that catch their own exceptions and still return a result"""
+    AGENT_ERRORS.inc(agent=agent)
+
+
+def record_llm_usage(usage: Dict):
+    """Record token counts from a Gemini usageMetadata block (missing fields are skipped)"""
+    prompt = usage.get("promptTokenCount")
+    response = usage.get("candidatesTokenCount")
+    if prompt is not None:
+        LLM_PROMPT_TOKENS.observe(prompt)
+        LLM_TOKENS.inc(prompt, kind="prompt")
+    if response is not None:
+        LLM_RESPONSE_TOKENS.observe(response)
+        LLM_TOKENS.inc(response, kind="response")
+
+
+_ISSUE_KEY = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$")
+
+
+def endpoint_label(url: str) -> str:
+    """
+    Jira URL -> low-cardinality endpoint label: host and query dropped,
+    issue keys and numeric ids replaced by placeholders.
+
+        https://x.atlassian.net/rest/api/3/issue/OKR-12 -> /rest/api/3/issue/{key}
+    """
+    segments = urlsplit(url).path.rstrip("/").split("/")
+    for i, segment in enumerate(segments):
+        if i and segments[i - 1] == "api":
+            continue  # API version
+        if segment.isdigit():
+            segments[i] = "{id}"
+        elif _ISSUE_KEY.match(segment):
+            segments[i] = "{key}"
+        elif i and segments[i - 1] == "project" and segment != "search":
+            segments[i] = "{key}"
+    return "/".join(segments) or "/"
+
+
+def render() -> str:
+    return REGISTRY.render()
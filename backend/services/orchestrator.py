@@ -1,92 +1,198 @@
 from typing import Dict
-from models.okr_schema import OKRStructure, Objective, KeyResult, Epic, Feature, Story, Task
-from agents import kr_suggester, planner, story_generator, estimator, validator
-import json
+from models.okr_schema import (
+    KEY_RESULTS, EPICS, STORIES, TASKS,
+    KR_PROMPT_FIELDS, FEATURE_PROMPT_FIELDS, STORY_PROMPT_FIELDS, VALIDATOR_FIELDS,
+)
+from models import compact
+from services import fast_json
+from services import tracing
+from services import session_token as tokens
+from services.session_events import HUB
+import importlib
 import uuid
 
-# in-memory store
-STORE: Dict[str, OKRStructure] = {}
+def _agent(name: str):
+    """Import an agent module on first use so a cold start only pays for the agents it calls"""
+    return importlib.import_module(f"agents.{name}")
+
+# in-memory store; sessions are held compactly, pydantic models only validate input
+STORE: Dict[str, compact.Session] = {}
+
+# Signature of the token matching each session's STORE entry (issued or loaded here)
+CURRENT: Dict[str, str] = {}
+
+def _publish_children(session_id: str, parent_id: str, kind: str, old: list, new: list):
+    """Tell live viewers that a node's children were replaced"""
+    if not HUB.has_subscribers(session_id):
+        return
+    for node in old:
+        HUB.publish(session_id, {"op": "removed", "kind": kind, "id": node.id})
+    for node in new:
+        HUB.publish(session_id, {"op": "added", "kind": kind, "parent": parent_id, "node": compact.to_dict(node)})
 
 def create_session(objective_text: str) -> str:
-    obj = Objective(text=objective_text)
-    struct = OKRStructure(objective=obj, krs=[], epics=[], warnings=[])
     sid = uuid.uuid4().hex
-    STORE[sid] = struct
+    STORE[sid] = compact.new_session(objective_text)
     return sid
 
+def issue_token(session_id: str) -> str:
+    """Signed, self-contained token for the session's current state"""
+    token = tokens.encode(session_id, STORE[session_id])
+    CURRENT[session_id] = tokens.signature(token)
+    return token
+
+@tracing.traced("orchestrator.resume_session")
+def resume_session(token: str, session_id: str = None) -> str:
+    """
+    Load a session from a token into this worker's STORE.
+    The token is the client's latest view of the session, so it wins over
+    whatever this instance may have cached. When this instance issued or
+    last loaded that very token, STORE already holds its state and the
+    decode is skipped.
+    """
+    if session_id in STORE and CURRENT.get(session_id) == tokens.signature(token):
+        return session_id
+    sid, struct = tokens.decode(token)
+    if session_id and sid != session_id:
+        raise ValueError("Session token does not match session_id")
+    previous = STORE.get(sid)
+    STORE[sid] = compact.from_model(struct)
+    CURRENT[sid] = tokens.signature(token)
+    # Viewers only need a resync when the token's tree differs from the one they were shown
+    # (pack()[2:] skips the session id and issue time)
+    if previous is not None and HUB.has_subscribers(sid) and tokens.pack(sid, previous)[2:] != tokens.pack(sid, struct)[2:]:
+        HUB.publish(sid, {"op": "resync", "reason": "session reloaded"})
+    return sid
+
+@tracing.traced("orchestrator.suggest_krs")
 def suggest_krs(session_id: str) -> dict:
     struct = STORE[session_id]
-    resp = kr_suggester.kr_suggester(struct.objective.text)
-    parsed = json.loads(resp)
-    krs = [KeyResult(**kr) for kr in parsed.get("krs", [])]
-    struct.krs = krs
-    return {"krs": [kr.dict() for kr in krs]}
+    parsed = _agent("kr_suggester").kr_suggester(struct.objective.text)
+    krs = [compact.from_model(kr) for kr in KEY_RESULTS.validate_python(parsed.get("krs", []))]
+    old, struct.krs = struct.krs, krs
+    _publish_children(session_id, struct.objective.id, "kr", old, krs)
+    return {"krs": compact.to_dict(krs)}
 
+@tracing.traced("orchestrator.generate_epics")
 def generate_epics(session_id: str, kr_id: str) -> dict:
     struct = STORE[session_id]
-    kr = next((k for k in struct.krs if k.id == kr_id or k.dict().get("id")==kr_id), None)
+    kr = next((k for k in struct.krs if k.id == kr_id), None)
     if not kr:
         # try find by text match
         kr = next((k for k in struct.krs if k.text == kr_id), None)
     if not kr:
         raise ValueError("KR not found")
-    resp = planner.planner(struct.objective.text, kr.dict())
-    parsed = json.loads(resp)
-    epics = []
-    for e in parsed.get("epics", []):
-        features = []
-        for f in e.get("features", []):
-            features.append(Feature(title=f.get("title"), description=f.get("description","")))
-        epics.append(Epic(title=e.get("title"), features=features))
-    struct.epics = epics
-    return {"epics": [e.dict() for e in epics]}
+    parsed = _agent("planner").planner(struct.objective.text, compact.to_dict(kr, KR_PROMPT_FIELDS))
+    # LLM ids are dropped; nodes get fresh ids from the schema's default factories
+    with tracing.span("orchestrator.build", kind="epic"):
+        epics = [compact.from_model(e) for e in EPICS.validate_python([
+            {"title": e.get("title"), "features": [
+                {"title": f.get("title"), "description": f.get("description", "")} for f in e.get("features", [])
+            ]}
+            for e in parsed.get("epics", [])
+        ])]
+    old, struct.epics = struct.epics, epics
+    _publish_children(session_id, struct.objective.id, "epic", old, epics)
+    return {"epics": compact.to_dict(epics)}
 
+@tracing.traced("orchestrator.generate_stories")
 def generate_stories(session_id: str, feature_id: str) -> dict:
     struct = STORE[session_id]
     feat = None
-    for epic in struct.epics:
-        for f in epic.features:
-            if f.id == feature_id or f.title == feature_id:
-                feat = f
-                break
+    with tracing.span("orchestrator.lookup", kind="feature"):
+        for epic in struct.epics:
+            for f in epic.features:
+                if f.id == feature_id or f.title == feature_id:
+                    feat = f
+                    break
     if not feat:
         raise ValueError("Feature not found")
-    resp = story_generator.story_generator(feat.dict())
-    parsed = json.loads(resp)
-    stories = []
-    for s in parsed.get("stories", []):
-        stories.append(Story(title=s.get("title"),
-                             acceptance_criteria=s.get("acceptance_criteria", []),
-                             story_points=int(s.get("story_points", 1))))
-    feat.stories = stories
-    return {"stories":[s.dict() for s in stories]}
+    parsed = _agent("story_generator").story_generator(compact.to_dict(feat, FEATURE_PROMPT_FIELDS))
+    with tracing.span("orchestrator.build", kind="story"):
+        stories = [compact.from_model(s) for s in STORIES.validate_python([
+            {"title": s.get("title"),
+             "acceptance_criteria": s.get("acceptance_criteria", []),
+             "story_points": int(s.get("story_points", 1))}
+            for s in parsed.get("stories", [])
+        ])]
+    old, feat.stories = feat.stories, stories
+    _publish_children(session_id, feat.id, "story", old, stories)
+    return {"stories": compact.to_dict(stories)}
 
+@tracing.traced("orchestrator.generate_tasks")
 def generate_tasks(session_id: str, story_id: str) -> dict:
     struct = STORE[session_id]
     story_obj = None
-    for epic in struct.epics:
-        for feat in epic.features:
-            for s in feat.stories:
-                if s.id == story_id or s.title == story_id:
-                    story_obj = s
-                    break
+    with tracing.span("orchestrator.lookup", kind="story"):
+        for epic in struct.epics:
+            for feat in epic.features:
+                for s in feat.stories:
+                    if s.id == story_id or s.title == story_id:
+                        story_obj = s
+                        break
     if not story_obj:
         raise ValueError("Story not found")
-    resp = estimator.estimator(story_obj.dict())
-    parsed = json.loads(resp)
-    tasks = []
-    for t in parsed.get("tasks", []):
-        tasks.append(Task(title=t.get("title"), hours=float(t.get("hours", 1))))
-    story_obj.tasks = tasks
-    return {"tasks":[t.dict() for t in tasks]}
+    parsed = _agent("estimator").estimator(compact.to_dict(story_obj, STORY_PROMPT_FIELDS))
+    with tracing.span("orchestrator.build", kind="task"):
+        tasks = [compact.from_model(t) for t in TASKS.validate_python([
+            {"title": t.get("title"), "hours": float(t.get("hours", 1))} for t in parsed.get("tasks", [])
+        ])]
+    old, story_obj.tasks = story_obj.tasks, tasks
+    _publish_children(session_id, story_obj.id, "task", old, tasks)
+    return {"tasks": compact.to_dict(tasks)}
 
+@tracing.traced("orchestrator.validate_structure")
 def validate_structure(session_id: str) -> dict:
     struct = STORE[session_id]
-    resp = validator.validator(struct.dict())
-    parsed = json.loads(resp)
+    parsed = _agent("validator").validator(compact.to_dict(struct, VALIDATOR_FIELDS))
     struct.warnings = parsed.get("warnings", [])
+    HUB.publish(session_id, {"op": "updated", "kind": "session", "id": session_id, "fields": {"warnings": struct.warnings}})
     return {"warnings": struct.warnings}
 
 def export_structure(session_id: str) -> dict:
+    return compact.to_dict(STORE[session_id])
+
+def export_json(session_id: str) -> bytes:
+    """The session serialized straight to JSON bytes, skipping the intermediate dict"""
+    return fast_json.dumps(STORE[session_id])
+
+def export_header(session_id: str) -> dict:
+    """Everything except the epics, plus how many epics there are"""
     struct = STORE[session_id]
-    return struct.dict()
\ No newline at end of file
+    return {
+        "objective": compact.to_dict(struct.objective),
+        "krs": compact.to_dict(struct.krs),
+        "warnings": list(struct.warnings),
+        "epic_count": len(struct.epics)
+    }
+
+def iter_epics(session_id: str, offset: int = 0, limit: int = None):
+    """Yield exported epics one at a time so large plans never sit fully in memory as dicts"""
+    epics = STORE[session_id].epics
+    end = len(epics) if limit is None else min(len(epics), offset + limit)
+    for epic in epics[offset:end]:
+        yield compact.to_dict(epic)
+
+# Operations accepted by /batch: name -> (function, argument name)
+BATCH_OPERATIONS = {
+    "suggest_krs": (suggest_krs, None),
+    "generate_epics": (generate_epics, "kr_id"),
+    "generate_stories": (generate_stories, "feature_id"),
+    "generate_tasks": (generate_tasks, "story_id"),
+    "validate": (validate_structure, None),
+    "export": (export_structure, None),
+}
+
+# Runs of these operations touch disjoint nodes (one feature / one story
+# each), so consecutive ones can execute concurrently.
+PARALLEL_OPERATIONS = {"generate_stories", "generate_tasks"}
+
+def run_operation(session_id: str, op: str, args: dict) -> dict:
+    if op not in BATCH_OPERATIONS:
+        raise ValueError(f"Unknown operation '{op}'")
+    fn, arg_name = BATCH_OPERATIONS[op]
+    if arg_name is None:
+        return fn(session_id)
+    if arg_name not in args:
+        raise ValueError(f"Operation '{op}' requires '{arg_name}'")
+    return fn(session_id, args[arg_name])
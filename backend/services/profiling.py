@@ -0,0 +1,236 @@
+"""
+On-demand request profiling.
+
+cProfile only sees the thread it runs on, and most of a request here runs
+in threadpool workers (sync routes, agents, Gemini calls), so this is a
+wall-clock sampling profiler instead: while a profiled request is in
+flight, a helper thread samples the event-loop thread and every busy
+AnyIO worker every PROFILE_INTERVAL_MS. Samples are wall time, so a worker
+blocked on Gemini or Jira shows up under the call that is waiting. Other
+requests running at the same moment are sampled too; `concurrent` in the
+profile says how many there were.
+
+    PROFILING=1                 honour "X-Profile: 1" (with X-Admin-Token) on requests
+    PROFILE_SAMPLE_RATE=0.01    also profile 1% of requests unprompted
+    PROFILE_INTERVAL_MS (5), PROFILE_TOP (5), PROFILE_KEEP (50)
+
+Profiled responses carry X-Profile-Id and X-Profile-Top (the top-N
+functions by self time); the full profile, including folded stacks for
+flamegraph tools, is kept in PROFILES for the admin endpoints. The
+X-Profile header only counts with an X-Admin-Token matching ADMIN_TOKEN
+(and not at all while ADMIN_TOKEN is unset), so anonymous clients cannot
+switch profiling on for themselves.
+"""
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from services.log import REQUEST_ID
+
+ENABLED = os.getenv("PROFILING", "").lower() in ("1", "true", "yes")
+SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+TOP_N = int(os.getenv("PROFILE_TOP", "5"))
+
+WORKER_THREAD_NAME = "AnyIO worker thread"
+# Innermost frames of a thread that is parked rather than working
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+
+_in_flight = 0
+
+
+class ProfileStore:
+    """
+    The most recent `max_entries` profiles by id. An id handed out before its
+    profile is stored is reserved, and get() waits for it to arrive.
+    """
+
+    def __init__(self, max_entries: int = 50):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Dict]" = OrderedDict()
+        self._pending: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, profile_id: str):
+        with self._lock:
+            self._pending[profile_id] = threading.Event()
+
+    def add(self, profile: Dict):
+        with self._lock:
+            self._data[profile["id"]] = profile
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            ready = self._pending.pop(profile["id"], None)
+        if ready is not None:
+            ready.set()
+
+    def get(self, profile_id: str, wait: float = 2.0) -> Optional[Dict]:
+        """The profile, waiting up to `wait` seconds if it is reserved but not yet stored (blocks; not for the event loop)"""
+        ready = self._pending.get(profile_id)
+        if ready is not None:
+            ready.wait(wait)
+        return self._data.get(profile_id)
+
+    def summaries(self) -> List[Dict]:
+        with self._lock:
+            profiles = list(self._data.values())
+        keys = ("id", "request_id", "method", "path", "status", "duration_ms", "samples", "started")
+        return [{k: p[k] for k in keys} for p in reversed(profiles)]
+
+
+PROFILES = ProfileStore(int(os.getenv("PROFILE_KEEP", "50")))
+
+
+def _frame_key(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Sampler:
+    """
+    Samples the given thread and busy AnyIO workers until stopped, then
+    calls on_stop(sampler) from its own thread.
+    """
+
+    def __init__(self, loop_thread: int, interval: float = INTERVAL, on_stop: Optional[Callable] = None):
+        self.loop_thread = loop_thread
+        self.interval = interval
+        self.on_stop = on_stop
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.concurrent = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Signal the sampler thread to finish; does not wait for it"""
+        self._stop.set()
+
+    def _targets(self) -> set:
+        return {self.loop_thread} | {t.ident for t in threading.enumerate() if t.name == WORKER_THREAD_NAME}
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                self.concurrent = max(self.concurrent, _in_flight)
+                for ident in self._targets():
+                    frame = frames.get(ident)
+                    if frame is None or os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        stack.append(_frame_key(frame))
+                        frame = frame.f_back
+                    self.stacks[tuple(reversed(stack))] += 1
+                    self.samples += 1
+            del frames
+        if self.on_stop is not None:
+            self.on_stop(self)
+
+    def top(self, n: int) -> List[Dict]:
+        """Functions by self samples, with their inclusive share"""
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        with self._lock:
+            stacks = list(self.stacks.items())
+        for stack, count in stacks:
+            own[stack[-1]] += count
+            for key in set(stack):
+                inclusive[key] += count
+        total = self.samples or 1
+        return [
+            {"function": key, "self_pct": round(100 * count / total, 1),
+             "total_pct": round(100 * inclusive[key] / total, 1), "samples": count}
+            for key, count in own.most_common(n)
+        ]
+
+    def folded(self) -> List[str]:
+        with self._lock:
+            stacks = self.stacks.most_common()
+        return [f"{';'.join(stack)} {count}" for stack, count in stacks]
+
+
+def wants_profile(headers: Dict[bytes, bytes]) -> bool:
+    if ENABLED and headers.get(b"x-profile", b"").lower() in (b"1", b"true"):
+        # Like /admin/profiles: no ADMIN_TOKEN, no header-triggered profiling
+        admin_token = os.getenv("ADMIN_TOKEN")
+        if admin_token and hmac.compare_digest(headers.get(b"x-admin-token", b""), admin_token.encode()):
+            return True
+    return SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE
+
+
+def top_header(top: List[Dict]) -> bytes:
+    return ", ".join(f"{t['function']} {t['self_pct']}%" for t in top).encode("latin-1", "replace")
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests picked by wants_profile(). Sampling stops when the
+    response starts, so a streamed body is profiled up to its first chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _in_flight
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        _in_flight += 1
+        try:
+            if not wants_profile(dict(scope.get("headers", []))):
+                await self.app(scope, receive, send)
+                return
+            await self._profiled(scope, receive, send)
+        finally:
+            _in_flight -= 1
+
+    async def _profiled(self, scope, receive, send):
+        profile = {"id": uuid.uuid4().hex[:16], "request_id": REQUEST_ID.get(), "method": scope["method"],
+                   "path": scope["path"], "status": None, "started": round(time.time(), 3)}
+
+        def store(sampler: Sampler):
+            # Runs on the sampler thread as it exits, keeping the full profile off the event loop
+            profile.update(samples=sampler.samples, interval_ms=sampler.interval * 1000,
+                           concurrent=sampler.concurrent, top=sampler.top(max(TOP_N, 20)),
+                           folded=sampler.folded())
+            PROFILES.add(profile)
+
+        sampler = Sampler(threading.get_ident(), on_stop=store)
+        started = time.perf_counter()
+        sampler.start()
+
+        def finish(status: Optional[int]):
+            if "duration_ms" in profile:
+                return
+            profile.update(status=status, duration_ms=round((time.perf_counter() - started) * 1000, 1))
+            # The id goes out with the response; a fetch racing the sampler thread waits for store()
+            PROFILES.reserve(profile["id"])
+            sampler.stop()
+
+        async def send_profiled(message):
+            if message["type"] == "http.response.start":
+                finish(message["status"])
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile["id"].encode()),
+                    (b"x-profile-top", top_header(sampler.top(TOP_N))),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_profiled)
+        finally:
+            finish(500)
@@ -0,0 +1,83 @@
+"""
+Per-session event hub for live tree updates.
+
+The orchestrator publishes compact patch events (node added / removed /
+updated) as it mutates a session; every WebSocket viewer of that session
+receives them in order. publish() is thread-safe, since orchestrator steps
+run in threadpool workers.
+
+Slow viewers never block publishers: each has a bounded queue, and when it
+overflows the queued patches are dropped and replaced by a single
+{"op": "resync"} event telling the client to refetch /export.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+QUEUE_SIZE = 256
+
+
+class Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int = QUEUE_SIZE):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, event: Dict):
+        """Enqueue on the subscriber's loop; collapse to a resync when full."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"op": "resync", "seq": event.get("seq"), "reason": "slow consumer"})
+
+
+class SessionHub:
+    def __init__(self):
+        self._subscribers: Dict[str, List[Subscriber]] = defaultdict(list)
+        self._seq: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def subscribe(self, session_id: str, maxsize: int = QUEUE_SIZE) -> Subscriber:
+        """Register a viewer. Must be called from the viewer's event loop."""
+        sub = Subscriber(asyncio.get_running_loop(), maxsize)
+        with self._lock:
+            self._subscribers[session_id].append(sub)
+        return sub
+
+    def unsubscribe(self, session_id: str, sub: Subscriber):
+        with self._lock:
+            subs = self._subscribers.get(session_id, [])
+            if sub in subs:
+                subs.remove(sub)
+            if not subs:
+                self._subscribers.pop(session_id, None)
+                self._seq.pop(session_id, None)
+
+    def has_subscribers(self, session_id: str) -> bool:
+        return bool(self._subscribers.get(session_id))
+
+    def publish(self, session_id: str, event: Dict):
+        """Fan an event out to every viewer of the session (any thread)."""
+        with self._lock:
+            subs = list(self._subscribers.get(session_id, ()))
+            if not subs:
+                return
+            self._seq[session_id] += 1
+            event = {**event, "seq": self._seq[session_id]}
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                # Viewer's loop already closed; it will unsubscribe on its own
+                pass
+
+    def viewers(self) -> Dict[str, int]:
+        with self._lock:
+            return {sid: len(subs) for sid, subs in self._subscribers.items()}
+
+
+HUB = SessionHub()
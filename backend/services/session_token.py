@@ -0,0 +1,158 @@
+"""
+Stateless session tokens.
+
+A whole OKRStructure is packed into a signed token so any stateless worker
+can resume a session with one decode and no store lookup:
+
+    v1.<payload>.<signature>
+
+payload   base64url(zlib(compact JSON))
+signature base64url(HMAC-SHA256(secret, payload))[:16 bytes]
+
+The JSON is positional (nested arrays instead of keyed objects) and ids
+drop their well-known "obj-"/"kr-"/... prefixes, which roughly halves the
+size before compression.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import time
+import zlib
+from typing import Tuple
+
+from models.okr_schema import OKRStructure
+from services import fast_json
+from services.log import get_logger
+
+VERSION = "v1"
+SIGNATURE_BYTES = 16
+TOKEN_TTL = int(os.getenv("SESSION_TOKEN_TTL", str(7 * 24 * 3600)))
+
+# Without SESSION_SECRET tokens only verify inside this process, which is
+# fine for local dev but defeats the point on serverless: every other
+# instance, and this one after a cold start, rejects them.
+SECRET_CONFIGURED = bool(os.getenv("SESSION_SECRET"))
+_SECRET = os.getenv("SESSION_SECRET", "").encode() if SECRET_CONFIGURED else os.urandom(32)
+
+if not SECRET_CONFIGURED:
+    get_logger("session").warning(
+        "session_token.ephemeral_secret",
+        detail="SESSION_SECRET is not set; session tokens will not verify on other instances or after a restart",
+    )
+
+
+class InvalidSessionToken(ValueError):
+    pass
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(_SECRET, payload.encode(), hashlib.sha256).digest()
+    return _b64encode(digest[:SIGNATURE_BYTES])
+
+
+def _pack_id(node_id: str, prefix: str) -> str:
+    head = prefix + "-"
+    return node_id[len(head):] if node_id.startswith(head) else "!" + node_id
+
+
+def _unpack_id(packed: str, prefix: str) -> str:
+    return packed[1:] if packed.startswith("!") else f"{prefix}-{packed}"
+
+
+def pack(session_id: str, struct) -> list:
+    """Session tree (compact.Session or OKRStructure) -> nested positional arrays."""
+    return [
+        session_id,
+        int(time.time()),
+        [_pack_id(struct.objective.id, "obj"), struct.objective.text],
+        [[_pack_id(k.id, "kr"), k.text, k.metric, k.baseline, k.target, k.rationale] for k in struct.krs],
+        [
+            [_pack_id(e.id, "epic"), e.title, [
+                [_pack_id(f.id, "feat"), f.title, f.description, [
+                    [_pack_id(s.id, "story"), s.title, s.acceptance_criteria, s.story_points,
+                     [[_pack_id(t.id, "task"), t.title, t.hours] for t in s.tasks]]
+                    for s in f.stories
+                ]]
+                for f in e.features
+            ]]
+            for e in struct.epics
+        ],
+        struct.warnings,
+    ]
+
+
+def unpack(data: list) -> Tuple[str, int, OKRStructure]:
+    """
+    Nested positional arrays -> (session_id, issued_at, OKRStructure).
+
+    The tree is rebuilt as plain dicts and validated in a single
+    model_validate call, which is faster than constructing each node from
+    Python (model_construct included) on large trees.
+    """
+    session_id, issued_at, obj, krs, epics, warnings = data
+    struct = OKRStructure.model_validate({
+        "objective": {"id": _unpack_id(obj[0], "obj"), "text": obj[1]},
+        "krs": [
+            {"id": _unpack_id(k[0], "kr"), "text": k[1], "metric": k[2], "baseline": k[3], "target": k[4], "rationale": k[5]}
+            for k in krs
+        ],
+        "epics": [
+            {"id": _unpack_id(e[0], "epic"), "title": e[1], "features": [
+                {"id": _unpack_id(f[0], "feat"), "title": f[1], "description": f[2], "stories": [
+                    {"id": _unpack_id(s[0], "story"), "title": s[1], "acceptance_criteria": s[2], "story_points": s[3], "tasks": [
+                        {"id": _unpack_id(t[0], "task"), "title": t[1], "hours": t[2]} for t in s[4]
+                    ]}
+                    for s in f[3]
+                ]}
+                for f in e[2]
+            ]}
+            for e in epics
+        ],
+        "warnings": warnings,
+    })
+    return session_id, issued_at, struct
+
+
+def encode(session_id: str, struct) -> str:
+    payload = _b64encode(zlib.compress(fast_json.dumps(pack(session_id, struct)), 6))
+    return f"{VERSION}.{payload}.{_sign(payload)}"
+
+
+def signature(token: str) -> str:
+    """The token's signature part; identifies its payload without decoding it"""
+    return token.rpartition(".")[2]
+
+
+def decode(token: str, max_age: int = None) -> Tuple[str, OKRStructure]:
+    """
+    Verify and unpack a token.
+
+    Raises:
+        InvalidSessionToken: malformed, tampered with or expired
+    """
+    try:
+        version, payload, signature = token.split(".")
+    except (AttributeError, ValueError):
+        raise InvalidSessionToken("Malformed session token")
+    if version != VERSION:
+        raise InvalidSessionToken(f"Unsupported session token version '{version}'")
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidSessionToken("Session token signature mismatch")
+    try:
+        data = fast_json.loads(zlib.decompress(_b64decode(payload)))
+        session_id, issued_at, struct = unpack(data)
+    except Exception as e:
+        raise InvalidSessionToken(f"Corrupt session token: {e}")
+    max_age = TOKEN_TTL if max_age is None else max_age
+    if max_age and time.time() - issued_at > max_age:
+        raise InvalidSessionToken("Session token expired")
+    return session_id, struct
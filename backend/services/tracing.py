@@ -0,0 +1,304 @@
+"""
+Lightweight request tracing.
+
+Spans nest through a contextvar, so they follow a request from the route
+into threadpool workers (Starlette copies the context) and into asyncio
+tasks (each task starts with a copy of its creator's context):
+
+    with tracing.span("planner.parse", chars=len(text)) as s:
+        ...
+        s.set("fallback", True)
+
+    @tracing.traced("orchestrator.generate_tasks")
+    def generate_tasks(...): ...
+
+Finished spans go to the configured exporters:
+
+    TRACE_FILE=traces.jsonl            one JSON object per span, written on a background thread
+                                       (python -m tools.trace_flame)
+    OTEL_EXPORTER_OTLP_ENDPOINT=http://collector:4318
+                                       OTLP/HTTP JSON, batched on a background thread
+
+With neither set, span() hands out a shared no-op span and costs next to
+nothing.
+"""
+import asyncio
+import contextvars
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+
+from services import fast_json
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error = None
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    trace_id = span_id = parent_id = None
+
+    def set(self, key: str, value):
+        pass
+
+
+_NOOP = _NoopSpan()
+_current: contextvars.ContextVar = contextvars.ContextVar("okr_span", default=None)
+
+
+class JSONLExporter:
+    """
+    Appends finished spans to a file, one JSON object per line. Spans close
+    on the event loop too, so they are queued and written by a daemon
+    thread; when the queue is full spans are dropped.
+    """
+
+    def __init__(self, path: str, max_queue: int = 8192):
+        self.path = path
+        self.dropped = 0
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="jsonl-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until queued spans are on disk (tools and tests reading the file)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.path, "ab") as f:
+                    f.write(b"".join(fast_json.dumps(s.to_dict()) + b"\n" for s in batch))
+            except Exception:
+                # Tracing must never take the service down with it
+                self.dropped += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+class OTLPExporter:
+    """
+    Ships spans to an OpenTelemetry collector as OTLP/HTTP JSON. Spans are
+    queued and posted in batches from a daemon thread, so request paths
+    never wait on the collector; when the queue is full spans are dropped.
+    """
+
+    def __init__(self, endpoint: str, service_name: str = "okr-agentic-api",
+                 batch_size: int = 128, interval: float = 2.0, max_queue: int = 8192):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._post(batch)
+
+    @staticmethod
+    def _value(value) -> Dict:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _payload(self, spans: List[Span]) -> Dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{
+                "scope": {"name": "okr.tracing"},
+                "spans": [{
+                    "traceId": s.trace_id,
+                    "spanId": s.span_id,
+                    **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                    "name": s.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(s.start_ns),
+                    "endTimeUnixNano": str(s.end_ns),
+                    "attributes": [{"key": k, "value": self._value(v)} for k, v in s.attributes.items()],
+                    "status": {"code": 2, "message": s.error or ""} if s.status == "error" else {"code": 1},
+                } for s in spans],
+            }],
+        }]}
+
+    def _post(self, spans: List[Span]):
+        import httpx
+        try:
+            httpx.post(self.url, content=fast_json.dumps(self._payload(spans)),
+                       headers={"Content-Type": "application/json"}, timeout=5)
+        except Exception:
+            # Tracing must never take the service down with it
+            self.dropped += len(spans)
+
+
+EXPORTERS: List = []
+
+
+def configure(trace_file: Optional[str] = None, otlp_endpoint: Optional[str] = None):
+    """(Re)build the exporter list; called once at import from the environment"""
+    EXPORTERS.clear()
+    if trace_file:
+        EXPORTERS.append(JSONLExporter(trace_file))
+    if otlp_endpoint:
+        EXPORTERS.append(OTLPExporter(otlp_endpoint, os.getenv("OTEL_SERVICE_NAME", "okr-agentic-api")))
+
+
+configure(os.getenv("TRACE_FILE"), os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"))
+
+
+def enabled() -> bool:
+    return bool(EXPORTERS)
+
+
+def current():
+    """The active span, or a no-op span outside any trace"""
+    return _current.get() or _NOOP
+
+
+@contextmanager
+def span(name: str, trace_id: Optional[str] = None, parent_id: Optional[str] = None, **attributes):
+    """
+    Open a child of the current span (or a new trace). trace_id/parent_id
+    continue a trace started elsewhere, e.g. from a traceparent header.
+    """
+    if not EXPORTERS:
+        yield _NOOP
+        return
+    parent = _current.get()
+    if parent is not None and trace_id is None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    s = Span(name, trace_id or os.urandom(16).hex(), parent_id, attributes)
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.status = "error"
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        _current.reset(token)
+        for exporter in EXPORTERS:
+            exporter.export(s)
+
+
+def traced(name: str):
+    """Decorator wrapping every call of a sync or async function in a span"""
+    def decorate(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def parse_traceparent(header: Optional[str]):
+    """W3C traceparent -> (trace_id, parent_span_id), or (None, None)"""
+    if not header:
+        return None, None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None, None
+    return parts[1], parts[2]
+
+
+class TracingMiddleware:
+    """Root span per HTTP request; continues an incoming traceparent and returns X-Trace-Id."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not EXPORTERS:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers", []))
+        trace_id, parent_id = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        route = f"{scope['method']} {scope['path']}"
+        with span(route, trace_id=trace_id, parent_id=parent_id,
+                  method=scope["method"], path=scope["path"]) as root:
+            async def send_traced(message):
+                if message["type"] == "http.response.start":
+                    root.set("status_code", message["status"])
+                    message = dict(message)
+                    message["headers"] = list(message.get("headers", [])) + [(b"x-trace-id", root.trace_id.encode())]
+                await send(message)
+            await self.app(scope, receive, send_traced)
@@ -0,0 +1,245 @@
+"""
+Latency probe for the Gemini model(s) and Jira site this backend talks to.
+
+Sends --count cold requests (new client each time: DNS, TCP and TLS paid
+every time) and --count warm ones (one kept-alive client, after a warm-up
+request) to each target and reports, per target and mode:
+
+    dns       getaddrinfo, timed just before each cold request
+    connect   TCP connect (httpcore resolves again here, normally from cache)
+    tls       TLS handshake
+    ttfb      request headers sent -> response headers received
+    total     whole request including the body
+
+as p50/p95/p99, plus errors by class (HTTP 429, ConnectTimeout, ...).
+Phases come from httpx's "trace" request extension.
+
+Targets come from .env like the app itself: GEMINI_API_URL/GEMINI_API_KEY
+(or --model NAME for Google AI Studio models) and JIRA_URL/JIRA_EMAIL/
+JIRA_API_TOKEN/JIRA_PROJECT_KEY. Credentials are never printed.
+
+Usage (from backend/):
+    python -m tools.probe [--target gemini jira] [--count 10] [--model gemini-1.5-flash ...]
+        [--json probe.json | --json -] [--list-models]
+
+Exits 1 when every request to some target failed.
+"""
+import argparse
+import base64
+import json
+import os
+import socket
+import sys
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+AI_STUDIO = "https://generativelanguage.googleapis.com/v1beta"
+PHASES = ("dns", "connect", "tls", "ttfb", "total")
+PROBE_PROMPT = "Reply with the single word: OK"
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered) + 0.5) - 1))]
+
+
+class Target:
+    def __init__(self, name: str, method: str, url: str, headers: Dict[str, str], body: Optional[Dict] = None):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+
+def gemini_targets(models: List[str]) -> List[Target]:
+    from agents._llm import _gemini_config, build_request
+
+    url, key = _gemini_config()
+    if not key:
+        return []
+    urls = [f"{AI_STUDIO}/models/{m}:generateContent" for m in models] if models else [url] if url else []
+    targets = []
+    for model_url in urls:
+        payload, headers = build_request(model_url, key, PROBE_PROMPT, max_tokens=5, temperature=0.0)
+        name = model_url.rsplit("/", 1)[-1].split(":")[0] if "/models/" in model_url else urlsplit(model_url).netloc
+        targets.append(Target(f"gemini {name}", "POST", model_url, headers, payload))
+    return targets
+
+
+def jira_targets() -> List[Target]:
+    url, email, token = os.getenv("JIRA_URL"), os.getenv("JIRA_EMAIL"), os.getenv("JIRA_API_TOKEN")
+    if not (url and email and token):
+        return []
+    auth = base64.b64encode(f"{email}:{token}".encode()).decode()
+    headers = {"Authorization": f"Basic {auth}", "Accept": "application/json"}
+    base = url.rstrip("/")
+    targets = [Target("jira /myself", "GET", f"{base}/rest/api/3/myself", headers)]
+    project = os.getenv("JIRA_PROJECT_KEY")
+    if project:
+        targets.append(Target(f"jira /project/{project}", "GET", f"{base}/rest/api/3/project/{project}", headers))
+    return targets
+
+
+def timed_request(client: httpx.Client, target: Target, resolve_dns: bool) -> Dict:
+    """One request; phase durations in ms (None when the phase did not happen)"""
+    sample = {phase: None for phase in PHASES}
+    marks: Dict[str, float] = {}
+
+    def trace(event: str, info: Dict):
+        # "connection.connect_tcp.started", "http11.send_request_headers.started", ...
+        marks[".".join(event.split(".")[-2:])] = time.perf_counter()
+
+    if resolve_dns:
+        parts = urlsplit(target.url)
+        started = time.perf_counter()
+        try:
+            socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        except OSError:
+            pass
+        sample["dns"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    try:
+        response = client.request(target.method, target.url, headers=target.headers, json=target.body,
+                                  extensions={"trace": trace})
+        response.read()
+        sample["status"] = response.status_code
+        sample["error"] = f"HTTP {response.status_code}" if response.status_code >= 400 else None
+    except httpx.HTTPError as e:
+        sample["status"] = None
+        sample["error"] = type(e).__name__
+    sample["total"] = (time.perf_counter() - started) * 1000
+
+    def span(start: str, end: str) -> Optional[float]:
+        if start in marks and end in marks:
+            return (marks[end] - marks[start]) * 1000
+        return None
+
+    sample["connect"] = span("connect_tcp.started", "connect_tcp.complete")
+    sample["tls"] = span("start_tls.started", "start_tls.complete")
+    sample["ttfb"] = span("send_request_headers.started", "receive_response_headers.complete")
+    return sample
+
+
+def probe(target: Target, count: int, mode: str, interval: float, timeout: float) -> List[Dict]:
+    samples = []
+    if mode == "cold":
+        for _ in range(count):
+            with httpx.Client(timeout=timeout) as client:
+                samples.append(timed_request(client, target, resolve_dns=True))
+            time.sleep(interval)
+    else:
+        with httpx.Client(timeout=timeout) as client:
+            timed_request(client, target, resolve_dns=False)  # warm-up: open the connection
+            for _ in range(count):
+                time.sleep(interval)
+                samples.append(timed_request(client, target, resolve_dns=False))
+    return samples
+
+
+def summarise(target: Target, mode: str, samples: List[Dict]) -> Dict:
+    phases = {}
+    for phase in PHASES:
+        values = [s[phase] for s in samples if s[phase] is not None]
+        if values:
+            phases[phase] = {q: round(percentile(values, int(q[1:])), 1) for q in ("p50", "p95", "p99")}
+    errors = Counter(s["error"] for s in samples if s["error"])
+    return {
+        "target": target.name,
+        "url": target.url,
+        "mode": mode,
+        "count": len(samples),
+        "ok": len(samples) - sum(errors.values()),
+        "errors": dict(errors),
+        "phases": phases,
+    }
+
+
+def print_table(results: List[Dict]):
+    width = max(len(r["target"]) for r in results) + 2
+    print(f"{'target':<{width}}{'mode':<6}{'ok':>7}  " + "  ".join(f"{p + ' p50/p95/p99 ms':>24}" for p in PHASES))
+    for r in results:
+        cells = []
+        for phase in PHASES:
+            p = r["phases"].get(phase)
+            cells.append(f"{p['p50']:>7.1f} {p['p95']:>7.1f} {p['p99']:>7.1f}" if p else f"{'-':>23}")
+        errors = "  " + ", ".join(f"{k} x{v}" for k, v in r["errors"].items()) if r["errors"] else ""
+        print(f"{r['target']:<{width}}{r['mode']:<6}{r['ok']:>3}/{r['count']:<3}  " + "  ".join(f"{c:>24}" for c in cells) + errors)
+
+
+def list_models(timeout: float) -> int:
+    from agents._llm import _gemini_config
+
+    _, key = _gemini_config()
+    if not key:
+        print("GEMINI_API_KEY is not set", file=sys.stderr)
+        return 1
+    response = httpx.get(f"{AI_STUDIO}/models", headers={"x-goog-api-key": key}, timeout=timeout)
+    if response.status_code != 200:
+        print(f"HTTP {response.status_code}: {response.text[:300]}", file=sys.stderr)
+        return 1
+    for model in response.json().get("models", []):
+        methods = model.get("supportedGenerationMethods", [])
+        if "generateContent" in methods:
+            print(f"{model.get('name', '').split('/', 1)[-1]:<40}{model.get('displayName', '')}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", nargs="+", choices=["gemini", "jira"], default=["gemini", "jira"])
+    parser.add_argument("--model", action="append", default=[], help="AI Studio model name (repeatable)")
+    parser.add_argument("--count", type=int, default=10, help="requests per target and mode")
+    parser.add_argument("--mode", nargs="+", choices=["cold", "warm"], default=["cold", "warm"])
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between requests")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", help="write results as JSON to this path ('-' for stdout)")
+    parser.add_argument("--list-models", action="store_true", help="list models that support generateContent")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    if args.list_models:
+        return list_models(args.timeout)
+
+    builders: Dict[str, Callable[[], List[Target]]] = {
+        "gemini": lambda: gemini_targets(args.model),
+        "jira": jira_targets,
+    }
+    targets = []
+    for name in args.target:
+        found = builders[name]()
+        if not found:
+            print(f"{name}: not configured, skipped", file=sys.stderr)
+        targets.extend(found)
+    if not targets:
+        return 1
+
+    results = [summarise(t, mode, probe(t, args.count, mode, args.interval, args.timeout))
+               for t in targets for mode in args.mode]
+    if args.json != "-":
+        print_table(results)
+    if args.json:
+        document = {"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "count": args.count,
+                             "interval_s": args.interval}, "results": results}
+        if args.json == "-":
+            json.dump(document, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.json, "w") as f:
+                json.dump(document, f, indent=2)
+
+    ok = Counter()
+    for r in results:
+        ok[r["target"]] += r["ok"]
+    return 1 if any(n == 0 for n in ok.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
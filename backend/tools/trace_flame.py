@@ -0,0 +1,118 @@
+"""
+Flame-style summary of a trace file written with TRACE_FILE=traces.jsonl.
+
+Spans are merged by call path (route;orchestrator.step;agent;llm...) across
+the selected traces and printed as an indented tree with total time, self
+time (total minus children) and a bar scaled to the slowest root:
+
+    GET /generate_tasks                 1  41210.4 ms  self    3.1 ms  ##############################
+      orchestrator.generate_tasks       1  41206.9 ms  self    1.0 ms  ##############################
+        agent.estimator                 1  41205.0 ms  self    0.4 ms  ##############################
+          llm.call_gemini               1  41204.6 ms  self 41204.6 ms  ##############################
+
+--folded prints "a;b;c <self microseconds>" lines for flamegraph.pl or
+speedscope instead.
+
+Usage (from backend/):
+    python -m tools.trace_flame traces.jsonl [--trace ID] [--slowest 5] [--folded]
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+
+def load(path: str) -> List[Dict]:
+    spans = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                spans.append(json.loads(line))
+    return spans
+
+
+def select_traces(spans: List[Dict], trace_id: str = None, slowest: int = None) -> List[Dict]:
+    if trace_id:
+        return [s for s in spans if s["trace_id"].startswith(trace_id)]
+    if slowest:
+        ids = {s["span_id"] for s in spans}
+        roots = [s for s in spans if s["parent_id"] not in ids]
+        keep = {s["trace_id"] for s in sorted(roots, key=lambda s: -s["duration_ms"])[:slowest]}
+        return [s for s in spans if s["trace_id"] in keep]
+    return spans
+
+
+def aggregate(spans: List[Dict]) -> Dict[tuple, Dict]:
+    """Call path -> {count, total_ms, self_ms, errors}"""
+    by_id = {s["span_id"]: s for s in spans}
+    children = defaultdict(list)
+    for s in spans:
+        if s["parent_id"] in by_id:
+            children[s["parent_id"]].append(s)
+
+    paths: Dict[str, tuple] = {}
+
+    def path_of(s: Dict) -> tuple:
+        if s["span_id"] not in paths:
+            parent = by_id.get(s["parent_id"])
+            paths[s["span_id"]] = (path_of(parent) if parent else ()) + (s["name"],)
+        return paths[s["span_id"]]
+
+    stats: Dict[tuple, Dict] = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "self_ms": 0.0, "errors": 0})
+    for s in spans:
+        entry = stats[path_of(s)]
+        entry["count"] += 1
+        entry["total_ms"] += s["duration_ms"]
+        # Concurrent children (asyncio.gather) can sum past the parent; clamp
+        entry["self_ms"] += max(0.0, s["duration_ms"] - sum(c["duration_ms"] for c in children[s["span_id"]]))
+        entry["errors"] += s["status"] == "error"
+    return stats
+
+
+def render_tree(stats: Dict[tuple, Dict], width: int = 30) -> List[str]:
+    if not stats:
+        return ["(no spans)"]
+    scale = max(v["total_ms"] for path, v in stats.items() if len(path) == 1) or 1.0
+    label_width = max(2 * (len(p) - 1) + len(p[-1]) for p in stats) + 2
+    lines = []
+
+    def walk(prefix: tuple):
+        kids = [p for p in stats if len(p) == len(prefix) + 1 and p[:len(prefix)] == prefix]
+        for path in sorted(kids, key=lambda p: -stats[p]["total_ms"]):
+            v = stats[path]
+            label = "  " * (len(path) - 1) + path[-1]
+            bar = "#" * max(1, round(width * v["total_ms"] / scale))
+            errors = f"  errors {v['errors']}" if v["errors"] else ""
+            lines.append(f"{label:<{label_width}}{v['count']:>5} {v['total_ms']:>11.1f} ms  "
+                         f"self {v['self_ms']:>10.1f} ms  {bar}{errors}")
+            walk(path)
+
+    walk(())
+    return lines
+
+
+def render_folded(stats: Dict[tuple, Dict]) -> List[str]:
+    return [f"{';'.join(path)} {round(v['self_ms'] * 1000)}" for path, v in sorted(stats.items())]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file")
+    parser.add_argument("--trace", help="only this trace id (prefix match)")
+    parser.add_argument("--slowest", type=int, help="only the N slowest traces")
+    parser.add_argument("--folded", action="store_true", help="folded stacks for flamegraph tools")
+    parser.add_argument("--width", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    spans = select_traces(load(args.file), args.trace, args.slowest)
+    stats = aggregate(spans)
+    lines = render_folded(stats) if args.folded else render_tree(stats, args.width)
+    if not args.folded:
+        print(f"{len({s['trace_id'] for s in spans})} traces, {len(spans)} spans")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,7 +33,7 @@ export default function App(){
     try {
       const res = await api.createSession(text);
       setSession(res.session_id);
-      const k = await api.suggestKRs(text, geminiApiKey);
+      const k = await api.suggestKRs(res.session_id, geminiApiKey);
       setKrs(k.krs || []);
       setStep(2);
     } catch (error) {
@@ -3,73 +3,93 @@ const API_BASE = process.env.NODE_ENV === 'production'
   ? (process.env.REACT_APP_API_URL || '/api')
   : 'http://localhost:8000';
 
+// Latest signed session_token from the backend. Sent back with every call so
+// whichever serverless instance answers can resume the session.
+let sessionToken = null;
+
+async function remember(r){
+  const data = await r.json();
+  if (data && data.session_token) sessionToken = data.session_token;
+  return data;
+}
+
 export async function createSession(objective) {
   const r = await fetch(`${API_BASE}/session`, {
     method: "POST",
     headers: {"Content-Type":"application/json"},
-    body: JSON.stringify({objective: objective})
+    body: JSON.stringify({text: objective})
   });
-  return r.json();
+  sessionToken = null;
+  return remember(r);
 }
 
-export async function suggestKRs(objective, geminiApiKey = ''){
+export async function suggestKRs(session_id, geminiApiKey = ''){
   const r = await fetch(`${API_BASE}/suggest_krs`, {
     method:"POST",
     headers:{"Content-Type":"application/json"},
     body: JSON.stringify({
-      objective: objective,
-      gemini_api_key: geminiApiKey
+      session_id,
+      gemini_api_key: geminiApiKey || null,
+      session_token: sessionToken
     })
   });
-  return r.json();
+  return remember(r);
 }
 
-export async function generateEpics(session_id, selected_kr, geminiApiKey = ''){
+export async function generateEpics(session_id, kr_id, geminiApiKey = ''){
   const r = await fetch(`${API_BASE}/generate_epics`, {
     method:"POST", headers:{"Content-Type":"application/json"},
     body: JSON.stringify({
       session_id, 
-      selected_kr,
-      gemini_api_key: geminiApiKey
+      kr_id,
+      gemini_api_key: geminiApiKey || null,
+      session_token: sessionToken
     })
   });
-  return r.json();
+  return remember(r);
 }
 
-export async function generateStories(session_id, selected_feature, geminiApiKey = ''){
+export async function generateStories(session_id, feature_id, geminiApiKey = ''){
   const r = await fetch(`${API_BASE}/generate_stories`, {
     method:"POST", headers:{"Content-Type":"application/json"},
     body: JSON.stringify({
       session_id, 
-      selected_feature,
-      gemini_api_key: geminiApiKey
+      feature_id,
+      gemini_api_key: geminiApiKey || null,
+      session_token: sessionToken
     })
   });
-  return r.json();
+  return remember(r);
 }
 
-export async function generateTasks(session_id, selected_story, geminiApiKey = ''){
+export async function generateTasks(session_id, story_id, geminiApiKey = ''){
   const r = await fetch(`${API_BASE}/generate_tasks`, {
     method:"POST", headers:{"Content-Type":"application/json"},
     body: JSON.stringify({
       session_id, 
-      selected_story,
-      gemini_api_key: geminiApiKey
+      story_id,
+      gemini_api_key: geminiApiKey || null,
+      session_token: sessionToken
     })
   });
-  return r.json();
+  return remember(r);
 }
 
 export async function validate(session_id){
   const r = await fetch(`${API_BASE}/validate`, {
     method:"POST", headers:{"Content-Type":"application/json"},
-    body: JSON.stringify({session_id})
+    body: JSON.stringify({session_id, session_token: sessionToken})
   });
-  return r.json();
+  return remember(r);
 }
 
 export async function exportJSON(session_id){
-  const r = await fetch(`${API_BASE}/export/${session_id}`);
+  // POST keeps the token in the body: for large plans it outgrows proxy header limits
+  const r = await fetch(`${API_BASE}/export`, {
+    method:"POST",
+    headers:{"Content-Type":"application/json"},
+    body: JSON.stringify({session_id, session_token: sessionToken})
+  });
   return r.json();
 }
 
@@ -91,7 +111,77 @@ export async function uploadToJira(session_id, jiraConfig){
   const r = await fetch(`${API_BASE}/jira/upload`, {
     method:"POST",
     headers:{"Content-Type":"application/json"},
-    body: JSON.stringify({session_id, jira_config: jiraConfig})
+    body: JSON.stringify({session_id, jira_config: jiraConfig, session_token: sessionToken})
   });
   return r.json();
-}
\ No newline at end of file
+}
+export async function syncToJira(session_id, jiraConfig){
+  const r = await fetch(`${API_BASE}/jira/sync`, {
+    method:"POST",
+    headers:{"Content-Type":"application/json"},
+    body: JSON.stringify({session_id, jira_config: jiraConfig, session_token: sessionToken})
+  });
+  return r.json();
+}
+
+export async function uploadToJiraStream(session_id, jiraConfig, onEvent){
+  // Reads the Server-Sent Events stream and calls onEvent(name, data) per event.
+  // Resolves with the final summary once the upload completes.
+  const r = await fetch(`${API_BASE}/jira/upload/stream`, {
+    method:"POST",
+    headers:{"Content-Type":"application/json"},
+    body: JSON.stringify({session_id, jira_config: jiraConfig, session_token: sessionToken})
+  });
+  if (!r.ok) return r.json();
+  const reader = r.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let summary = null;
+  while (true) {
+    const {value, done} = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, {stream: true});
+    let sep;
+    while ((sep = buffer.indexOf("\n\n")) !== -1) {
+      const chunk = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+      let name = "message", data = "";
+      for (const line of chunk.split("\n")) {
+        if (line.startsWith("event: ")) name = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      const parsed = data ? JSON.parse(data) : null;
+      if (name === "summary") summary = parsed;
+      if (onEvent) onEvent(name, parsed);
+    }
+  }
+  return summary;
+}
+
+export async function listJiraProjects(jiraConfig, {query = "", startAt = 0, maxResults = 50} = {}){
+  const params = new URLSearchParams({query, start_at: startAt, max_results: maxResults});
+  const r = await fetch(`${API_BASE}/jira/projects?${params}`, {
+    method:"POST",
+    headers:{"Content-Type":"application/json"},
+    body: JSON.stringify(jiraConfig)
+  });
+  return r.json();
+}
+
+export async function batch(session_id, operations, session_token = sessionToken){
+  // operations: [{op: "generate_stories", args: {feature_id}}, {op: "generate_tasks", args: {story_id}}, {op: "validate"}, {op: "export"}]
+  const r = await fetch(`${API_BASE}/batch`, {
+    method:"POST",
+    headers:{"Content-Type":"application/json"},
+    body: JSON.stringify({session_id, operations, session_token})
+  });
+  return remember(r);
+}
+
+export function openSessionChannel(session_id, onEvent){
+  // Live tree updates: a snapshot, then added/removed/updated/resync patches.
+  const base = API_BASE.startsWith("http") ? API_BASE : `${window.location.origin}${API_BASE}`;
+  const ws = new WebSocket(`${base.replace(/^http/, "ws")}/ws/${session_id}`);
+  ws.onmessage = (msg) => onEvent(JSON.parse(msg.data));
+  return ws;
+}